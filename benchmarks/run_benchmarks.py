@@ -0,0 +1,197 @@
+"""Scaling benchmark for the ATESS pipeline
+
+    python -m benchmarks.run_benchmarks --scales 1 10 100 --output results.json
+
+Each scale generates a seeded synthetic campus, then times every stage and,
+in a second pass under tracemalloc, records its peak memory. The share of
+sessions placed is reported next to the timings.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import SyntheticCampus
+from services.data_loader import DataLoader
+from services.timetable_generator import TimetableGenerator
+from services.decomposition import DecomposedGenerator, find_components
+from services.exam_scheduler import ExamScheduler
+from services.output_writer import OutputWriter
+from config import Config
+
+STAGES = ['load', 'timetable', 'exam', 'seating', 'export']
+
+def _pipeline(input_dir: str, output_dir: str, exam_mode: str) -> List[tuple]:
+    """The pipeline as (stage, callable) pairs sharing one state dict"""
+    state: Dict[str, object] = {}
+    
+    def load():
+        loader = DataLoader()
+        state['professors'] = {p.prof_id: p for p in loader.load_professors(os.path.join(input_dir, 'professors.csv'))}
+        state['rooms'] = loader.load_rooms(os.path.join(input_dir, 'rooms.csv'))
+        state['courses'] = loader.load_courses(os.path.join(input_dir, 'courses.csv'))
+        state['students'] = loader.load_enrollment_store(os.path.join(input_dir, 'students.csv'))
+    
+    def timetable():
+        generator = TimetableGenerator(state['courses'], state['professors'], state['rooms'], state['students'])
+        generator.generate()
+        state['generator'] = generator
+        return _placement(generator)
+    
+    def exam():
+        scheduler = ExamScheduler(state['courses'], state['rooms'], state['students'])
+        exams = scheduler.generate_exam_schedule('2025-12-01', exam_mode)
+        state['scheduler'] = scheduler
+        return {'exams': len(exams), 'exam_days': len({e.date for e in exams})}
+    
+    def seating():
+        seats = sum(1 for _ in state['scheduler'].iter_seating_rows())
+        return {'seats': seats}
+    
+    def export():
+        written = OutputWriter(output_dir).write(state['generator'].timetable, state['scheduler'])
+        return {'files': len(written)}
+    
+    return [('load', load), ('timetable', timetable), ('exam', exam),
+            ('seating', seating), ('export', export)]
+
+def _placement(generator: TimetableGenerator) -> Dict[str, object]:
+    """Placed and unplaced session counts; timings mean little for a campus that does not fit"""
+    placed, unplaced = len(generator.timetable), len(generator.unplaced)
+    return {'entries': placed, 'unplaced': unplaced,
+            'placement_rate': round(placed / (placed + unplaced), 4) if placed + unplaced else 1.0}
+
+def _run(input_dir: str, output_dir: str, exam_mode: str, measure_memory: bool) -> Dict[str, Dict]:
+    """Run every stage once, returning seconds (or peak MB) and stage metrics"""
+    results = {}
+    for stage, fn in _pipeline(input_dir, output_dir, exam_mode):
+        if measure_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = fn() or {}
+        elapsed = time.perf_counter() - start
+        result = {'seconds': round(elapsed, 4), **metrics}
+        if 'seats' in metrics and elapsed > 0:
+            result['seats_per_second'] = round(metrics['seats'] / elapsed)
+        if measure_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result = {'peak_mb': round(peak / (1024 * 1024), 2)}
+        results[stage] = result
+    return results
+
+def _decomposed(input_dir: str, workers: int, sequential_seconds: float) -> Dict:
+    """Time DecomposedGenerator on the campus against the sequential timetable stage"""
+    loader = DataLoader()
+    with contextlib.redirect_stdout(io.StringIO()):
+        professors = {p.prof_id: p for p in loader.load_professors(os.path.join(input_dir, 'professors.csv'))}
+        rooms = loader.load_rooms(os.path.join(input_dir, 'rooms.csv'))
+        courses = loader.load_courses(os.path.join(input_dir, 'courses.csv'))
+        students = loader.load_enrollment_store(os.path.join(input_dir, 'students.csv'))
+    components = len(find_components(courses, students))
+    start = time.perf_counter()
+    generator = DecomposedGenerator(courses, professors, rooms, students, workers=workers).run()
+    elapsed = time.perf_counter() - start
+    return {'workers': workers, 'cpus': os.cpu_count(), 'components': components,
+            'seconds': round(elapsed, 4), 'speedup': round(sequential_seconds / elapsed, 2),
+            **_placement(generator)}
+
+def benchmark_scale(scale: int, seed: int, measure_memory: bool, workdir: str,
+                    exam_mode: str = None, decompose_workers: int = None) -> Dict:
+    """Generate a campus at the given scale and benchmark the pipeline on it"""
+    input_dir = os.path.join(workdir, f"scale{scale}", 'input')
+    output_dir = os.path.join(workdir, f"scale{scale}", 'output')
+    with contextlib.redirect_stdout(io.StringIO()):
+        sizes = SyntheticCampus(scale, seed).write(input_dir)
+    
+    stages = _run(input_dir, output_dir, exam_mode, measure_memory=False)
+    if measure_memory:
+        for stage, memory in _run(input_dir, output_dir, exam_mode, measure_memory=True).items():
+            stages[stage].update(memory)
+    
+    run = {'scale': scale, 'seed': seed, 'exam_mode': exam_mode or Config.EXAM_SCHEDULING_MODE, 'sizes': sizes, 'stages': stages,
+           'total_seconds': round(sum(s['seconds'] for s in stages.values()), 4),
+           'placement_rate': stages['timetable']['placement_rate']}
+    if decompose_workers:
+        run['decomposed'] = _decomposed(input_dir, decompose_workers, stages['timetable']['seconds'])
+    return run
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+def _print_table(runs: List[Dict]):
+    header = (f"{'scale':>6} " + ' '.join(f"{stage:>12}" for stage in STAGES) +
+              f" {'total':>9} {'placed':>7} {'seating':>17}")
+    print(header)
+    for run in runs:
+        cells = []
+        for stage in STAGES:
+            s = run['stages'][stage]
+            cell = f"{s['seconds']:.3f}s"
+            if 'peak_mb' in s:
+                cell += f"/{s['peak_mb']:.0f}M"
+            cells.append(f"{cell:>12}")
+        throughput = run['stages']['seating'].get('seats_per_second', 0)
+        print(f"{run['scale']:>6} " + ' '.join(cells) + f" {run['total_seconds']:>8.3f}s"
+              f" {run['placement_rate']:>7.1%} {throughput:>10,} seats/s")
+    for run in runs:
+        d = run.get('decomposed')
+        if d:
+            print(f"scale {run['scale']}: decomposed timetable {d['seconds']:.3f}s vs "
+                  f"{run['stages']['timetable']['seconds']:.3f}s sequential ({d['speedup']:.2f}x) on "
+                  f"{d['workers']} workers / {d['cpus']} CPUs, {d['components']} components, "
+                  f"{d['placement_rate']:.1%} placed")
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="ATESS scaling benchmark")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="JSON results file")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--exam-mode', choices=['sequential', 'coloring'], default=None)
+    parser.add_argument('--workdir', default=None, help="where synthetic inputs/outputs go")
+    parser.add_argument('--decompose-workers', type=int, default=None,
+                        help="also time the decomposed timetable on this many workers")
+    args = parser.parse_args(argv)
+    
+    logging.disable(logging.CRITICAL)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='atess-bench-')
+    runs = [benchmark_scale(scale, args.seed, not args.no_memory, workdir, args.exam_mode, args.decompose_workers)
+            for scale in args.scales]
+    
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs
+    }
+    _print_table(runs)
+    
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                         f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+    return report
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
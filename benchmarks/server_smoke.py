@@ -0,0 +1,104 @@
+"""Smoke test and latency check for the scheduling service
+
+    python -m benchmarks.server_smoke [--requests 2000]
+
+Generates the sample-data schedule, starts a ScheduleServer on a free local
+port, sends a scripted set of queries, mutations and malformed requests,
+checks every response, and reports the round-trip latency of a query.
+"""
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pipeline import StageContext
+from services.schedule_server import ScheduleService, ScheduleServer, ScheduleClient
+from config import Config
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((Config.SERVER_HOST, 0))
+        return sock.getsockname()[1]
+
+def _check(response: dict, ok: bool, label: str):
+    if response.get('ok') is not ok:
+        raise AssertionError(f"{label}: expected ok={ok}, got {response}")
+    print(f"  ok  {label}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduling service smoke test")
+    parser.add_argument('--requests', type=int, default=2000, help="queries timed for latency")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+    
+    context = StageContext(Config.INPUT_DIR)
+    service = ScheduleService(context.generator, context.exam_scheduler)
+    port = _free_port()
+    server = ScheduleServer(service, port=port)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    
+    client = None
+    for _ in range(100):
+        try:
+            client = ScheduleClient(port=port)
+            break
+        except OSError:
+            time.sleep(0.05)
+    if client is None:
+        raise SystemExit("server did not start")
+    
+    entry = context.generator.timetable[0]
+    course = entry.course_code
+    _check(client.request('ping'), True, "ping")
+    _check(client.request('stats'), True, "stats")
+    _check(client.request('room_free', room_id=entry.room_id, day=entry.day,
+                          time_slot=entry.time_slot), True, "room_free")
+    _check(client.request('entries', batch_id=entry.batch_id), True, "entries")
+    _check(client.request('find_slot', course_code=course), True, "find_slot")
+    added = client.request('add_session', course_code=course)
+    _check(added, True, "add_session")
+    if added['result']:
+        _check(client.request('remove_session', slot_id=added['result']['slot_id']), True, "remove_session")
+    lab = next((e for e in context.generator.timetable if e.session_type == 'Lab'), None)
+    if lab is not None:
+        removed = client.request('remove_session', slot_id=lab.slot_id)
+        _check(removed, True, "remove lab block")
+        if len(removed['result']) != context.generator.courses_by_code[lab.course_code].P:
+            raise AssertionError(f"remove lab block: removed {removed['result']}")
+        _check(client.request('reschedule', target=lab.course_code), True, "restore lab block")
+    _check(client.request('reschedule', target=course), True, "reschedule")
+    _check(client.request('exam', course_code=course), True, "exam")
+    
+    # Malformed requests get ok=false and leave the connection usable
+    _check(client.request('no_such_op'), False, "unknown op")
+    _check(client.request(['not', 'hashable']), False, "unhashable op")
+    _check(client.request('room_free', room_id=entry.room_id, day='Someday', time_slot='09:00'),
+           False, "unknown day")
+    _check(client.request('entries', unexpected=1), False, "bad argument")
+    _check(client.request('reschedule', target=course, days=['Funday']), False, "unknown reschedule day")
+    before = client.request('entries', course_code=course)['result']
+    kept = client.request('reschedule', target=course, days=['Monday'], time_slots=['09:00'],
+                          keep_on_failure=True)
+    _check(kept, True, "reschedule kept on failure")
+    if kept['result'] or client.request('entries', course_code=course)['result'] != before:
+        raise AssertionError("reschedule kept on failure: timetable changed")
+    _check(client.request('ping'), True, "connection still open")
+    
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        client.request('room_free', room_id=entry.room_id, day=entry.day, time_slot=entry.time_slot)
+    elapsed = time.perf_counter() - start
+    print(f"{args.requests} queries: {elapsed / args.requests * 1000:.3f} ms per round trip")
+    
+    _check(client.request('shutdown'), True, "shutdown")
+    client.close()
+    thread.join(timeout=5)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from utils.csv_handler import CSVHandler
+
+@dataclass
+class CampusSpec:
+    """Shape of a synthetic campus at scale 1 (everything grows linearly with scale)"""
+    batches: int = 24
+    courses_per_batch: int = 5  # the last one is the batch's elective
+    students_per_batch: int = 60
+    professors: int = 80
+    departments: int = 12  # batches only take courses from their department's professors
+    elective_overlap: float = 0.2  # share of students also taking another batch's elective
+    elective_scope: str = 'department'  # 'department' keeps electives inside it, 'campus' allows any batch
+    lab_share: float = 0.5  # share of courses with practical hours
+    room_mix: Dict[str, int] = field(default_factory=lambda: {'Lecture': 40, 'Lab': 12, 'Seminar': 4})
+    room_capacities: Dict[str, List[int]] = field(default_factory=lambda: {
+        'Lecture': [70, 80, 90, 120], 'Lab': [70, 80], 'Seminar': [100, 150]
+    })
+
+
+class SyntheticCampus:
+    """Seeded generator of professors, rooms, courses and students CSVs"""
+    
+    def __init__(self, scale: int = 1, seed: int = 0, spec: CampusSpec = None):
+        self.scale = scale
+        self.seed = seed
+        self.spec = spec or CampusSpec()
+        self.rng = random.Random(seed)
+    
+    def write(self, directory: str) -> Dict[str, int]:
+        """Write the four input CSVs into directory; returns row counts"""
+        spec, rng, scale = self.spec, self.rng, self.scale
+        if spec.elective_scope not in ('department', 'campus'):
+            raise ValueError(f"Unknown elective scope: {spec.elective_scope}")
+        os.makedirs(directory, exist_ok=True)
+        
+        departments = spec.departments * scale
+        professors = [f"PROF{i:05d}" for i in range(spec.professors * scale)]
+        prof_rows = [(pid, f"Prof {pid}", f"Dept{i % departments}", 18)
+                     for i, pid in enumerate(professors)]
+        department_profs = [professors[d::departments] for d in range(departments)]
+        
+        room_rows = []
+        for room_type, count in spec.room_mix.items():
+            for i in range(count * scale):
+                room_rows.append((f"{room_type[:3].upper()}{i:05d}", rng.choice(spec.room_capacities[room_type]),
+                                  room_type, 'yes' if rng.random() < 0.5 else 'no'))
+        
+        course_rows = []
+        batch_courses: Dict[str, List[str]] = {}
+        for b in range(spec.batches * scale):
+            batch_id = f"B{b:05d}"
+            for c in range(spec.courses_per_batch):
+                code = f"C{b:05d}{c}"
+                practical = 2 if rng.random() < spec.lab_share else 0
+                course_rows.append((code, f"Course {code}", 3, rng.randint(0, 1), practical, 4,
+                                    rng.choice(department_profs[b % departments]), batch_id))
+                batch_courses.setdefault(batch_id, []).append(code)
+        
+        batch_ids = list(batch_courses)
+        student_rows = []
+        for b, batch_id in enumerate(batch_ids):
+            for s in range(spec.students_per_batch):
+                student_id = f"S{b:05d}{s:03d}"
+                for code in batch_courses[batch_id]:
+                    student_rows.append((code, student_id))
+                if rng.random() < spec.elective_overlap:
+                    other = self._elective_batch(b, len(batch_ids))
+                    if other is not None:
+                        student_rows.append((batch_courses[batch_ids[other]][-1], student_id))
+        
+        handler = CSVHandler()
+        handler.write_rows(os.path.join(directory, 'professors.csv'),
+                           ('prof_id', 'name', 'department', 'max_hours'), prof_rows)
+        handler.write_rows(os.path.join(directory, 'rooms.csv'),
+                           ('room_id', 'capacity', 'type', 'accessible'), room_rows)
+        handler.write_rows(os.path.join(directory, 'courses.csv'),
+                           ('course_code', 'course_name', 'L', 'T', 'P', 'credits',
+                            'instructor_id', 'batch_id'), course_rows)
+        handler.write_rows(os.path.join(directory, 'students.csv'),
+                           ('course_code', 'student_id'), student_rows)
+        
+        return {'professors': len(prof_rows), 'rooms': len(room_rows),
+                'courses': len(course_rows), 'enrollments': len(student_rows)}
+    
+    def _elective_batch(self, b: int, batches: int) -> Optional[int]:
+        """Another batch a student of batch b takes an elective from (None if there is none)"""
+        if self.spec.elective_scope == 'campus':
+            return (b + self.rng.randrange(1, batches)) % batches if batches > 1 else None
+        # Batches b % departments, + departments, ... share a department
+        departments = self.spec.departments * self.scale
+        peers = len(range(b % departments, batches, departments))
+        if peers < 2:
+            return None
+        return b % departments + (b // departments + self.rng.randrange(1, peers)) % peers * departments
\ No newline at end of file
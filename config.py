@@ -7,6 +7,18 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     INPUT_DIR = os.path.join(BASE_DIR, 'data', 'input')
     OUTPUT_DIR = os.path.join(BASE_DIR, 'data', 'output')
+    CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+    
+    # Reuse parsed inputs from CACHE_DIR while the CSVs are unchanged
+    USE_INPUT_CACHE = True
+    
+    # Output files (written concurrently, one thread per file by default)
+    COMPRESS_OUTPUT = False  # write .csv.gz files
+    OUTPUT_WORKERS = None
+    
+    # Scheduling service (python main.py --serve)
+    SERVER_HOST = '127.0.0.1'
+    SERVER_PORT = 8765
     
     # Time settings
     WORKING_DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
@@ -20,7 +32,35 @@ class Config:
     MIN_BREAK_HOURS = 3
     MIN_BREAK_MINUTES = 10
     MAX_SESSIONS_PER_DAY = 1  # Per course
+    STUDENT_AWARE_SCHEDULING = True  # keep courses that share students out of the same slot
+    
+    # Placement backend: 'slots' fills TIME_SLOTS; 'intervals' places minute-resolution
+    # sessions of SESSION_MINUTES, enforcing MIN_BREAK_MINUTES (R6) and MIN_BREAK_HOURS (R4).
+    # Rescheduling, repair, --serve, multi-start and decomposition need 'slots'
+    PLACEMENT_BACKEND = 'slots'
+    SESSION_MINUTES = {'Lecture': 60, 'Tutorial': 60, 'Lab': 60}  # Lab: per practical hour
+    
+    # Timetable optimization (local search after the greedy pass)
+    OPTIMIZE_TIMETABLE = False
+    OPTIMIZER_TIME_LIMIT = 5.0  # seconds
+    OPTIMIZER_SEED = 0
+    
+    # Multi-start generation (randomized greedy runs across a process pool)
+    MULTI_START_RUNS = 1  # 1 disables multi-start
+    MULTI_START_WORKERS = None  # None uses every CPU
+    
+    # Component decomposition (groups sharing no professor, batch or student solved in parallel).
+    # The merge replays every entry in one process, so it only pays off with several CPUs
+    DECOMPOSE_TIMETABLE = False
+    DECOMPOSE_WORKERS = None  # None uses every CPU
+    
+    # What-if scenario sweep (--scenarios)
+    SWEEP_WORKERS = None  # None uses every CPU
     
     # Exam settings
+    EXAM_START_DATE = '2025-12-01'
     EXAM_DURATION = 3  # hours
+    EXAM_SLOTS = ['09:00-12:00', '14:00-17:00']
+    EXAM_SCHEDULING_MODE = 'sequential'  # 'sequential' or 'coloring'
+    EXAM_ROOM_TYPES = ['Lecture', 'Seminar']  # rooms exams may be held in
     MIN_SEATS_BETWEEN_SAME_EXAM = 1
\ No newline at end of file
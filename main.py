@@ -1,12 +1,79 @@
+import argparse
 import os
 from config import Config
-from services.data_loader import DataLoader
-from services.timetable_generator import TimetableGenerator
-from services.exam_scheduler import ExamScheduler
+from services.pipeline import Pipeline, TARGETS
 from utils.logger import Logger
 
-def main():
+# Services are imported where they are used: an up-to-date pipeline run loads none of them
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="ATESS - Automated Timetable & Exam Scheduling System")
+    parser.add_argument('stage', nargs='?', choices=TARGETS, default='all',
+                        help="stage to bring up to date, with the stages it depends on (default: all)")
+    parser.add_argument('--force', action='store_true',
+                        help="re-run stages even when their inputs and settings are unchanged")
+    parser.add_argument('--profile', choices=['json', 'table'], default=None,
+                        help="record per-phase timings, peak memory and scheduler counters")
+    parser.add_argument('--profile-output', default=None,
+                        help="write the profile to this file instead of stdout")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="with --profile, also trace peak memory per phase (slows the timed phases)")
+    parser.add_argument('--audit', metavar='TIMETABLE_CSV', default=None,
+                        help="audit an existing timetable CSV instead of generating one")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always re-parse the input CSVs")
+    parser.add_argument('--gzip', action='store_true',
+                        help="gzip-compress the output files")
+    parser.add_argument('--serve', action='store_true',
+                        help="after generating, keep the schedule in memory and answer queries")
+    parser.add_argument('--port', type=int, default=None,
+                        help=f"TCP port for --serve (default {Config.SERVER_PORT})")
+    parser.add_argument('--socket', default=None,
+                        help="serve on this Unix socket path instead of TCP")
+    parser.add_argument('--scenarios', metavar='SCENARIOS_JSON', default=None,
+                        help="compare what-if scenarios from a JSON file instead of exporting")
+    return parser.parse_args(argv)
+
+def audit_timetable(filepath: str, context, logger: Logger):
+    """Audit a timetable CSV against the input rooms and enrollments"""
+    from services.validator import Validator
+    context.load()
+    
+    validator = Validator()
+    report = validator.audit_csv(filepath, context.rooms, context.students)
+    for rule, count in report.counts().items():
+        logger.info(f"{rule:<16} {count}")
+    
+    audit_output = os.path.join(Config.OUTPUT_DIR, 'audit_report.csv')
+    validator.export_audit_to_csv(report, audit_output)
+    return report
+
+def sweep_scenarios(filepath: str, context, logger: Logger):
+    """Run the scenarios of a JSON file in parallel and export the comparison"""
+    import json
+    from services.scenario_sweep import ScenarioSweep
+    with open(filepath, encoding='utf-8') as file:
+        scenarios = json.load(file)
+    
+    context.load()
+    sweep = ScenarioSweep(context.courses, context.professors, context.rooms, context.students,
+                          context.accessible_students)
+    results = sweep.run(scenarios)
+    print(sweep.format_table(results))
+    
+    sweep_output = os.path.join(Config.OUTPUT_DIR, 'scenario_comparison.csv')
+    sweep.export_to_csv(results, sweep_output)
+    return results
+
+def main(argv=None):
     """Main entry point for ATESS"""
+    args = parse_args(argv)
+    profiler = None
+    if args.profile:
+        from utils.profiler import Profiler
+        profiler = Profiler(trace_memory=args.profile_memory)
+    
     logger = Logger("ATESS-Main")
     logger.info("=" * 60)
     logger.info("ATESS - Automated Timetable & Exam Scheduling System")
@@ -17,57 +84,49 @@ def main():
     os.makedirs(Config.INPUT_DIR, exist_ok=True)
     os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
     
-    # Initialize data loader
-    data_loader = DataLoader()
+    use_cache = Config.USE_INPUT_CACHE and not args.no_cache
+    pipeline = Pipeline(compress=args.gzip or Config.COMPRESS_OUTPUT, use_cache=use_cache,
+                        profiler=profiler)
+    
+    if args.audit:
+        try:
+            audit_timetable(args.audit, pipeline.context, logger)
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+        return
+    
+    if args.serve and Config.PLACEMENT_BACKEND != 'slots':
+        # The service answers and mutates through the slot grid
+        logger.error(f"--serve needs the 'slots' placement backend, not '{Config.PLACEMENT_BACKEND}'")
+        return
     
     try:
-        # Load data from CSV files
-        logger.info("\n--- Loading Input Data ---")
-        professors = data_loader.load_professors(
-            os.path.join(Config.INPUT_DIR, 'professors.csv')
-        )
-        rooms = data_loader.load_rooms(
-            os.path.join(Config.INPUT_DIR, 'rooms.csv')
-        )
-        courses = data_loader.load_courses(
-            os.path.join(Config.INPUT_DIR, 'courses.csv')
-        )
-        students = data_loader.load_students(
-            os.path.join(Config.INPUT_DIR, 'students.csv')
-        )
-        
-        # Convert professors list to dictionary
-        prof_dict = {p.prof_id: p for p in professors}
+        if args.scenarios:
+            sweep_scenarios(args.scenarios, pipeline.context, logger)
+            return
         
-        # Generate timetable
-        logger.info("\n--- Generating Academic Timetable ---")
-        timetable_gen = TimetableGenerator(courses, prof_dict, rooms)
-        timetable = timetable_gen.generate()
+        # Load, generate and export only the stages whose inputs or settings changed
+        context = pipeline.run(args.stage, force=args.force)
         
-        # Export timetable
-        output_file = os.path.join(Config.OUTPUT_DIR, 'timetable.csv')
-        timetable_gen.export_to_csv(output_file)
-        logger.info(f"Timetable exported to: {output_file}")
+        if profiler:
+            report = profiler.report(args.profile)
+            if args.profile_output:
+                with open(args.profile_output, 'w', encoding='utf-8') as file:
+                    file.write(report)
+                logger.info(f"Profile written to: {args.profile_output}")
+            else:
+                print(report)
         
-        # Generate exam schedule
-        logger.info("\n--- Generating Exam Schedule ---")
-        exam_scheduler = ExamScheduler(courses, rooms, students)
-        exams = exam_scheduler.generate_exam_schedule('2025-12-01')
-        
-        # Export exam schedule
-        exam_output = os.path.join(Config.OUTPUT_DIR, 'exam_schedule.csv')
-        exam_scheduler.export_exams_to_csv(exam_output)
-        logger.info(f"Exam schedule exported to: {exam_output}")
-        
-        # Export seating plans
-        seating_output = os.path.join(Config.OUTPUT_DIR, 'seating_plan.csv')
-        exam_scheduler.export_seating_to_csv(seating_output)
-        logger.info(f"Seating plan exported to: {seating_output}")
+        if args.serve:
+            from services.schedule_server import ScheduleService, ScheduleServer
+            logger.info("\n--- Serving Schedule Queries ---")
+            ScheduleServer(ScheduleService(context.generator, context.exam_scheduler),
+                           port=args.port, path=args.socket).run()
         
         logger.info("\n" + "=" * 60)
         logger.info("ATESS execution completed successfully!")
         logger.info("=" * 60)
-        
+    
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
         logger.error("Please ensure all required CSV files are in the input directory")
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import List, Dict
+
+@dataclass(slots=True)
+class Violation:
+    """A single constraint violation found by a timetable audit"""
+    FIELDS = ('rule', 'resource', 'day', 'time_slot', 'slot_ids', 'detail')
+    
+    rule: str      # room_clash, professor_clash, batch_clash, student_clash, ...
+    resource: str  # room, professor, batch or course the violation is about
+    day: str
+    time_slot: str
+    slot_ids: List[str] = field(default_factory=list)
+    detail: str = ''
+    
+    def to_row(self) -> tuple:
+        """Convert to a tuple in FIELDS order for CSV export"""
+        return (self.rule, self.resource, self.day, self.time_slot,
+                ';'.join(self.slot_ids), self.detail)
+
+@dataclass(slots=True)
+class AuditReport:
+    """Result of auditing a whole timetable"""
+    RULES = ('invalid_slot', 'room_clash', 'professor_clash', 'batch_clash',
+             'professor_break', 'short_break', 'daily_limit', 'lunch_slot', 'capacity', 'student_clash')
+    
+    entries_checked: int = 0
+    violations: List[Violation] = field(default_factory=list)
+    
+    @property
+    def ok(self) -> bool:
+        """True when no violations were found"""
+        return not self.violations
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of violations per rule"""
+        counts = dict.fromkeys(self.RULES, 0)
+        for violation in self.violations:
+            counts[violation.rule] = counts.get(violation.rule, 0) + 1
+        return counts
+    
+    def by_rule(self, rule: str) -> List[Violation]:
+        """Violations of one rule"""
+        return [v for v in self.violations if v.rule == rule]
+    
+    def to_dict(self) -> Dict:
+        """Summary and violations as plain data"""
+        return {
+            'entries_checked': self.entries_checked,
+            'counts': self.counts(),
+            'violations': [dict(zip(Violation.FIELDS, v.to_row())) for v in self.violations]
+        }
\ No newline at end of file
@@ -0,0 +1,89 @@
+from typing import List, Dict, Tuple, Optional
+from config import Config
+
+class ResourceCalendar:
+    """Bitmask occupancy calendar over the (day, slot) grid"""
+    
+    _shared: Optional['ResourceCalendar'] = None
+    
+    def __init__(self, days: List[str] = None, slots: List[str] = None):
+        self.days = list(Config.WORKING_DAYS if days is None else days)
+        self.slots = list(Config.TIME_SLOTS if slots is None else slots)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.slot_index = {slot: i for i, slot in enumerate(self.slots)}
+        self.slots_per_day = len(self.slots)
+        self.size = len(self.days) * self.slots_per_day
+        
+        # bits[day][slot] -> single-bit mask for that grid cell
+        self.bits: Dict[str, Dict[str, int]] = {
+            day: {slot: 1 << (d * self.slots_per_day + s) for s, slot in enumerate(self.slots)}
+            for d, day in enumerate(self.days)
+        }
+        self.full_mask = (1 << self.size) - 1
+        self._source_days = Config.WORKING_DAYS if days is None else days
+        self._source_slots = Config.TIME_SLOTS if slots is None else slots
+        
+        # Occupancy masks keyed by resource id
+        self.masks: Dict[str, int] = {}
+    
+    @classmethod
+    def shared(cls) -> 'ResourceCalendar':
+        """Grid shared by the models, rebuilt when Config days/slots change"""
+        grid = cls._shared
+        if (grid is None or grid._source_days is not Config.WORKING_DAYS
+                or grid._source_slots is not Config.TIME_SLOTS):
+            grid = cls._shared = cls()
+        return grid
+    
+    def bit(self, day: str, slot: str) -> int:
+        """Return the mask bit for a (day, slot) cell"""
+        return self.bits[day][slot]
+    
+    def index(self, day: str, slot: str) -> int:
+        """Return the flat grid index for a (day, slot) cell"""
+        return self.day_index[day] * self.slots_per_day + self.slot_index[slot]
+    
+    def cell(self, index: int) -> Tuple[str, str]:
+        """Return the (day, slot) cell for a flat grid index"""
+        return self.days[index // self.slots_per_day], self.slots[index % self.slots_per_day]
+    
+    def day_mask(self, day: str) -> int:
+        """Return the mask covering every slot of a day"""
+        return ((1 << self.slots_per_day) - 1) << (self.day_index[day] * self.slots_per_day)
+    
+    def is_free(self, resource_id: str, day: str, slot: str) -> bool:
+        """Check if resource is free at given time"""
+        return not self.masks.get(resource_id, 0) & self.bits[day][slot]
+    
+    def occupy(self, resource_id: str, day: str, slot: str):
+        """Mark resource as busy at given time"""
+        self.masks[resource_id] = self.masks.get(resource_id, 0) | self.bits[day][slot]
+    
+    def release(self, resource_id: str, day: str, slot: str):
+        """Mark resource as free at given time"""
+        mask = self.masks.get(resource_id, 0) & ~self.bits[day][slot]
+        if mask:
+            self.masks[resource_id] = mask
+        else:
+            self.masks.pop(resource_id, None)
+    
+    def mask(self, resource_id: str) -> int:
+        """Return the occupancy mask of a resource"""
+        return self.masks.get(resource_id, 0)
+    
+    def clear(self):
+        """Drop all occupancy"""
+        self.masks.clear()
+    
+    def decode(self, mask: int) -> List[Tuple[str, str]]:
+        """Expand a mask into its (day, slot) cells in grid order"""
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(self.cell(low.bit_length() - 1))
+            mask ^= low
+        return cells
+    
+    def time_keys(self, mask: int) -> List[str]:
+        """Expand a mask into legacy "day-slot" keys"""
+        return [f"{day}-{slot}" for day, slot in self.decode(mask)]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Course:
     """Course data model"""
     course_code: str
@@ -13,7 +13,11 @@ class Course:
     batch_id: str
     
     def total_sessions(self) -> int:
-        """Calculate total sessions needed"""
+        """Calculate total sessions needed (each lab hour is one slot of the lab block)"""
+        return self.L + self.T + self.P
+    
+    def class_sessions(self) -> int:
+        """Lecture and tutorial sessions; lab hours follow them in session order"""
         return self.L + self.T
     
     def needs_lab(self) -> bool:
@@ -0,0 +1,223 @@
+import mmap
+import struct
+from array import array
+from collections.abc import Mapping
+from typing import List, Dict, Iterable, Iterator, Tuple
+
+class EnrollmentStore(Mapping):
+    """Course -> students enrollments in CSR layout with interned integer IDs"""
+    
+    MAGIC = b'ATESSENR'
+    HEADER = struct.Struct('<8sIII')  # magic, courses, students, enrollments
+    
+    def __init__(self, course_ids: List[str], student_ids: List[str], offsets, indices):
+        self.course_ids = course_ids
+        self.student_ids = student_ids
+        self.course_index: Dict[str, int] = {code: i for i, code in enumerate(course_ids)}
+        self._student_index: Dict[str, int] = None
+        
+        # Students of course c are indices[offsets[c]:offsets[c + 1]]
+        self.offsets = offsets
+        self.indices = indices
+        
+        # Reverse CSR (student -> courses), built on first use
+        self._student_offsets = None
+        self._student_courses = None
+    
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, str]]) -> 'EnrollmentStore':
+        """Build a store from (course_code, student_id) pairs, keeping file order"""
+        student_index: Dict[str, int] = {}
+        student_ids: List[str] = []
+        buckets: Dict[str, array] = {}
+        
+        for course_code, student_id in pairs:
+            sid = student_index.get(student_id)
+            if sid is None:
+                sid = student_index[student_id] = len(student_ids)
+                student_ids.append(student_id)
+            bucket = buckets.get(course_code)
+            if bucket is None:
+                bucket = buckets[course_code] = array('i')
+            bucket.append(sid)
+        
+        offsets = array('i', [0])
+        indices = array('i')
+        for bucket in buckets.values():
+            indices.extend(bucket)
+            offsets.append(len(indices))
+        
+        store = cls(list(buckets), student_ids, offsets, indices)
+        store._student_index = student_index
+        return store
+    
+    @classmethod
+    def from_dict(cls, enrollments: Dict[str, List[str]]) -> 'EnrollmentStore':
+        """Build a store from a course -> student list dict"""
+        return cls.from_pairs(
+            (course_code, student_id)
+            for course_code, students in enrollments.items()
+            for student_id in students
+        )
+    
+    def __reduce__(self):
+        # Memory-mapped views cannot be pickled; ship plain arrays instead
+        return (self.__class__, (self.course_ids, self.student_ids,
+                                 array('i', self.offsets), array('i', self.indices)))
+    
+    # Mapping interface (what ExamScheduler and friends index into)
+    
+    def __getitem__(self, course_code: str) -> List[str]:
+        c = self.course_index[course_code]
+        student_ids = self.student_ids
+        return [student_ids[s] for s in self.indices[self.offsets[c]:self.offsets[c + 1]]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.course_ids)
+    
+    def __len__(self) -> int:
+        return len(self.course_ids)
+    
+    def __contains__(self, course_code) -> bool:
+        return course_code in self.course_index
+    
+    # Integer-level queries
+    
+    @property
+    def student_index(self) -> Dict[str, int]:
+        """student_id -> interned integer id"""
+        if self._student_index is None:
+            self._student_index = {sid: i for i, sid in enumerate(self.student_ids)}
+        return self._student_index
+    
+    def course_size(self, course_code: str) -> int:
+        """Number of students enrolled in a course"""
+        c = self.course_index.get(course_code)
+        if c is None:
+            return 0
+        return self.offsets[c + 1] - self.offsets[c]
+    
+    def course_students(self, course_code: str):
+        """Interned student ids of a course (zero-copy slice)"""
+        c = self.course_index[course_code]
+        return self.indices[self.offsets[c]:self.offsets[c + 1]]
+    
+    def student_range(self, course_code: str, start: int, stop: int) -> List[str]:
+        """Decode students start..stop (exclusive) of a course without decoding the rest"""
+        c = self.course_index.get(course_code)
+        if c is None:
+            return []
+        base = self.offsets[c]
+        stop = min(base + stop, self.offsets[c + 1])
+        student_ids = self.student_ids
+        return [student_ids[s] for s in self.indices[base + start:stop]]
+    
+    def _build_reverse(self):
+        """Build the student -> courses CSR index"""
+        counts = array('i', bytes(4 * (len(self.student_ids) + 1)))
+        for s in self.indices:
+            counts[s + 1] += 1
+        for s in range(len(self.student_ids)):
+            counts[s + 1] += counts[s]
+        
+        cursor = array('i', counts[:-1])
+        courses = array('i', bytes(4 * len(self.indices)))
+        offsets = self.offsets
+        indices = self.indices
+        for c in range(len(self.course_ids)):
+            for k in range(offsets[c], offsets[c + 1]):
+                s = indices[k]
+                courses[cursor[s]] = c
+                cursor[s] += 1
+        
+        self._student_offsets = counts
+        self._student_courses = courses
+    
+    def student_course_indices(self, student: int):
+        """Interned course ids taken by an interned student id"""
+        if self._student_offsets is None:
+            self._build_reverse()
+        return self._student_courses[self._student_offsets[student]:self._student_offsets[student + 1]]
+    
+    def courses_of(self, student_id: str) -> List[str]:
+        """Course codes a student is enrolled in"""
+        s = self.student_index.get(student_id)
+        if s is None:
+            return []
+        return [self.course_ids[c] for c in self.student_course_indices(s)]
+    
+    def overlap(self, course_a: str, course_b: str) -> int:
+        """Number of students enrolled in both courses"""
+        a, b = self.course_index.get(course_a), self.course_index.get(course_b)
+        if a is None or b is None:
+            return 0
+        if self.course_size(course_a) > self.course_size(course_b):
+            a, b = b, a
+            course_a = course_b
+        return sum(1 for s in self.course_students(course_a) if b in self.student_course_indices(s))
+    
+    def student_bitset(self, course_code: str) -> int:
+        """Bitset over interned student ids of a course"""
+        c = self.course_index.get(course_code)
+        if c is None:
+            return 0
+        bits = bytearray((len(self.student_ids) + 7) // 8)
+        for k in range(self.offsets[c], self.offsets[c + 1]):
+            s = self.indices[k]
+            bits[s >> 3] |= 1 << (s & 7)
+        return int.from_bytes(bits, 'little')
+    
+    def course_masks(self, course_codes: List[str]) -> List[int]:
+        """Per-student bitmask over the given course order"""
+        masks = [0] * len(self.student_ids)
+        offsets = self.offsets
+        indices = self.indices
+        for i, code in enumerate(course_codes):
+            c = self.course_index.get(code)
+            if c is None:
+                continue
+            bit = 1 << i
+            for k in range(offsets[c], offsets[c + 1]):
+                masks[indices[k]] |= bit
+        return masks
+    
+    # On-disk form
+    
+    def save(self, filepath: str):
+        """Write the store in a compact binary form that load() can memory-map"""
+        course_blob = '\n'.join(self.course_ids).encode('utf-8')
+        student_blob = '\n'.join(self.student_ids).encode('utf-8')
+        with open(filepath, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, len(self.course_ids),
+                                        len(self.student_ids), len(self.indices)))
+            file.write(array('i', self.offsets).tobytes())
+            file.write(array('i', self.indices).tobytes())
+            file.write(struct.pack('<QQ', len(course_blob), len(student_blob)))
+            file.write(course_blob)
+            file.write(student_blob)
+    
+    @classmethod
+    def load(cls, filepath: str, use_mmap: bool = True) -> 'EnrollmentStore':
+        """Load a saved store; the CSR arrays stay memory-mapped when use_mmap is set"""
+        with open(filepath, 'rb') as file:
+            if use_mmap:
+                buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                buffer = memoryview(file.read())
+        
+        magic, n_courses, n_students, n_indices = cls.HEADER.unpack_from(buffer, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Not an enrollment store: {filepath}")
+        
+        pos = cls.HEADER.size
+        offsets = buffer[pos:pos + 4 * (n_courses + 1)].cast('i')
+        pos += 4 * (n_courses + 1)
+        indices = buffer[pos:pos + 4 * n_indices].cast('i')
+        pos += 4 * n_indices
+        course_len, student_len = struct.unpack_from('<QQ', buffer, pos)
+        pos += 16
+        course_ids = bytes(buffer[pos:pos + course_len]).decode('utf-8').split('\n') if n_courses else []
+        pos += course_len
+        student_ids = bytes(buffer[pos:pos + student_len]).decode('utf-8').split('\n') if n_students else []
+        
+        return cls(course_ids, student_ids, offsets, indices)
\ No newline at end of file
@@ -1,9 +1,13 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Exam:
     """Exam data model"""
+    FIELDS = ('exam_code', 'course_code', 'course_name', 'date', 'time_slot',
+              'rooms', 'student_count', 'invigilators')
+    
     exam_code: str
     course_code: str
     course_name: str
@@ -25,11 +29,18 @@ class Exam:
             'student_count': self.student_count,
             'invigilators': ','.join(self.invigilator_ids)
         }
+    
+    def to_row(self) -> tuple:
+        """Convert to a tuple in FIELDS order for CSV export"""
+        return (self.exam_code, self.course_code, self.course_name, self.date, self.time_slot,
+                ','.join(self.room_ids), self.student_count, ','.join(self.invigilator_ids))
 
 
-@dataclass
+@dataclass(slots=True)
 class SeatingPlan:
     """Seating plan data model"""
+    FIELDS = ('exam_code', 'room_id', 'seat_number', 'student_id')
+    
     exam_code: str
     room_id: str
     seat_allocations: Dict[int, str] = field(default_factory=dict)
@@ -44,4 +55,20 @@ class SeatingPlan:
                 'student_id': student_id
             }
             for seat_num, student_id in self.seat_allocations.items()
-        ]
\ No newline at end of file
+        ]
+
+
+@dataclass(slots=True)
+class SeatMap:
+    """Seat layout of one exam room in one sitting, as flat arrays"""
+    room_id: str
+    exam_codes: List[str]
+    seat_exam: array   # seat -> index into exam_codes, -1 when empty
+    seat_index: array  # seat -> position of the student within that exam's share of the room
+    gap_violations: int = 0
+    
+    def seats(self) -> Iterator[Tuple[int, int, int]]:
+        """Yield (seat_number, exam, index) for occupied seats; seat numbers start at 1"""
+        for seat, exam in enumerate(self.seat_exam):
+            if exam >= 0:
+                yield seat + 1, exam, self.seat_index[seat]
\ No newline at end of file
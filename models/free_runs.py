@@ -0,0 +1,72 @@
+from array import array
+from typing import Dict, List
+from models.calendar import ResourceCalendar
+from models.intervals import slot_bounds
+from config import Config
+
+class FreeRunTable:
+    """Longest run of free, back-to-back slots starting at each grid cell, per resource
+    
+    A run never crosses the lunch slot, a gap between slots or the end of a
+    day, so "can a block of n slots start here" is one lookup: run(cell) >= n.
+    Occupying or releasing a cell only rewrites the cells before it in its run.
+    """
+    
+    def __init__(self, grid: ResourceCalendar = None):
+        self.grid = grid or ResourceCalendar.shared()
+        slots, per_day = self.grid.slots, self.grid.slots_per_day
+        bounds = [slot_bounds(slot) for slot in slots]
+        usable = [slot != Config.LUNCH_SLOT for slot in slots]
+        # linked[s]: slot s runs straight into slot s + 1
+        day_links = [s + 1 < per_day and usable[s] and usable[s + 1] and bounds[s][1] == bounds[s + 1][0]
+                     for s in range(per_day)]
+        self.linked: List[bool] = day_links * len(self.grid.days)
+        
+        # Runs of a resource with nothing booked
+        day_runs = [0] * per_day
+        for s in reversed(range(per_day)):
+            if usable[s]:
+                day_runs[s] = day_runs[s + 1] + 1 if day_links[s] else 1
+        self.empty = array('B', day_runs * len(self.grid.days))
+        self.runs: Dict[str, array] = {}
+    
+    def run(self, resource_id: str, cell: int) -> int:
+        """Free slots in a row starting at cell"""
+        runs = self.runs.get(resource_id)
+        return (self.empty if runs is None else runs)[cell]
+    
+    def fits(self, resource_id: str, cell: int, length: int) -> bool:
+        """Check if a block of length slots can start at cell"""
+        return self.run(resource_id, cell) >= length
+    
+    def occupy(self, resource_id: str, cell: int):
+        """Mark a cell busy"""
+        runs = self.runs.get(resource_id)
+        if runs is None:
+            runs = self.runs[resource_id] = array('B', self.empty)
+        runs[cell] = 0
+        self._rerun(runs, cell)
+    
+    def release(self, resource_id: str, cell: int):
+        """Mark a cell free"""
+        runs = self.runs.get(resource_id)
+        if runs is None or not self.empty[cell]:
+            return
+        runs[cell] = runs[cell + 1] + 1 if self.linked[cell] else 1
+        self._rerun(runs, cell)
+    
+    def load(self, resource_id: str, mask: int):
+        """Rebuild a resource's runs from its occupancy mask"""
+        self.runs.pop(resource_id, None)
+        while mask:
+            low = mask & -mask
+            self.occupy(resource_id, low.bit_length() - 1)
+            mask ^= low
+    
+    def _rerun(self, runs: array, cell: int):
+        """Recompute the free cells leading into cell after it changed"""
+        linked = self.linked
+        p = cell - 1
+        while p >= 0 and linked[p] and runs[p]:
+            runs[p] = runs[p + 1] + 1
+            p -= 1
\ No newline at end of file
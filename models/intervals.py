@@ -0,0 +1,97 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+def to_minutes(clock: str) -> int:
+    """'09:30' -> 570"""
+    hours, minutes = clock.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def format_minutes(minutes: int) -> str:
+    """570 -> '09:30' (minute of day)"""
+    minutes %= MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def slot_bounds(time_slot: str) -> Tuple[int, int]:
+    """'09:00-10:00' -> (540, 600)"""
+    start, end = time_slot.split('-')
+    return to_minutes(start), to_minutes(end)
+
+
+class IntervalCalendar:
+    """Busy [start, end) minute intervals per resource, kept in sorted start/end arrays
+    
+    Neighbouring intervals of a resource must leave `gap` idle minutes
+    between one end and the next start, and starts must be at least
+    `spacing` minutes apart. Intervals never overlap, so both arrays stay
+    sorted and only the two neighbours of a candidate need checking.
+    """
+    
+    def __init__(self, gap: int = 0, spacing: int = 0):
+        self.gap = gap
+        self.spacing = spacing
+        self.starts: Dict[str, List[int]] = {}
+        self.ends: Dict[str, List[int]] = {}
+    
+    def add(self, resource_id: str, start: int, end: int):
+        """Book [start, end) for a resource (feasibility is the caller's check)"""
+        starts = self.starts.setdefault(resource_id, [])
+        i = bisect_left(starts, start)
+        starts.insert(i, start)
+        self.ends.setdefault(resource_id, []).insert(i, end)
+    
+    def remove(self, resource_id: str, start: int, end: int):
+        """Drop a booking made with add()"""
+        starts, ends = self.starts[resource_id], self.ends[resource_id]
+        i = bisect_left(starts, start)
+        while starts[i] != start or ends[i] != end:
+            i += 1
+        del starts[i], ends[i]
+    
+    def intervals(self, resource_id: str) -> List[Tuple[int, int]]:
+        return list(zip(self.starts.get(resource_id, ()), self.ends.get(resource_id, ())))
+    
+    def is_free(self, resource_id: str, start: int, end: int) -> bool:
+        """Whether [start, end) fits between the resource's neighbouring bookings"""
+        starts = self.starts.get(resource_id)
+        if not starts:
+            return True
+        i = bisect_right(starts, start)
+        if i:
+            if self.ends[resource_id][i - 1] + self.gap > start or starts[i - 1] + self.spacing > start:
+                return False
+        if i < len(starts):
+            if end + self.gap > starts[i] or start + self.spacing > starts[i]:
+                return False
+        return True
+    
+    def earliest(self, resource_id: str, start: int, duration: int) -> int:
+        """Earliest t >= start where [t, t + duration) is free: O(log n) plus bookings skipped"""
+        starts = self.starts.get(resource_id)
+        if not starts:
+            return start
+        ends, gap, spacing = self.ends[resource_id], self.gap, self.spacing
+        i = bisect_right(starts, start)
+        t = start
+        if i:
+            t = max(t, ends[i - 1] + gap, starts[i - 1] + spacing)
+        while i < len(starts) and (t + duration + gap > starts[i] or t + spacing > starts[i]):
+            t = max(t, ends[i] + gap, starts[i] + spacing)
+            i += 1
+        return t
+    
+    @staticmethod
+    def earliest_common(bookings: List[Tuple['IntervalCalendar', str]], start: int, duration: int,
+                        latest: int) -> int:
+        """Earliest t >= start free in every (calendar, resource); > latest when there is none"""
+        t = start
+        while t <= latest:
+            moved = False
+            for calendar, resource_id in bookings:
+                t_next = calendar.earliest(resource_id, t, duration)
+                if t_next != t:
+                    t, moved = t_next, True
+            if not moved:
+                return t
+        return t
\ No newline at end of file
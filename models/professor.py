@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from typing import List
+from models.calendar import ResourceCalendar
 
-@dataclass
+@dataclass(slots=True)
 class Professor:
     """Professor data model"""
     prof_id: str
@@ -9,15 +10,21 @@ class Professor:
     department: str = ""
     max_hours_per_week: int = 18
     available_slots: List[str] = field(default_factory=list)
-    assigned_courses: List[str] = field(default_factory=list)
+    assigned_mask: int = 0  # ResourceCalendar bitmask of assigned slots
+    
+    @property
+    def assigned_courses(self) -> List[str]:
+        """Assigned slots as "day-slot" keys"""
+        return ResourceCalendar.shared().time_keys(self.assigned_mask)
     
     def is_available(self, day: str, slot: str) -> bool:
         """Check if professor is available at given time"""
-        time_key = f"{day}-{slot}"
-        return time_key not in self.assigned_courses
+        return not self.assigned_mask & ResourceCalendar.shared().bits[day][slot]
     
     def assign_slot(self, day: str, slot: str):
         """Assign a slot to professor"""
-        time_key = f"{day}-{slot}"
-        if time_key not in self.assigned_courses:
-            self.assigned_courses.append(time_key)
\ No newline at end of file
+        self.assigned_mask |= ResourceCalendar.shared().bits[day][slot]
+    
+    def release_slot(self, day: str, slot: str):
+        """Release an assigned slot"""
+        self.assigned_mask &= ~ResourceCalendar.shared().bits[day][slot]
\ No newline at end of file
@@ -1,22 +1,29 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import List
+from models.calendar import ResourceCalendar
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     """Room data model"""
     room_id: str
     capacity: int
     room_type: str  # Lecture, Lab, Seminar
     accessible: bool = False
-    occupied_slots: List[str] = field(default_factory=list)
+    occupied_mask: int = 0  # ResourceCalendar bitmask of occupied slots
+    
+    @property
+    def occupied_slots(self) -> List[str]:
+        """Occupied slots as "day-slot" keys"""
+        return ResourceCalendar.shared().time_keys(self.occupied_mask)
     
     def is_available(self, day: str, slot: str) -> bool:
         """Check if room is available at given time"""
-        time_key = f"{day}-{slot}"
-        return time_key not in self.occupied_slots
+        return not self.occupied_mask & ResourceCalendar.shared().bits[day][slot]
     
     def occupy_slot(self, day: str, slot: str):
         """Mark room as occupied for given slot"""
-        time_key = f"{day}-{slot}"
-        if time_key not in self.occupied_slots:
-            self.occupied_slots.append(time_key)
\ No newline at end of file
+        self.occupied_mask |= ResourceCalendar.shared().bits[day][slot]
+    
+    def release_slot(self, day: str, slot: str):
+        """Mark room as free for given slot"""
+        self.occupied_mask &= ~ResourceCalendar.shared().bits[day][slot]
\ No newline at end of file
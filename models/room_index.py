@@ -0,0 +1,79 @@
+from bisect import bisect_left
+from typing import List, Dict, Optional
+from models.room import Room
+from models.calendar import ResourceCalendar
+
+class RoomIndex:
+    """Free-room index keyed by (room_type, day, slot)"""
+    
+    def __init__(self, rooms: List[Room], grid: ResourceCalendar = None):
+        self.grid = grid or ResourceCalendar.shared()
+        
+        # Rooms of each type in ascending capacity order (stable for ties)
+        self.rooms_by_type: Dict[str, List[Room]] = {}
+        for room in rooms:
+            self.rooms_by_type.setdefault(room.room_type, []).append(room)
+        for typed_rooms in self.rooms_by_type.values():
+            typed_rooms.sort(key=lambda r: r.capacity)
+        
+        self.capacities: Dict[str, List[int]] = {
+            room_type: [r.capacity for r in typed_rooms]
+            for room_type, typed_rooms in self.rooms_by_type.items()
+        }
+        self.positions: Dict[str, int] = {}
+        self.counters: Optional[Dict[str, int]] = None
+        
+        # free[room_type][cell] -> bitmask over rooms_by_type[room_type]
+        self.free: Dict[str, List[int]] = {}
+        for room_type, typed_rooms in self.rooms_by_type.items():
+            cells = [0] * self.grid.size
+            for pos, room in enumerate(typed_rooms):
+                self.positions[room.room_id] = pos
+                occupied = room.occupied_mask
+                for cell in range(self.grid.size):
+                    if not (occupied >> cell) & 1:
+                        cells[cell] |= 1 << pos
+            self.free[room_type] = cells
+    
+    def find(self, room_type: str, day: str, slot: str, min_capacity: int = 0) -> Optional[Room]:
+        """Return the smallest free room of a type with at least min_capacity seats"""
+        typed_rooms = self.rooms_by_type.get(room_type)
+        if not typed_rooms:
+            return None
+        
+        start = bisect_left(self.capacities[room_type], min_capacity)
+        cells = self.free[room_type]
+        cell = self.grid.index(day, slot)
+        free = cells[cell] >> start
+        counters = self.counters
+        if counters is not None:
+            counters['room_lookups'] = counters.get('room_lookups', 0) + 1
+        while free:
+            low = free & -free
+            pos = start + low.bit_length() - 1
+            room = typed_rooms[pos]
+            if counters is not None:
+                counters['room_scans'] = counters.get('room_scans', 0) + 1
+            if room.is_available(day, slot):
+                return room
+            # Room was occupied behind the index's back; drop the stale bit
+            cells[cell] &= ~(1 << pos)
+            free ^= low
+        return None
+    
+    def occupy(self, room: Room, day: str, slot: str):
+        """Mark room as occupied and remove it from the free index"""
+        room.occupy_slot(day, slot)
+        self.free[room.room_type][self.grid.index(day, slot)] &= ~(1 << self.positions[room.room_id])
+    
+    def release(self, room: Room, day: str, slot: str):
+        """Mark room as free and return it to the free index"""
+        room.release_slot(day, slot)
+        self.free[room.room_type][self.grid.index(day, slot)] |= 1 << self.positions[room.room_id]
+    
+    def free_rooms(self, room_type: str, day: str, slot: str) -> List[Room]:
+        """List free rooms of a type in ascending capacity order"""
+        typed_rooms = self.rooms_by_type.get(room_type, [])
+        free = self.free.get(room_type, [0] * self.grid.size)[self.grid.index(day, slot)]
+        return [room for pos, room in enumerate(typed_rooms)
+                if (free >> pos) & 1 and room.is_available(day, slot)]
\ No newline at end of file
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class TimetableEntry:
     """Timetable entry data model"""
+    FIELDS = ('slot_id', 'day', 'time_slot', 'course_code', 'course_name', 
+              'room_id', 'instructor_id', 'batch_id', 'session_type')
+    
     slot_id: str
     day: str
     time_slot: str
@@ -26,3 +29,8 @@ class TimetableEntry:
             'batch_id': self.batch_id,
             'session_type': self.session_type
         }
+    
+    def to_row(self) -> tuple:
+        """Convert to a tuple in FIELDS order for CSV export"""
+        return (self.slot_id, self.day, self.time_slot, self.course_code, self.course_name,
+                self.room_id, self.instructor_id, self.batch_id, self.session_type)
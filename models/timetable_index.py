@@ -0,0 +1,117 @@
+from typing import List, Dict, Tuple, Iterable, Optional
+from models.timetable import TimetableEntry
+from models.calendar import ResourceCalendar
+from config import Config
+
+# Resource kind -> TimetableEntry field holding its ID
+RESOURCE_FIELDS = {
+    'batch': 'batch_id',
+    'room': 'room_id',
+    'professor': 'instructor_id',
+    'course': 'course_code',
+}
+
+class TimetableIndex:
+    """Per-batch, per-room, per-professor and per-course index over timetable entries
+    
+    Each resource keeps its entries by grid cell plus an occupancy mask, so
+    lookups cost O(result) and free-slot searches are a few mask operations.
+    """
+    
+    def __init__(self, entries: Iterable[TimetableEntry] = (), grid: ResourceCalendar = None):
+        self.grid = grid or ResourceCalendar.shared()
+        # kind -> resource_id -> cell -> entries
+        self.cells: Dict[str, Dict[str, Dict[int, List[TimetableEntry]]]] = {kind: {} for kind in RESOURCE_FIELDS}
+        self.calendars: Dict[str, ResourceCalendar] = {
+            kind: ResourceCalendar(self.grid.days, self.grid.slots) for kind in RESOURCE_FIELDS
+        }
+        self.lunch_mask = 0
+        if Config.LUNCH_SLOT in self.grid.slot_index:
+            for day in self.grid.days:
+                self.lunch_mask |= self.grid.bits[day][Config.LUNCH_SLOT]
+        for entry in entries:
+            self.add(entry)
+    
+    @staticmethod
+    def _field(kind: str) -> str:
+        if kind not in RESOURCE_FIELDS:
+            raise ValueError(f"Unknown resource kind: {kind}")
+        return RESOURCE_FIELDS[kind]
+    
+    def add(self, entry: TimetableEntry):
+        """Index one entry under each of its resources"""
+        cell = self.grid.index(entry.day, entry.time_slot)
+        for kind, field in RESOURCE_FIELDS.items():
+            resource_id = getattr(entry, field)
+            self.cells[kind].setdefault(resource_id, {}).setdefault(cell, []).append(entry)
+            self.calendars[kind].occupy(resource_id, entry.day, entry.time_slot)
+    
+    def remove(self, entry: TimetableEntry):
+        """Drop the entry with this slot_id from the cell given by entry.day/time_slot"""
+        cell = self.grid.index(entry.day, entry.time_slot)
+        for kind, field in RESOURCE_FIELDS.items():
+            resource_id = getattr(entry, field)
+            by_cell = self.cells[kind].get(resource_id, {})
+            kept = [e for e in by_cell.get(cell, ()) if e.slot_id != entry.slot_id]
+            if kept:
+                by_cell[cell] = kept
+                continue
+            by_cell.pop(cell, None)
+            if not by_cell:
+                self.cells[kind].pop(resource_id, None)
+            self.calendars[kind].release(resource_id, entry.day, entry.time_slot)
+    
+    def resources(self, kind: str) -> List[str]:
+        """IDs of a kind that have at least one entry"""
+        self._field(kind)
+        return sorted(self.cells[kind])
+    
+    def busy_mask(self, kind: str, resource_id: str) -> int:
+        """Occupancy mask of one resource"""
+        self._field(kind)
+        return self.calendars[kind].mask(resource_id)
+    
+    def is_free(self, kind: str, resource_id: str, day: str, time_slot: str) -> bool:
+        return not self.busy_mask(kind, resource_id) & self.grid.bits[day][time_slot]
+    
+    def entries(self, kind: str, resource_id: str, day: str = None,
+                time_slot: str = None) -> List[TimetableEntry]:
+        """Entries of a resource in week order, optionally limited to a day and slot"""
+        mask = self.busy_mask(kind, resource_id)
+        if day is not None:
+            mask &= self.grid.day_mask(day)
+        if time_slot is not None:
+            mask &= sum(self.grid.bits[d][time_slot] for d in self.grid.days)
+        by_cell = self.cells[kind].get(resource_id, {})
+        result = []
+        while mask:
+            low = mask & -mask
+            result.extend(by_cell[low.bit_length() - 1])
+            mask ^= low
+        return result
+    
+    def free_mask(self, resources: Iterable[Tuple[str, str]], days: Iterable[str] = None,
+                  skip_lunch: bool = True) -> int:
+        """Cells where every (kind, resource_id) is free"""
+        busy = 0
+        for kind, resource_id in resources:
+            busy |= self.busy_mask(kind, resource_id)
+        allowed = self.grid.full_mask
+        if days is not None:
+            allowed = 0
+            for day in days:
+                allowed |= self.grid.day_mask(day)
+        if skip_lunch:
+            allowed &= ~self.lunch_mask
+        return allowed & ~busy
+    
+    def free_slots(self, resources: Iterable[Tuple[str, str]], days: Iterable[str] = None,
+                   skip_lunch: bool = True) -> List[Tuple[str, str]]:
+        """(day, time_slot) cells where every given resource is free, in week order"""
+        return self.grid.decode(self.free_mask(resources, days, skip_lunch))
+    
+    def first_free(self, resources: Iterable[Tuple[str, str]], days: Iterable[str] = None,
+                   skip_lunch: bool = True) -> Optional[Tuple[str, str]]:
+        """Earliest cell where every given resource is free"""
+        mask = self.free_mask(resources, days, skip_lunch)
+        return self.grid.cell((mask & -mask).bit_length() - 1) if mask else None
\ No newline at end of file
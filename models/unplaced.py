@@ -0,0 +1,45 @@
+from typing import Dict, Iterable, Iterator, Tuple
+from models.course import Course
+
+class UnplacedSessions:
+    """Insertion-ordered set of (course, session index) pairs awaiting a slot
+    
+    Keyed by slot id, so membership, append and remove are O(1) however many
+    sessions are unplaced; iterating yields the pairs in the order they were added.
+    """
+    
+    def __init__(self, sessions: Iterable[Tuple[Course, int]] = ()):
+        self._sessions: Dict[str, Tuple[Course, int]] = {}
+        self.extend(sessions)
+    
+    @staticmethod
+    def _key(session: Tuple[Course, int]) -> str:
+        course, index = session
+        return f"{course.course_code}-{index}"
+    
+    def append(self, session: Tuple[Course, int]):
+        self._sessions[self._key(session)] = session
+    
+    def extend(self, sessions: Iterable[Tuple[Course, int]]):
+        for session in sessions:
+            self.append(session)
+    
+    def remove(self, session: Tuple[Course, int]):
+        del self._sessions[self._key(session)]
+    
+    def discard(self, session: Tuple[Course, int]):
+        self._sessions.pop(self._key(session), None)
+    
+    def replace(self, sessions: Iterable[Tuple[Course, int]]):
+        """Keep exactly the given sessions"""
+        self._sessions.clear()
+        self.extend(sessions)
+    
+    def __contains__(self, session: Tuple[Course, int]) -> bool:
+        return self._key(session) in self._sessions
+    
+    def __iter__(self) -> Iterator[Tuple[Course, int]]:
+        return iter(list(self._sessions.values()))
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
\ No newline at end of file
@@ -1,31 +1,94 @@
-from typing import List, Dict
+import os
+from typing import List, Dict, Set, Iterator, Tuple, Callable, Any
 from models.professor import Professor
 from models.room import Room
 from models.course import Course
-from utils.csv_handler import CSVHandler
+from models.enrollment import EnrollmentStore
+from models.timetable import TimetableEntry
+from utils.csv_handler import CSVHandler, REQUIRED
+from utils.input_cache import InputCache
 from utils.logger import Logger
 
+def _yes_no(value: str) -> bool:
+    """Parse a yes/no CSV flag"""
+    return value.lower() == 'yes'
+
 class DataLoader:
     """Service for loading data from CSV files"""
     
-    def __init__(self):
+    # Column specs in model field order: (header, converter, default)
+    PROFESSOR_COLUMNS = [
+        ('prof_id', str, REQUIRED), ('name', str, REQUIRED),
+        ('department', str, ''), ('max_hours', int, 18)
+    ]
+    ROOM_COLUMNS = [
+        ('room_id', str, REQUIRED), ('capacity', int, REQUIRED),
+        ('type', str, REQUIRED), ('accessible', _yes_no, False)
+    ]
+    COURSE_COLUMNS = [
+        ('course_code', str, REQUIRED), ('course_name', str, REQUIRED),
+        ('L', int, REQUIRED), ('T', int, REQUIRED), ('P', int, REQUIRED),
+        ('credits', int, REQUIRED), ('instructor_id', str, REQUIRED),
+        ('batch_id', str, REQUIRED)
+    ]
+    ENROLLMENT_COLUMNS = [('course_code', str, REQUIRED), ('student_id', str, REQUIRED)]
+    ACCESSIBILITY_COLUMNS = [('student_id', str, REQUIRED)]
+    TIMETABLE_COLUMNS = [(name, str, REQUIRED) for name in TimetableEntry.FIELDS]
+    
+    # Files smaller than this are parsed in-process even when workers are requested
+    PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+    
+    def __init__(self, workers: int = None, cache: InputCache = None):
         self.logger = Logger("DataLoader")
         self.csv_handler = CSVHandler()
+        self.workers = workers
+        self.cache = cache
+    
+    def iter_professors(self, filepath: str) -> Iterator[Professor]:
+        """Stream professors from CSV"""
+        for values in self._iter_records(filepath, self.PROFESSOR_COLUMNS):
+            yield Professor(*values)
+    
+    def iter_rooms(self, filepath: str) -> Iterator[Room]:
+        """Stream rooms from CSV"""
+        for values in self._iter_records(filepath, self.ROOM_COLUMNS):
+            yield Room(*values)
+    
+    def iter_courses(self, filepath: str) -> Iterator[Course]:
+        """Stream courses from CSV"""
+        for values in self._iter_records(filepath, self.COURSE_COLUMNS):
+            yield Course(*values)
+    
+    def iter_enrollments(self, filepath: str) -> Iterator[Tuple[str, str]]:
+        """Stream (course_code, student_id) pairs from CSV"""
+        return self._iter_records(filepath, self.ENROLLMENT_COLUMNS)
+    
+    def iter_timetable(self, filepath: str) -> Iterator[TimetableEntry]:
+        """Stream entries of a generated (or hand-edited) timetable CSV"""
+        for values in self._iter_records(filepath, self.TIMETABLE_COLUMNS):
+            yield TimetableEntry(*values)
+    
+    def _iter_records(self, filepath: str, spec) -> Iterator[tuple]:
+        """Stream typed rows, splitting large files across a process pool"""
+        if self.workers and self.workers > 1 and self._is_large(filepath):
+            return self.csv_handler.iter_records_parallel(filepath, spec, self.workers)
+        return self.csv_handler.iter_records(filepath, spec)
+    
+    def _is_large(self, filepath: str) -> bool:
+        """Check if a file is big enough to be worth parsing in parallel"""
+        return os.path.exists(filepath) and os.path.getsize(filepath) >= self.PARALLEL_MIN_BYTES
+    
+    def _cached(self, filepath: str, kind: str, parse: Callable[[], Any], **codec) -> Any:
+        """Parse a file, going through the input cache when one is configured"""
+        if self.cache is None:
+            return parse()
+        return self.cache.load(filepath, kind, parse, **codec)
     
     def load_professors(self, filepath: str) -> List[Professor]:
         """Load professors from CSV"""
         self.logger.info(f"Loading professors from {filepath}")
-        data = self.csv_handler.read_csv(filepath)
-        
-        professors = []
-        for row in data:
-            prof = Professor(
-                prof_id=row['prof_id'],
-                name=row['name'],
-                department=row.get('department', ''),
-                max_hours_per_week=int(row.get('max_hours', 18))
-            )
-            professors.append(prof)
+        professors = self._cached(filepath, 'professors', lambda: list(self.iter_professors(filepath)),
+                                  **InputCache.model_codec(Professor))
         
         self.logger.info(f"Loaded {len(professors)} professors")
         return professors
@@ -33,17 +96,8 @@ class DataLoader:
     def load_rooms(self, filepath: str) -> List[Room]:
         """Load rooms from CSV"""
         self.logger.info(f"Loading rooms from {filepath}")
-        data = self.csv_handler.read_csv(filepath)
-        
-        rooms = []
-        for row in data:
-            room = Room(
-                room_id=row['room_id'],
-                capacity=int(row['capacity']),
-                room_type=row['type'],
-                accessible=row.get('accessible', 'no').lower() == 'yes'
-            )
-            rooms.append(room)
+        rooms = self._cached(filepath, 'rooms', lambda: list(self.iter_rooms(filepath)),
+                             **InputCache.model_codec(Room))
         
         self.logger.info(f"Loaded {len(rooms)} rooms")
         return rooms
@@ -51,21 +105,8 @@ class DataLoader:
     def load_courses(self, filepath: str) -> List[Course]:
         """Load courses from CSV"""
         self.logger.info(f"Loading courses from {filepath}")
-        data = self.csv_handler.read_csv(filepath)
-        
-        courses = []
-        for row in data:
-            course = Course(
-                course_code=row['course_code'],
-                course_name=row['course_name'],
-                L=int(row['L']),
-                T=int(row['T']),
-                P=int(row['P']),
-                credits=int(row['credits']),
-                instructor_id=row['instructor_id'],
-                batch_id=row['batch_id']
-            )
-            courses.append(course)
+        courses = self._cached(filepath, 'courses', lambda: list(self.iter_courses(filepath)),
+                               **InputCache.model_codec(Course))
         
         self.logger.info(f"Loaded {len(courses)} courses")
         return courses
@@ -73,16 +114,46 @@ class DataLoader:
     def load_students(self, filepath: str) -> Dict[str, List[str]]:
         """Load student enrollments from CSV"""
         self.logger.info(f"Loading students from {filepath}")
-        data = self.csv_handler.read_csv(filepath)
-        
-        enrollments = {}
-        for row in data:
-            course_code = row['course_code']
-            student_id = row['student_id']
-            
-            if course_code not in enrollments:
-                enrollments[course_code] = []
-            enrollments[course_code].append(student_id)
+        enrollments = self._cached(filepath, 'students', lambda: self._group_enrollments(filepath))
         
         self.logger.info(f"Loaded enrollments for {len(enrollments)} courses")
         return enrollments
+    
+    def _group_enrollments(self, filepath: str) -> Dict[str, List[str]]:
+        """Group (course_code, student_id) pairs into a course -> students dict"""
+        enrollments = {}
+        for course_code, student_id in self.iter_enrollments(filepath):
+            students = enrollments.get(course_code)
+            if students is None:
+                students = enrollments[course_code] = []
+            students.append(student_id)
+        return enrollments
+    
+    def load_enrollment_store(self, filepath: str) -> EnrollmentStore:
+        """Load student enrollments from CSV into a compact CSR store"""
+        self.logger.info(f"Loading students from {filepath}")
+        store = self._cached(filepath, 'enrollment-store',
+                             lambda: EnrollmentStore.from_pairs(self.iter_enrollments(filepath)),
+                             dump=lambda value, path: value.save(path), restore=EnrollmentStore.load)
+        
+        self.logger.info(f"Loaded {len(store.indices)} enrollments for {len(store)} courses "
+                         f"({len(store.student_ids)} students)")
+        return store
+    
+    def load_accessibility(self, filepath: str) -> Set[str]:
+        """Load students needing accessible exam rooms (R14); the file is optional"""
+        if not os.path.exists(filepath):
+            return set()
+        self.logger.info(f"Loading accessibility needs from {filepath}")
+        students = {student_id for student_id, in self._iter_records(filepath, self.ACCESSIBILITY_COLUMNS)}
+        
+        self.logger.info(f"Loaded {len(students)} students needing accessible rooms")
+        return students
+    
+    def load_timetable(self, filepath: str) -> List[TimetableEntry]:
+        """Load timetable entries from CSV"""
+        self.logger.info(f"Loading timetable from {filepath}")
+        timetable = list(self.iter_timetable(filepath))
+        
+        self.logger.info(f"Loaded {len(timetable)} timetable entries")
+        return timetable
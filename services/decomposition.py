@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Mapping, Iterable
+from models.course import Course
+from models.professor import Professor
+from models.room import Room
+from models.calendar import ResourceCalendar
+from models.enrollment import EnrollmentStore
+from services.timetable_generator import TimetableGenerator
+from services.exam_conflict import ConflictGraph
+from services.worker_state import shared, init_worker, fresh_resources, timetable_rows, entries_from_rows
+from config import Config
+from utils.logger import Logger
+
+def find_components(courses: List[Course], enrollments: Mapping[str, Iterable[str]] = None,
+                    graph: ConflictGraph = None) -> List[List[int]]:
+    """Group course positions that share a professor, a batch or (with enrollments or graph) a student"""
+    parent: Dict[str, str] = {}
+    
+    def root(node: str) -> str:
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    for course in courses:
+        a, b = root(f"P:{course.instructor_id}"), root(f"B:{course.batch_id}")
+        if a != b:
+            parent[b] = a
+    
+    # Courses sharing students must not share a slot, so they are solved together
+    if graph is None and enrollments:
+        graph = ConflictGraph([course.course_code for course in courses], enrollments)
+    if graph is not None:
+        instructors = {course.course_code: course.instructor_id for course in courses}
+        for course in courses:
+            a = root(f"P:{course.instructor_id}")
+            rest = graph.adjacency[graph.index[course.course_code]]
+            while rest:
+                low = rest & -rest
+                rest ^= low
+                b = root(f"P:{instructors[graph.course_codes[low.bit_length() - 1]]}")
+                if a != b:
+                    parent[b] = a
+    
+    components: Dict[str, List[int]] = {}
+    for i, course in enumerate(courses):
+        components.setdefault(root(f"P:{course.instructor_id}"), []).append(i)
+    return list(components.values())
+
+def _solve_part(positions: List[int], blocked: Dict[str, int]) -> Tuple[list, int]:
+    """Schedule a subset of courses on the room cells left open by blocked"""
+    professors, rooms = fresh_resources()
+    for room in rooms:
+        room.occupied_mask = blocked.get(room.room_id, 0)
+    courses = [shared['courses'][i] for i in positions]
+    generator = TimetableGenerator(courses, professors, rooms, shared['enrollments'])
+    generator.generate()
+    return timetable_rows(generator.timetable), len(generator.unplaced)
+
+
+class DecomposedGenerator:
+    """Split courses into independent professor/batch/student components and schedule them in parallel"""
+    
+    def __init__(self, courses: List[Course], professors: Dict[str, Professor],
+                 rooms: List[Room], enrollments: Dict[str, List[str]] = None,
+                 workers: int = None):
+        self.courses = courses
+        self.professors = professors
+        self.rooms = rooms
+        self.enrollments = enrollments or {}
+        self.workers = workers or os.cpu_count() or 1
+        # Results are merged back through load_timetable, which works on the slot grid
+        if Config.PLACEMENT_BACKEND != 'slots':
+            raise ValueError(f"Decomposition needs the 'slots' placement backend, "
+                             f"not '{Config.PLACEMENT_BACKEND}'")
+        self.logger = Logger("DecomposedGenerator")
+    
+    def run(self) -> TimetableGenerator:
+        """Return a generator holding the merged timetable"""
+        generator = TimetableGenerator(self.courses, self.professors, self.rooms, self.enrollments)
+        # The merged generator's student-overlap graph is the one components need
+        conflicts = generator.student_conflicts
+        components = find_components(self.courses, graph=conflicts.graph if conflicts else None)
+        parts = self._bin_components(components)
+        self.logger.info(f"Scheduling {len(components)} independent components "
+                         f"as {len(parts)} parts on {self.workers} workers...")
+        
+        if len(parts) < 2:
+            generator.generate()
+            return generator
+        
+        blocked = self._partition_rooms(parts)
+        state = dict(courses=self.courses, professors=self.professors, rooms=self.rooms,
+                     enrollments=self.enrollments)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(parts)),
+                                 initializer=init_worker, initargs=(state,)) as executor:
+            results = list(executor.map(_solve_part, parts, blocked))
+        
+        rows = [row for part_rows, _ in results for row in part_rows]
+        generator.load_timetable(entries_from_rows(generator.courses_by_code, rows))
+        
+        # Room cells a part could not use are free again in the merged calendar
+        unplaced = len(generator.unplaced)
+        repaired = generator.repair_unplaced()
+        self.logger.info(f"Merged {len(rows)} entries; repaired {repaired} of {unplaced} "
+                         f"unplaced sessions")
+        if generator.unplaced:
+            generator.logger.warning(f"{len(generator.unplaced)} sessions could not be placed")
+        return generator
+    
+    def _bin_components(self, components: List[List[int]]) -> List[List[int]]:
+        """Pack components into at most `workers` parts, largest first onto the lightest part"""
+        parts = [[] for _ in range(min(self.workers, len(components)))]
+        loads = [0] * len(parts)
+        sessions = lambda component: sum(self.courses[i].total_sessions() for i in component)
+        for component in sorted(components, key=lambda c: (-sessions(c), c[0])):
+            lightest = loads.index(min(loads))
+            parts[lightest].extend(component)
+            loads[lightest] += sessions(component)
+        # Keep input order inside a part so results match the sequential course order
+        return [sorted(part) for part in parts if part]
+    
+    def _course_size(self, course: Course) -> int:
+        if isinstance(self.enrollments, EnrollmentStore):
+            return self.enrollments.course_size(course.course_code)
+        return len(self.enrollments.get(course.course_code, ()))
+    
+    def _partition_rooms(self, parts: List[List[int]]) -> List[Dict[str, int]]:
+        """Share each room type's room-days among parts in proportion to their seat-hours
+        
+        A part gets whole days of a room, so lab blocks stay contiguous, and the
+        largest rooms go first to the part furthest below its share. Returns,
+        per part, room_id -> mask of cells reserved for other parts.
+        """
+        grid = ResourceCalendar.shared()
+        demand: List[Dict[str, int]] = []
+        for part in parts:
+            seat_hours: Dict[str, int] = {}
+            for i in part:
+                course = self.courses[i]
+                size = self._course_size(course) or 1
+                for index in range(course.total_sessions()):
+                    _, room_type = TimetableGenerator._session_kind(course, index)
+                    seat_hours[room_type] = seat_hours.get(room_type, 0) + size
+            demand.append(seat_hours)
+        
+        blocked = [{room.room_id: grid.full_mask for room in self.rooms} for _ in parts]
+        rooms_by_type: Dict[str, List[Room]] = {}
+        for room in self.rooms:
+            rooms_by_type.setdefault(room.room_type, []).append(room)
+        
+        for room_type, typed_rooms in rooms_by_type.items():
+            wanted = [seat_hours.get(room_type, 0) for seat_hours in demand]
+            total = sum(wanted)
+            if not total:
+                continue
+            # (seat-hours, room, free cells of one day), largest rooms first
+            room_days = []
+            for room in sorted(typed_rooms, key=lambda r: -r.capacity):
+                for day in grid.days:
+                    free = grid.day_mask(day) & ~room.occupied_mask
+                    if free:
+                        room_days.append((room.capacity * bin(free).count('1'), room, free))
+            supply = sum(seat_hours for seat_hours, _, _ in room_days)
+            quota = [supply * w / total for w in wanted]
+            given = [0] * len(parts)
+            for seat_hours, room, free in room_days:
+                p = max(range(len(parts)), key=lambda k: quota[k] - given[k])
+                blocked[p][room.room_id] &= ~free
+                given[p] += seat_hours
+        return blocked
\ No newline at end of file
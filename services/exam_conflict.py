@@ -0,0 +1,101 @@
+import heapq
+from typing import List, Dict, Callable, Mapping, Iterable
+from models.enrollment import EnrollmentStore
+
+def popcount(mask: int) -> int:
+    """Number of set bits in a mask"""
+    return bin(mask).count('1')
+
+class ConflictGraph:
+    """Student-conflict graph between courses, stored as adjacency bitsets"""
+    
+    def __init__(self, course_codes: List[str], enrollments: Mapping[str, Iterable[str]]):
+        self.course_codes = list(course_codes)
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(self.course_codes)}
+        self.adjacency: List[int] = [0] * len(self.course_codes)
+        
+        if isinstance(enrollments, EnrollmentStore):
+            # Interned store: sizes and per-student masks come straight from the CSR arrays
+            self.sizes: List[int] = [enrollments.course_size(code) for code in self.course_codes]
+            self._add_cliques(enrollments.course_masks(self.course_codes))
+            return
+        
+        self.sizes = [len(enrollments.get(code, ())) for code in self.course_codes]
+        
+        # Collapse each student into the bitmask of courses they sit
+        student_courses: Dict[str, int] = {}
+        for i, code in enumerate(self.course_codes):
+            bit = 1 << i
+            for student_id in enrollments.get(code, ()):
+                student_courses[student_id] = student_courses.get(student_id, 0) | bit
+        
+        self._add_cliques(student_courses.values())
+    
+    def _add_cliques(self, course_masks: Iterable[int]):
+        """Connect every pair of courses that appear together in a mask"""
+        adjacency = self.adjacency
+        # Students with identical course sets contribute the same clique
+        for mask in set(course_masks):
+            if not mask & (mask - 1):
+                continue
+            rest = mask
+            while rest:
+                low = rest & -rest
+                adjacency[low.bit_length() - 1] |= mask
+                rest ^= low
+        for i in range(len(adjacency)):
+            adjacency[i] &= ~(1 << i)
+    
+    def conflicts(self, code_a: str, code_b: str) -> bool:
+        """Check if two courses share at least one student"""
+        return bool((self.adjacency[self.index[code_a]] >> self.index[code_b]) & 1)
+    
+    def degree(self, i: int) -> int:
+        """Number of courses conflicting with course i"""
+        return popcount(self.adjacency[i])
+    
+    def dsatur(self, allocate: Callable[[int, int], bool]) -> List[int]:
+        """Color courses with DSatur; allocate(color, course) accepts or rejects a slot
+        
+        allocate must accept a course on a color no course holds yet; a
+        refusal there raises ValueError instead of trying colors forever.
+        """
+        n = len(self.course_codes)
+        colors = [-1] * n
+        used = 0  # colors below this hold at least one course
+        neighbor_colors = [0] * n
+        saturation = [0] * n
+        degrees = [self.degree(i) for i in range(n)]
+        
+        # Max-heap on (saturation, degree, size); stale entries are skipped on pop
+        heap = [(0, -degrees[i], -self.sizes[i], i) for i in range(n)]
+        heapq.heapify(heap)
+        
+        while heap:
+            neg_sat, _, _, i = heapq.heappop(heap)
+            if colors[i] != -1 or -neg_sat != saturation[i]:
+                continue
+            
+            blocked = neighbor_colors[i]
+            color = 0
+            while True:
+                if not (blocked >> color) & 1 and allocate(color, i):
+                    break
+                if color >= used:
+                    raise ValueError(f"Course {self.course_codes[i]} rejected by an empty slot")
+                color += 1
+            colors[i] = color
+            used = max(used, color + 1)
+            
+            bit = 1 << color
+            rest = self.adjacency[i]
+            while rest:
+                low = rest & -rest
+                j = low.bit_length() - 1
+                rest ^= low
+                if colors[j] == -1 and not neighbor_colors[j] & bit:
+                    neighbor_colors[j] |= bit
+                    saturation[j] += 1
+                    heapq.heappush(heap, (-saturation[j], -degrees[j], -self.sizes[j], j))
+        
+        return colors
\ No newline at end of file
@@ -0,0 +1,231 @@
+from bisect import bisect_left, insort
+from typing import List, Dict, Tuple, Optional, Set
+from models.room import Room
+from config import Config
+
+# (exam_code, students, students needing an accessible room)
+ExamDemand = Tuple[str, int, int]
+
+class SlotPacking:
+    """Seats left in every exam room during one sitting
+    
+    One exam takes at most limits[pos] seats of a room so its students can be
+    spread out there; free lists hold what a new exam could still take.
+    """
+    
+    def __init__(self, rooms: List[Room], limits: List[int] = None):
+        self.rooms = rooms
+        self.limits = limits or [room.capacity for room in rooms]
+        self.remaining = [room.capacity for room in rooms]
+        # (seats a new exam can take, room position) per accessibility group, ascending
+        self.free: Dict[bool, List[Tuple[int, int]]] = {False: [], True: []}
+        self.available: Dict[bool, int] = {False: 0, True: 0}
+        for pos, room in enumerate(rooms):
+            usable = self._usable(pos)
+            if usable > 0:
+                self.free[room.accessible].append((usable, pos))
+                self.available[room.accessible] += usable
+        for group in self.free.values():
+            group.sort()
+        self.assigned: Dict[str, List[List[int]]] = {}  # exam_code -> [[room position, seats], ...]
+        self.occupants: Dict[int, Dict[str, int]] = {}  # room position -> exam_code -> seats
+        # exam_code -> [students left without a seat, of whom needing an accessible room]
+        self.shortfall: Dict[str, List[int]] = {}
+    
+    def _usable(self, pos: int) -> int:
+        """Seats a new exam can take in the room at pos"""
+        return min(self.remaining[pos], self.limits[pos])
+    
+    def place(self, exam_code: str, need: int, accessible_only: bool = False,
+              force: bool = False) -> bool:
+        """Seat `need` students of an exam, best-fit into one room or spread over the largest
+        
+        Non-accessible rooms are used first so accessible seats stay free for
+        students who need them. With force, an exam larger than the spaced
+        seats left fills rooms up to capacity, then takes every remaining seat;
+        students still left over are recorded in shortfall.
+        """
+        groups = (True,) if accessible_only else (False, True)
+        if need > sum(self.available[g] for g in groups) and not force:
+            return False
+        
+        allocation = self.assigned.setdefault(exam_code, [])
+        while need > 0:
+            taken = {pos for pos, _ in allocation}
+            # Smallest room that takes the rest in one go
+            pos = self.best_fit(need, skip=taken, accessible_only=accessible_only)
+            if pos is None:
+                # Otherwise fill the largest room left, non-accessible first
+                pos = next((p for g in groups for _, p in reversed(self.free[g]) if p not in taken), None)
+                if pos is None:
+                    break
+            share = min(self._usable(pos), need)
+            self.seat(exam_code, pos, share)
+            need -= share
+        if need > 0 and not force:
+            return False
+        
+        # Out of spaced seats: crowd whatever room is left rather than leave students out
+        for pos, room in enumerate(self.rooms):
+            if need <= 0:
+                break
+            if room.accessible in groups and self.remaining[pos] > 0:
+                share = min(self.remaining[pos], need)
+                self.seat(exam_code, pos, share)
+                need -= share
+        if need > 0:
+            short = self.shortfall.setdefault(exam_code, [0, 0])
+            short[0] += need
+            if accessible_only:
+                short[1] += need
+        return True
+    
+    def _set_remaining(self, pos: int, seats: int):
+        """Update a room's free seats and its entry in the free list"""
+        accessible = self.rooms[pos].accessible
+        free = self.free[accessible]
+        before = self._usable(pos)
+        if before > 0:
+            del free[bisect_left(free, (before, pos))]
+        self.remaining[pos] = seats
+        after = self._usable(pos)
+        self.available[accessible] += after - before
+        if after > 0:
+            insort(free, (after, pos))
+    
+    def seat(self, exam_code: str, pos: int, seats: int):
+        """Give an exam `seats` more seats in the room at pos"""
+        self._set_remaining(pos, self.remaining[pos] - seats)
+        occupants = self.occupants.setdefault(pos, {})
+        occupants[exam_code] = occupants.get(exam_code, 0) + seats
+        allocation = self.assigned.setdefault(exam_code, [])
+        for item in allocation:
+            if item[0] == pos:
+                item[1] += seats
+                return
+        allocation.append([pos, seats])
+    
+    def best_fit(self, seats: int, exclude: int = -1, accessible_only: bool = False,
+                 skip: Set[int] = frozenset()) -> Optional[int]:
+        """Position of the fullest room a new `seats`-student share fits in, preferring non-accessible rooms"""
+        for group in ((True,) if accessible_only else (False, True)):
+            free = self.free[group]
+            i = bisect_left(free, (seats, -1))
+            while i < len(free) and (free[i][1] == exclude or free[i][1] in skip):
+                i += 1
+            if i < len(free):
+                return free[i][1]
+        return None
+    
+    def release(self, exam_code: str) -> List[List[int]]:
+        """Free every seat of an exam; returns its previous allocation"""
+        allocation = self.assigned.pop(exam_code, [])
+        for pos, seats in allocation:
+            self._set_remaining(pos, self.remaining[pos] + seats)
+            del self.occupants[pos][exam_code]
+        return allocation
+    
+    def restore(self, exam_code: str, allocation: List[List[int]]):
+        """Re-apply an allocation returned by release()"""
+        for pos, seats in allocation:
+            self.seat(exam_code, pos, seats)
+    
+    def rooms_of(self, exam_code: str) -> List[Tuple[Room, int]]:
+        """(room, seats) allocated to an exam, accessible allocations first"""
+        return [(self.rooms[pos], seats) for pos, seats in self.assigned.get(exam_code, [])]
+
+
+class ExamRoomAllocator:
+    """Packs the exams of each sitting into the exam-room inventory"""
+    
+    REPAIR_CANDIDATES = 16  # rooms tried per split exam during repair
+    
+    def __init__(self, rooms: List[Room], room_types: List[str] = None, min_gap: int = None):
+        room_types = set(room_types or Config.EXAM_ROOM_TYPES)
+        gap = Config.MIN_SEATS_BETWEEN_SAME_EXAM if min_gap is None else min_gap
+        # Capacity-sorted once per run; every sitting packs against the same order
+        self.rooms = sorted((r for r in rooms if r.room_type in room_types),
+                            key=lambda r: (-r.capacity, r.room_id))
+        # Most students of one exam a room can hold with `gap` seats between each
+        self.limits = [-(-r.capacity // (gap + 1)) for r in self.rooms]
+        self.total_capacity = sum(r.capacity for r in self.rooms)
+        self.accessible_capacity = sum(r.capacity for r in self.rooms if r.accessible)
+    
+    def new_slot(self) -> SlotPacking:
+        """Empty packing for one sitting"""
+        return SlotPacking(self.rooms, self.limits)
+    
+    def pack(self, exams: List[ExamDemand], force: bool = False) -> Optional[SlotPacking]:
+        """First-fit-decreasing packing of a sitting's exams; None when they do not fit
+        
+        Students needing accessible rooms are seated first, largest group
+        first; then the remaining students of every exam, largest first,
+        joining their accessible classmates where that room has space.
+        """
+        slot = self.new_slot()
+        for exam_code, students, accessible in sorted(exams, key=lambda e: (-e[2], e[0])):
+            if not accessible:
+                continue
+            # Prefer an accessible room that could hold the whole cohort
+            free = slot.free[True]
+            i = bisect_left(free, (students, -1))
+            if i < len(free):
+                slot.seat(exam_code, free[i][1], accessible)
+            elif not slot.place(exam_code, accessible, accessible_only=True, force=force):
+                return None
+        for exam_code, students, accessible in sorted(exams, key=lambda e: (-(e[1] - e[2]), e[0])):
+            rest = students - accessible
+            # Keep the cohort together in the accessible room when it has space
+            joined = next((pos for pos, share in slot.assigned.get(exam_code, ())
+                           if slot.remaining[pos] >= rest > 0 and share + rest <= slot.limits[pos]), None)
+            if joined is not None:
+                slot.seat(exam_code, joined, rest)
+            elif not slot.place(exam_code, rest, force=force):
+                return None
+        self._repair(slot, exams)
+        return slot
+    
+    @staticmethod
+    def _repair(slot: SlotPacking, exams: List[ExamDemand]):
+        """Move single-room exams out of the way so split exams fit in one room"""
+        needs_access = {exam_code: accessible > 0 for exam_code, _, accessible in exams}
+        for exam_code, students, accessible in exams:
+            if len(slot.assigned.get(exam_code, ())) < 2:
+                continue
+            before = slot.release(exam_code)
+            # Smallest rooms large enough on their own; accessible ones only when needed
+            candidates = sorted((pos for pos, room in enumerate(slot.rooms)
+                                 if slot.limits[pos] >= students and room.accessible == bool(accessible)),
+                                key=lambda pos: slot.limits[pos])
+            for target in candidates[:ExamRoomAllocator.REPAIR_CANDIDATES]:
+                if ExamRoomAllocator._clear_room(slot, target, students, needs_access):
+                    slot.seat(exam_code, target, students)
+                    break
+            else:
+                slot.restore(exam_code, before)
+    
+    @staticmethod
+    def _clear_room(slot: SlotPacking, target: int, students: int,
+                    needs_access: Dict[str, bool]) -> bool:
+        """Relocate whole single-room occupants of target until it has `students` free seats"""
+        moved = []
+        for occupant, seats in sorted(slot.occupants.get(target, {}).items(), key=lambda o: -o[1]):
+            if slot.remaining[target] >= students:
+                break
+            if len(slot.assigned[occupant]) > 1:
+                break
+            # Best-fit elsewhere, never back into the room being cleared
+            allocation = slot.release(occupant)
+            pos = slot.best_fit(seats, exclude=target, accessible_only=needs_access[occupant])
+            if pos is None:
+                slot.restore(occupant, allocation)
+                break
+            slot.seat(occupant, pos, seats)
+            moved.append((occupant, allocation))
+        
+        if slot.remaining[target] >= students:
+            return True
+        for occupant, allocation in reversed(moved):
+            slot.release(occupant)
+            slot.restore(occupant, allocation)
+        return False
\ No newline at end of file
@@ -1,50 +1,63 @@
-from typing import List, Dict
+from typing import List, Dict, Iterator, Tuple, Set, Callable, Optional
 from datetime import datetime, timedelta
 from models.course import Course
 from models.room import Room
-from models.exam import Exam, SeatingPlan
+from models.exam import Exam, SeatingPlan, SeatMap
+from models.enrollment import EnrollmentStore
+from services.exam_conflict import ConflictGraph
+from services.exam_rooms import ExamRoomAllocator
+from services.seating_engine import SeatingEngine
 from utils.logger import Logger
 from config import Config
-import math
+from itertools import islice
 
 class ExamScheduler:
     """Service for scheduling examinations"""
     
     def __init__(self, courses: List[Course], rooms: List[Room], 
-                 enrollments: Dict[str, List[str]]):
+                 enrollments: Dict[str, List[str]], accessible_students: Set[str] = None):
         self.courses = courses
         self.rooms = rooms
         self.enrollments = enrollments
+        self.accessible_students = accessible_students or set()
         self.logger = Logger("ExamScheduler")
         self.exams: List[Exam] = []
-        self.seating_plans: List[SeatingPlan] = []
+        self.exam_rooms: Dict[str, List[Tuple[Room, int]]] = {}  # exam_code -> (room, seats)
+        self.unseated: Dict[str, int] = {}  # exam_code -> students the rooms could not hold
+        # exam_code -> students with accessible-room needs first (None: enrollment order)
+        self.seating_orders: Dict[str, Optional[List[str]]] = {}
+        self.allocator = ExamRoomAllocator(rooms)
+        self.seating_engine = SeatingEngine()
     
-    def generate_exam_schedule(self, start_date: str) -> List[Exam]:
+    def generate_exam_schedule(self, start_date: str, mode: str = None) -> List[Exam]:
         """Generate exam schedule"""
-        self.logger.info("Generating exam schedule...")
+        mode = mode or Config.EXAM_SCHEDULING_MODE
+        if mode == 'coloring':
+            return self._generate_by_coloring(start_date)
+        if mode != 'sequential':
+            raise ValueError(f"Unknown exam scheduling mode: {mode}")
         
-        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-        current_date = start_dt
-        slot_index = 0
+        self.logger.info("Generating exam schedule...")
         
-        exam_slots = ['09:00-12:00', '14:00-17:00']
+        exam_slots = self._exam_slots(start_date)
         
         for course in self.courses:
             exam_code = f"{course.course_code}-END"
-            student_count = len(self.enrollments.get(course.course_code, []))
+            student_count, accessible_count = self._exam_demand(course.course_code)
             
-            # Calculate rooms needed
-            lecture_rooms = [r for r in self.rooms if r.room_type == 'Lecture']
-            rooms_needed = math.ceil(student_count / sum(r.capacity for r in lecture_rooms[:2]))
-            assigned_rooms = lecture_rooms[:max(1, rooms_needed)]
+            # One exam per sitting: the whole inventory is available
+            packing = self.allocator.pack([(exam_code, student_count, accessible_count)], force=True)
+            assigned_rooms = packing.rooms_of(exam_code)
+            self._record_shortfall(packing, exam_code)
             
+            date, time_slot = next(exam_slots)
             exam = Exam(
                 exam_code=exam_code,
                 course_code=course.course_code,
                 course_name=course.course_name,
-                date=current_date.strftime('%Y-%m-%d'),
-                time_slot=exam_slots[slot_index],
-                room_ids=[r.room_id for r in assigned_rooms],
+                date=date,
+                time_slot=time_slot,
+                room_ids=[room.room_id for room, _ in assigned_rooms],
                 student_count=student_count,
                 invigilator_ids=[course.instructor_id]
             )
@@ -53,36 +66,182 @@ class ExamScheduler:
             
             # Create seating plan
             self._create_seating_plan(exam, assigned_rooms)
-            
-            # Move to next slot
-            slot_index += 1
-            if slot_index >= len(exam_slots):
-                slot_index = 0
-                current_date += timedelta(days=1)
-                # Skip weekends
-                while current_date.weekday() >= 5:
-                    current_date += timedelta(days=1)
         
         self.logger.info(f"Generated {len(self.exams)} exams")
         return self.exams
     
-    def _create_seating_plan(self, exam: Exam, rooms: List[Room]):
-        """Create seating arrangement for exam"""
-        students = self.enrollments.get(exam.course_code, [])
-        student_index = 0
+    def _generate_by_coloring(self, start_date: str) -> List[Exam]:
+        """Pack non-conflicting exams into shared slots using DSatur coloring"""
+        self.logger.info("Generating exam schedule (conflict-graph coloring)...")
+        
+        courses = {course.course_code: course for course in self.courses}
+        graph = ConflictGraph(list(courses), self.enrollments)
+        demands = [(f"{code}-END", graph.sizes[i], self._exam_demand(code)[1])
+                   for i, code in enumerate(graph.course_codes)]
+        
+        # Seats left per sitting while coloring; rooms are packed per sitting afterwards.
+        # Exams may split across rooms, so a sitting fits while the totals do.
+        slot_free: List[List[int]] = []  # [seats, accessible seats]
+        slot_exams: List[List[int]] = []
+        
+        def allocate(color: int, i: int) -> bool:
+            while len(slot_free) <= color:
+                slot_free.append([self.allocator.total_capacity, self.allocator.accessible_capacity])
+                slot_exams.append([])
+            _, students, accessible = demands[i]
+            free = slot_free[color]
+            # An exam larger than the whole inventory still gets an empty sitting
+            if slot_exams[color] and (students > free[0] or accessible > free[1]):
+                return False
+            free[0] -= students
+            free[1] -= accessible
+            slot_exams[color].append(i)
+            return True
         
-        for room in rooms:
-            seating = SeatingPlan(
-                exam_code=exam.exam_code,
-                room_id=room.room_id
+        colors = graph.dsatur(allocate)
+        
+        assigned: Dict[int, List[Tuple[Room, int]]] = {}
+        for members in slot_exams:
+            packing = self.allocator.pack([demands[i] for i in members], force=True)
+            for i in members:
+                assigned[i] = packing.rooms_of(demands[i][0])
+                self._record_shortfall(packing, demands[i][0])
+        
+        slots = list(islice(self._exam_slots(start_date), max(colors, default=-1) + 1))
+        order = sorted(range(len(colors)), key=lambda i: (colors[i], i))
+        for i in order:
+            course = courses[graph.course_codes[i]]
+            date, time_slot = slots[colors[i]]
+            exam = Exam(
+                exam_code=f"{course.course_code}-END",
+                course_code=course.course_code,
+                course_name=course.course_name,
+                date=date,
+                time_slot=time_slot,
+                room_ids=[room.room_id for room, _ in assigned[i]],
+                student_count=graph.sizes[i],
+                invigilator_ids=[course.instructor_id]
             )
-            
-            for seat_num in range(1, room.capacity + 1):
-                if student_index < len(students):
-                    seating.seat_allocations[seat_num] = students[student_index]
-                    student_index += 1
-            
-            self.seating_plans.append(seating)
+            self.exams.append(exam)
+            self._create_seating_plan(exam, assigned[i])
+        
+        self.logger.info(f"Generated {len(self.exams)} exams in {len(slots)} slots")
+        return self.exams
+    
+    def _record_shortfall(self, packing, exam_code: str):
+        """Warn about students of an exam left without a seat"""
+        short = packing.shortfall.get(exam_code)
+        if not short:
+            return
+        students, accessible = short
+        self.unseated[exam_code] = students
+        detail = f", {accessible} of them needing an accessible room" if accessible else ""
+        self.logger.warning(f"{exam_code}: {students} students left without a seat{detail}")
+    
+    def _exam_demand(self, course_code: str) -> Tuple[int, int]:
+        """(students, students needing an accessible room) for a course's exam"""
+        if isinstance(self.enrollments, EnrollmentStore):
+            students = self.enrollments.course_size(course_code)
+        else:
+            students = len(self.enrollments.get(course_code, []))
+        if not self.accessible_students or not students:
+            return students, 0
+        return students, sum(1 for s in self.enrollments[course_code] if s in self.accessible_students)
+    
+    @staticmethod
+    def _exam_slots(start_date: str) -> Iterator[Tuple[str, str]]:
+        """Yield (date, time_slot) exam sittings from start_date, skipping weekends"""
+        current_date = datetime.strptime(start_date, '%Y-%m-%d')
+        while True:
+            for time_slot in Config.EXAM_SLOTS:
+                yield current_date.strftime('%Y-%m-%d'), time_slot
+            current_date += timedelta(days=1)
+            # Skip weekends
+            while current_date.weekday() >= 5:
+                current_date += timedelta(days=1)
+    
+    def _create_seating_plan(self, exam: Exam, rooms: List[Tuple[Room, int]]):
+        """Record the (room, seats) of an exam; seat maps are built lazily per room"""
+        self.exam_rooms[exam.exam_code] = rooms
+    
+    def _accessible_first(self, course_code: str) -> Optional[List[str]]:
+        """A course's students, those needing an accessible room first; None if there are none"""
+        if not self.accessible_students:
+            return None
+        students = self.enrollments.get(course_code, [])
+        accessible = [s for s in students if s in self.accessible_students]
+        if not accessible:
+            return None
+        return accessible + [s for s in students if s not in self.accessible_students]
+    
+    def _student_range(self, exam: Exam) -> Callable[[int, int], List[str]]:
+        """Function decoding students start..stop of an exam in seating order"""
+        # Built once per exam: an exam is sliced once per room it uses
+        if exam.exam_code not in self.seating_orders:
+            self.seating_orders[exam.exam_code] = self._accessible_first(exam.course_code)
+        ordered = self.seating_orders[exam.exam_code]
+        if ordered is not None:
+            # Accessible rooms come first in the allocation, so those students are seated first
+            return lambda start, stop: ordered[start:stop]
+        if isinstance(self.enrollments, EnrollmentStore):
+            # Decode only the IDs seated in the current room
+            return lambda start, stop: self.enrollments.student_range(exam.course_code, start, stop)
+        students = self.enrollments.get(exam.course_code, [])
+        return lambda start, stop: students[start:stop]
+    
+    def _room_allocations(self, exam: Exam) -> Iterator[Tuple[Room, int, int]]:
+        """Yield (room, first student, seats) for each room of an exam"""
+        student_index = 0
+        for room, seats in self.exam_rooms.get(exam.exam_code, []):
+            yield room, student_index, seats
+            student_index += seats
+    
+    def _sitting_rooms(self) -> Iterator[Tuple[Room, List[Tuple[Exam, int, int]]]]:
+        """Yield each room used in each sitting with the exam shares seated in it"""
+        rooms: Dict[Tuple[str, str, str], Tuple[Room, List[Tuple[Exam, int, int]]]] = {}
+        for exam in self.exams:
+            for room, start, seats in self._room_allocations(exam):
+                key = (exam.date, exam.time_slot, room.room_id)
+                if key not in rooms:
+                    rooms[key] = (room, [])
+                rooms[key][1].append((exam, start, seats))
+        yield from rooms.values()
+    
+    def iter_seat_maps(self) -> Iterator[Tuple[SeatMap, List[List[str]]]]:
+        """Yield each room's interleaved seat map with the students of every exam share"""
+        for room, shares in self._sitting_rooms():
+            seat_map = self.seating_engine.build(room.room_id, room.capacity,
+                                                 [exam.exam_code for exam, _, _ in shares],
+                                                 [seats for _, _, seats in shares])
+            students = [self._student_range(exam)(start, start + seats) for exam, start, seats in shares]
+            yield seat_map, students
+    
+    def iter_seating_plans(self) -> Iterator[SeatingPlan]:
+        """Yield seating plans one exam share of a room at a time"""
+        for seat_map, students in self.iter_seat_maps():
+            plans = [SeatingPlan(exam_code=code, room_id=seat_map.room_id)
+                     for code in seat_map.exam_codes]
+            for seat_num, e, i in seat_map.seats():
+                plans[e].seat_allocations[seat_num] = students[e][i]
+            yield from plans
+    
+    @property
+    def seating_plans(self) -> List[SeatingPlan]:
+        """All seating plans materialized in memory"""
+        return list(self.iter_seating_plans())
+    
+    def iter_seating_rows(self) -> Iterator[tuple]:
+        """Yield seating rows (exam_code, room_id, seat_number, student_id)"""
+        violations = 0
+        for seat_map, students in self.iter_seat_maps():
+            violations += seat_map.gap_violations
+            codes, room_id = seat_map.exam_codes, seat_map.room_id
+            for seat_num, (e, i) in enumerate(zip(seat_map.seat_exam, seat_map.seat_index), start=1):
+                if e >= 0:
+                    yield codes[e], room_id, seat_num, students[e][i]
+        if violations:
+            self.logger.warning(f"{violations} seats closer than {self.seating_engine.min_gap} "
+                                f"to a student of the same exam (rooms too full)")
     
     def export_exams_to_csv(self, filepath: str):
         """Export exam schedule to CSV"""
@@ -93,12 +252,8 @@ class ExamScheduler:
         csv_handler.write_csv(filepath, data)
     
     def export_seating_to_csv(self, filepath: str):
-        """Export seating plans to CSV"""
+        """Export seating plans to CSV, streaming one room at a time"""
         from utils.csv_handler import CSVHandler
         csv_handler = CSVHandler()
         
-        data = []
-        for plan in self.seating_plans:
-            data.extend(plan.to_list())
-        
-        csv_handler.write_csv(filepath, data)
\ No newline at end of file
+        csv_handler.write_rows(filepath, SeatingPlan.FIELDS, self.iter_seating_rows())
\ No newline at end of file
@@ -0,0 +1,201 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Dict, Tuple, Optional
+from models.course import Course
+from models.room import Room
+from models.timetable import TimetableEntry
+from models.intervals import IntervalCalendar, MINUTES_PER_DAY, slot_bounds, format_minutes
+from config import Config
+
+class IntervalPlacer:
+    """Placement backend on minute intervals instead of the fixed slot loop
+    
+    Professors, batches and rooms each get an IntervalCalendar. Every
+    resource keeps MIN_BREAK_MINUTES between sessions (R6) and a professor's
+    sessions start at least MIN_BREAK_HOURS apart (R4), matching how the
+    validator counts R4 on the slot grid. Sessions last SESSION_MINUTES of
+    their type and may start at any minute inside the teaching day, outside
+    the lunch slot (R8); a course's lab hours are booked back to back as one
+    block (R10). Times are week minutes: day index * 1440 + minute.
+    
+    Slots already held by professors and rooms before generation are booked
+    up front, and a course is kept clear of the sessions of every course it
+    shares students with.
+    """
+    
+    def __init__(self, generator, durations: Dict[str, int] = None, break_minutes: int = None,
+                 professor_spacing: int = None):
+        self.generator = generator
+        self.durations = durations or Config.SESSION_MINUTES
+        gap = Config.MIN_BREAK_MINUTES if break_minutes is None else break_minutes
+        spacing = Config.MIN_BREAK_HOURS * 60 if professor_spacing is None else professor_spacing
+        self.professors = IntervalCalendar(gap=gap, spacing=spacing)
+        self.batches = IntervalCalendar(gap=gap)
+        self.rooms = IntervalCalendar(gap=gap)
+        # Sessions per course code, checked for every course sharing its students
+        self.courses = IntervalCalendar(gap=gap)
+        self.neighbours: Dict[str, List[str]] = {}
+        # Sorted end + gap of every room booking per room type: the only
+        # times at which a busy room of that type can become free
+        self.room_releases: Dict[str, List[int]] = {}
+        
+        for prof_id, professor in generator.professors.items():
+            for start, end in self._grid_intervals(professor.assigned_mask):
+                self.professors.add(prof_id, start, end)
+        for room in generator.rooms:
+            for start, end in self._grid_intervals(room.occupied_mask):
+                self.rooms.add(room.room_id, start, end)
+                insort(self.room_releases.setdefault(room.room_type, []), end + self.rooms.gap)
+        
+        # Teaching windows per day: the slot grid's span minus the lunch slot
+        day_start = min(slot_bounds(slot)[0] for slot in Config.TIME_SLOTS)
+        day_end = max(slot_bounds(slot)[1] for slot in Config.TIME_SLOTS)
+        windows = [(day_start, day_end)]
+        if Config.LUNCH_SLOT:
+            lunch_start, lunch_end = slot_bounds(Config.LUNCH_SLOT)
+            windows = [(day_start, lunch_start), (lunch_end, day_end)]
+        self.windows: Dict[str, List[Tuple[int, int]]] = {
+            day: [(d * MINUTES_PER_DAY + start, d * MINUTES_PER_DAY + end) for start, end in windows]
+            for d, day in enumerate(Config.WORKING_DAYS)
+        }
+    
+    def _grid_intervals(self, mask: int) -> List[Tuple[int, int]]:
+        """Week-minute intervals of the slot-grid cells in a mask"""
+        grid = self.generator.grid
+        intervals = []
+        for day, time_slot in grid.decode(mask):
+            start, end = slot_bounds(time_slot)
+            offset = grid.day_index[day] * MINUTES_PER_DAY
+            intervals.append((offset + start, offset + end))
+        return intervals
+    
+    def _sharing_students(self, course: Course) -> List[str]:
+        """Codes of the courses sharing students with this one"""
+        codes = self.neighbours.get(course.course_code)
+        if codes is None:
+            codes = []
+            conflicts = self.generator.student_conflicts
+            i = conflicts.index.get(course.course_code) if conflicts else None
+            if i is not None:
+                rest = conflicts.graph.adjacency[i]
+                while rest:
+                    low = rest & -rest
+                    codes.append(conflicts.graph.course_codes[low.bit_length() - 1])
+                    rest ^= low
+            self.neighbours[course.course_code] = codes
+        return codes
+    
+    def place_course(self, course: Course) -> int:
+        """Place every session of a course; returns how many were placed"""
+        gen = self.generator
+        placed = 0
+        for index in range(course.class_sessions()):
+            if self._place_session(course, index):
+                placed += 1
+            else:
+                gen.unplaced.append((course, index))
+        if course.needs_lab():
+            if self._place_lab(course):
+                placed += course.P
+            else:
+                gen.unplaced.extend((course, index) for index in gen._lab_indices(course))
+        return placed
+    
+    def _place_session(self, course: Course, index: int) -> bool:
+        """Book the earliest feasible (day, start, room) for one session"""
+        gen = self.generator
+        session_type, room_type = gen._session_kind(course, index)
+        duration = self.durations[session_type]
+        days = Config.WORKING_DAYS
+        if gen.rng:
+            days = gen.rng.sample(days, len(days))
+        found = self._earliest(course, room_type, duration, days, daily_limit=True)
+        if found is None:
+            return False
+        day, start, room = found
+        self._reserve(course, start, duration, room)
+        self._add_entry(course, index, session_type, day, start, duration, room)
+        day_key = f"{course.course_code}-{day}"
+        gen.course_daily_count[day_key] = gen.course_daily_count.get(day_key, 0) + 1
+        return True
+    
+    def _place_lab(self, course: Course) -> bool:
+        """Book a course's lab hours back to back in one Lab room, on a lecture day or the day after"""
+        gen = self.generator
+        hour = self.durations['Lab']
+        days = gen._lab_days(course)
+        if gen.rng:
+            days = gen.rng.sample(days, len(days))
+        found = self._earliest(course, 'Lab', course.P * hour, days, daily_limit=False)
+        if found is None:
+            return False
+        day, start, room = found
+        self._reserve(course, start, course.P * hour, room)
+        for k, index in enumerate(gen._lab_indices(course)):
+            self._add_entry(course, index, 'Lab', day, start + k * hour, hour, room)
+        return True
+    
+    def _earliest(self, course: Course, room_type: str, duration: int, days: List[str],
+                  daily_limit: bool) -> Optional[Tuple[str, int, Room]]:
+        """Earliest (day, start, room) on the given days where the course's people and a room are free"""
+        gen = self.generator
+        typed_rooms = gen.room_index.rooms_by_type.get(room_type, [])
+        candidates = typed_rooms[bisect_left(gen.room_index.capacities.get(room_type, []),
+                                             gen._batch_size(course)):]
+        if not candidates:
+            return None
+        people = [(self.professors, course.instructor_id), (self.batches, course.batch_id)]
+        people.extend((self.courses, code) for code in self._sharing_students(course))
+        
+        for day in days:
+            # One lecture or tutorial per course per day (R5)
+            if daily_limit and f"{course.course_code}-{day}" in gen.course_daily_count:
+                continue
+            for window_start, window_end in self.windows[day]:
+                latest = window_end - duration
+                t = window_start
+                while t <= latest:
+                    t = IntervalCalendar.earliest_common(people, t, duration, latest)
+                    if t > latest:
+                        break
+                    room = self._free_room(candidates, t, t + duration)
+                    if room is not None:
+                        return day, t, room
+                    # Jump to the next time a room of this type frees up
+                    releases = self.room_releases.get(room_type, [])
+                    i = bisect_right(releases, t)
+                    t = releases[i] if i < len(releases) else latest + 1
+        return None
+    
+    def _free_room(self, candidates: List[Room], start: int, end: int) -> Optional[Room]:
+        """Smallest candidate room free for [start, end)"""
+        for room in candidates:
+            if self.rooms.is_free(room.room_id, start, end):
+                return room
+        return None
+    
+    def _reserve(self, course: Course, start: int, duration: int, room: Room):
+        """Book [start, start + duration) for the course's professor and batch and the room"""
+        end = start + duration
+        self.professors.add(course.instructor_id, start, end)
+        self.batches.add(course.batch_id, start, end)
+        self.courses.add(course.course_code, start, end)
+        self.rooms.add(room.room_id, start, end)
+        insort(self.room_releases.setdefault(room.room_type, []), end + self.rooms.gap)
+    
+    def _add_entry(self, course: Course, index: int, session_type: str, day: str, start: int,
+                   duration: int, room: Room) -> TimetableEntry:
+        gen = self.generator
+        end = start + duration
+        entry = TimetableEntry(
+            slot_id=f"{course.course_code}-{index}",
+            day=day,
+            time_slot=f"{format_minutes(start)}-{format_minutes(end)}",
+            course_code=course.course_code,
+            course_name=course.course_name,
+            room_id=room.room_id,
+            instructor_id=course.instructor_id,
+            batch_id=course.batch_id,
+            session_type=session_type
+        )
+        gen._add_entry(entry)
+        return entry
\ No newline at end of file
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional
+from models.course import Course
+from models.professor import Professor
+from models.room import Room
+from services.timetable_generator import TimetableGenerator
+from services.worker_state import shared, init_worker, fresh_resources, timetable_rows, entries_from_rows
+from config import Config
+from utils.logger import Logger
+
+def _run_start(seed: int) -> 'StartResult':
+    """Generate (and optionally optimize) one randomized timetable"""
+    professors, rooms = fresh_resources()
+    generator = TimetableGenerator(shared['courses'], professors, rooms,
+                                   shared['enrollments'], seed=seed)
+    generator.generate()
+    if shared['optimize_time']:
+        generator.optimize(seed=seed, time_limit=shared['optimize_time'])
+    
+    violations = generator.validator.count_violations(generator.timetable, professors)
+    return StartResult(seed, len(generator.unplaced), sum(violations.values()),
+                       timetable_rows(generator.timetable))
+
+
+@dataclass
+class StartResult:
+    """Outcome of one randomized start"""
+    seed: int
+    unplaced: int
+    violations: int
+    rows: List[Tuple[str, str, str, str, str, str]]
+    
+    @property
+    def score(self) -> Tuple[int, int]:
+        return (self.unplaced, self.violations)
+
+
+class MultiStartGenerator:
+    """Run randomized TimetableGenerator starts across a process pool and keep the best"""
+    
+    def __init__(self, courses: List[Course], professors: Dict[str, Professor],
+                 rooms: List[Room], enrollments: Dict[str, List[str]] = None,
+                 starts: int = 8, workers: int = None, base_seed: int = 0,
+                 optimize_time: float = 0.0):
+        self.courses = courses
+        self.professors = professors
+        self.rooms = rooms
+        self.enrollments = enrollments or {}
+        self.starts = starts
+        self.workers = workers or os.cpu_count() or 1
+        self.base_seed = base_seed
+        self.optimize_time = optimize_time
+        # Results are merged back through load_timetable, which works on the slot grid
+        if Config.PLACEMENT_BACKEND != 'slots':
+            raise ValueError(f"Multi-start needs the 'slots' placement backend, "
+                             f"not '{Config.PLACEMENT_BACKEND}'")
+        self.logger = Logger("MultiStartGenerator")
+        self.results: List[StartResult] = []
+    
+    def run(self) -> TimetableGenerator:
+        """Return a generator holding the best timetable found"""
+        self.logger.info(f"Running {self.starts} randomized starts on {self.workers} workers...")
+        state = dict(courses=self.courses, professors=self.professors, rooms=self.rooms,
+                     enrollments=self.enrollments, optimize_time=self.optimize_time)
+        
+        results: Dict[int, StartResult] = {}
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, 
+                                 initargs=(state,)) as executor:
+            index = {executor.submit(_run_start, self.base_seed + i): i for i in range(self.starts)}
+            pending = set(index)
+            first_clean: Optional[int] = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    i = index[future]
+                    results[i] = future.result()
+                    if results[i].score == (0, 0) and (first_clean is None or i < first_clean):
+                        first_clean = i
+                
+                if first_clean is not None:
+                    # Nothing beats a clean start: drop later starts, but let earlier
+                    # ones finish so the winner does not depend on timing
+                    for future in pending:
+                        if index[future] > first_clean:
+                            future.cancel()
+                    pending = {f for f in pending if not f.cancelled()}
+        
+        self.results = [results[i] for i in sorted(results)]
+        best = min(self.results, key=lambda r: (r.score, r.seed))
+        self.logger.info(f"Best start: seed={best.seed}, unplaced={best.unplaced}, "
+                         f"violations={best.violations} ({len(self.results)} starts run)")
+        return self._adopt(best)
+    
+    def _adopt(self, result: StartResult) -> TimetableGenerator:
+        """Replay a worker's timetable onto the caller's professors and rooms"""
+        generator = TimetableGenerator(self.courses, self.professors, self.rooms,
+                                       self.enrollments, seed=result.seed)
+        generator.load_timetable(entries_from_rows(generator.courses_by_code, result.rows))
+        return generator
\ No newline at end of file
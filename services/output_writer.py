@@ -0,0 +1,120 @@
+import csv
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Iterable, Callable, Optional, ContextManager
+from models.timetable import TimetableEntry
+from models.exam import Exam, SeatingPlan
+from models.calendar import ResourceCalendar
+from utils.logger import Logger
+from config import Config
+
+# Timetable views: file name -> TimetableEntry field the rows are grouped by
+TIMETABLE_VIEWS = {
+    'timetable_by_batch.csv': 'batch_id',
+    'timetable_by_room.csv': 'room_id',
+    'timetable_by_professor.csv': 'instructor_id',
+}
+
+class OutputWriter:
+    """Writes the timetable, its views, the exam schedule and seating plans concurrently"""
+    
+    COMPRESS_LEVEL = 6  # gzip level; 9 costs far more time for little gain on CSV
+    
+    def __init__(self, output_dir: str, compress: bool = None, workers: int = None,
+                 phase: Callable[[str], ContextManager] = None):
+        self.output_dir = output_dir
+        self.compress = Config.COMPRESS_OUTPUT if compress is None else compress
+        self.workers = workers or Config.OUTPUT_WORKERS
+        self.phase = phase
+        self.logger = Logger("OutputWriter")
+    
+    def write(self, timetable: Optional[List[TimetableEntry]],
+              exam_scheduler=None, exams: bool = True, seating: bool = True) -> Dict[str, Tuple[str, int]]:
+        """Write the output files; returns file name -> (path, rows written)
+        
+        Timetable files are skipped when timetable is None; with an exam
+        scheduler, exams and seating select its files.
+        """
+        jobs: List[Tuple[str, Tuple[str, ...], Callable[[], Iterable[tuple]]]] = []
+        
+        if timetable is not None:
+            rows, views = self._timetable_views(timetable)
+            jobs.append(('timetable.csv', TimetableEntry.FIELDS, lambda: rows))
+            for name, groups in views.items():
+                jobs.append((name, TimetableEntry.FIELDS, lambda groups=groups: self._grouped_rows(groups)))
+        if exam_scheduler is not None and exams:
+            jobs.append(('exam_schedule.csv', Exam.FIELDS,
+                         lambda: (exam.to_row() for exam in exam_scheduler.exams)))
+        if exam_scheduler is not None and seating:
+            jobs.append(('seating_plan.csv', SeatingPlan.FIELDS,
+                         lambda: self._timed('seating', exam_scheduler.iter_seating_rows())))
+        if not jobs:
+            return {}
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers or len(jobs)) as executor:
+            futures = {name: executor.submit(self._write_file, name, header, make_rows)
+                       for name, header, make_rows in jobs}
+            written = {name: future.result() for name, future in futures.items()}
+        
+        for path, count in written.values():
+            self.logger.info(f"Wrote {count} records to {path}")
+        return written
+    
+    @staticmethod
+    def _timetable_views(timetable: List[TimetableEntry]
+                         ) -> Tuple[List[tuple], Dict[str, Dict[str, List[Tuple[tuple, tuple]]]]]:
+        """Timetable rows plus (week position, row) lists per view key, in one pass"""
+        # (day, "HH:MM-HH:MM") orders slot-grid and minute-resolution times alike
+        day_index = ResourceCalendar.shared().day_index
+        unknown_day = len(day_index)
+        source = (entry.to_row() for entry in timetable)
+        positions = {name: TimetableEntry.FIELDS.index(field) for name, field in TIMETABLE_VIEWS.items()}
+        views: Dict[str, Dict[str, List[Tuple[tuple, tuple]]]] = {name: {} for name in TIMETABLE_VIEWS}
+        rows = []
+        for row in source:
+            rows.append(row)
+            when = (day_index.get(row[1], unknown_day), row[2])
+            for name, pos in positions.items():
+                groups = views[name]
+                key = row[pos]
+                if key in groups:
+                    groups[key].append((when, row))
+                else:
+                    groups[key] = [(when, row)]
+        return rows, views
+    
+    def _timed(self, name: str, rows: Iterable[tuple]) -> Iterable[tuple]:
+        """Rows run inside a profiler phase (seats are generated as the file is written)"""
+        if self.phase is None:
+            yield from rows
+            return
+        with self.phase(name):
+            yield from rows
+    
+    @staticmethod
+    def _grouped_rows(groups: Dict[str, List[Tuple[tuple, tuple]]]) -> Iterable[tuple]:
+        """Rows of one view: by key, then in week order"""
+        for key in sorted(groups):
+            for _, row in sorted(groups[key]):
+                yield row
+    
+    def _write_file(self, name: str, header: Tuple[str, ...],
+                    make_rows: Callable[[], Iterable[tuple]]) -> Tuple[str, int]:
+        """Stream one file's rows through csv.writer, gzip-compressed when enabled"""
+        path = os.path.join(self.output_dir, name)
+        if self.compress:
+            path += '.gz'
+            file = gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=self.COMPRESS_LEVEL)
+        else:
+            file = open(path, 'w', encoding='utf-8', newline='')
+        
+        count = 0
+        with file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for row in make_rows():
+                writer.writerow(row)
+                count += 1
+        return path, count
\ No newline at end of file
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+from contextlib import nullcontext
+from typing import List, Dict, Tuple, Optional, NamedTuple
+from utils.logger import Logger
+from config import Config
+
+# Scheduling services are imported inside the stages that use them, so a run
+# where every stage is up to date never loads them.
+
+class Stage(NamedTuple):
+    """A pipeline stage and everything its outputs are derived from"""
+    name: str
+    inputs: Tuple[str, ...]   # files in the input directory
+    config: Tuple[str, ...]   # Config settings
+    depends: Tuple[str, ...]  # upstream stages
+    outputs: Tuple[str, ...]  # files in the output directory (before any .gz)
+
+
+STAGES: Dict[str, Stage] = {stage.name: stage for stage in (
+    Stage('timetable',
+          ('professors.csv', 'rooms.csv', 'courses.csv', 'students.csv'),
+          ('WORKING_DAYS', 'TIME_SLOTS', 'LUNCH_SLOT', 'MIN_BREAK_HOURS', 'MIN_BREAK_MINUTES',
+           'MAX_SESSIONS_PER_DAY', 'STUDENT_AWARE_SCHEDULING', 'PLACEMENT_BACKEND', 'SESSION_MINUTES',
+           'OPTIMIZE_TIMETABLE', 'OPTIMIZER_TIME_LIMIT', 'OPTIMIZER_SEED', 'MULTI_START_RUNS',
+           'DECOMPOSE_TIMETABLE'),
+          (),
+          ('timetable.csv', 'timetable_by_batch.csv', 'timetable_by_room.csv',
+           'timetable_by_professor.csv')),
+    Stage('exams',
+          ('rooms.csv', 'courses.csv', 'students.csv', 'accessibility.csv'),
+          ('EXAM_START_DATE', 'EXAM_SLOTS', 'EXAM_SCHEDULING_MODE', 'EXAM_ROOM_TYPES',
+           'MIN_SEATS_BETWEEN_SAME_EXAM'),
+          (),
+          ('exam_schedule.csv',)),
+    Stage('seating',
+          ('students.csv', 'accessibility.csv'),
+          ('MIN_SEATS_BETWEEN_SAME_EXAM',),
+          ('exams',),
+          ('seating_plan.csv',)),
+)}
+
+TARGETS = ('all',) + tuple(STAGES)
+
+
+class StageContext:
+    """Inputs and in-memory results shared by the stages of one run, built on first use"""
+    
+    def __init__(self, input_dir: str, use_cache: bool = True, profiler=None):
+        self.input_dir = input_dir
+        self.use_cache = use_cache
+        self.profiler = profiler
+        self.loaded = False
+        self._generator = None
+        self._exam_scheduler = None
+    
+    def load(self):
+        """Parse the input CSVs (through the input cache when enabled)"""
+        if self.loaded:
+            return
+        from services.data_loader import DataLoader
+        from utils.input_cache import InputCache
+        data_loader = DataLoader(cache=InputCache(Config.CACHE_DIR) if self.use_cache else None)
+        
+        def path(name: str) -> str:
+            return os.path.join(self.input_dir, name)
+        
+        professors = data_loader.load_professors(path('professors.csv'))
+        self.professors = {p.prof_id: p for p in professors}
+        self.rooms = data_loader.load_rooms(path('rooms.csv'))
+        self.courses = data_loader.load_courses(path('courses.csv'))
+        self.students = data_loader.load_enrollment_store(path('students.csv'))
+        self.accessible_students = data_loader.load_accessibility(path('accessibility.csv'))
+        self.loaded = True
+    
+    @property
+    def generator(self):
+        """Timetable generator after generation (and optimization when enabled)"""
+        if self._generator is None:
+            self.load()
+            if Config.MULTI_START_RUNS > 1:
+                from services.multi_start import MultiStartGenerator
+                generator = MultiStartGenerator(
+                    self.courses, self.professors, self.rooms, self.students,
+                    starts=Config.MULTI_START_RUNS, workers=Config.MULTI_START_WORKERS,
+                    base_seed=Config.OPTIMIZER_SEED
+                ).run()
+            elif Config.DECOMPOSE_TIMETABLE:
+                from services.decomposition import DecomposedGenerator
+                generator = DecomposedGenerator(
+                    self.courses, self.professors, self.rooms, self.students,
+                    workers=Config.DECOMPOSE_WORKERS
+                ).run()
+            else:
+                from services.timetable_generator import TimetableGenerator
+                generator = TimetableGenerator(self.courses, self.professors, self.rooms,
+                                               self.students, profiler=self.profiler)
+                generator.generate()
+            if Config.OPTIMIZE_TIMETABLE:
+                generator.optimize()
+            self._generator = generator
+        return self._generator
+    
+    @property
+    def exam_scheduler(self):
+        """Exam scheduler after scheduling; seat maps are built lazily when written"""
+        if self._exam_scheduler is None:
+            self.load()
+            from services.exam_scheduler import ExamScheduler
+            scheduler = ExamScheduler(self.courses, self.rooms, self.students, self.accessible_students)
+            scheduler.generate_exam_schedule(Config.EXAM_START_DATE)
+            self._exam_scheduler = scheduler
+        return self._exam_scheduler
+
+
+class Pipeline:
+    """Runs the stages a target needs, skipping stages whose fingerprint is unchanged
+    
+    A stage's fingerprint hashes its input files, its Config settings and the
+    fingerprints of the stages it depends on. A stage is up to date when the
+    fingerprint matches the last run and its output files are as that run
+    left them; input files are only re-hashed when their size or mtime changed.
+    """
+    
+    VERSION = 1  # bump when stage outputs change for the same inputs
+    MANIFEST = 'pipeline.json'
+    
+    def __init__(self, input_dir: str = None, output_dir: str = None, compress: bool = None,
+                 use_cache: bool = True, profiler=None):
+        self.input_dir = input_dir or Config.INPUT_DIR
+        self.output_dir = output_dir or Config.OUTPUT_DIR
+        self.compress = Config.COMPRESS_OUTPUT if compress is None else compress
+        self.profiler = profiler
+        self.context = StageContext(self.input_dir, use_cache, profiler)
+        self.logger = Logger("Pipeline")
+        self.manifest_path = os.path.join(Config.CACHE_DIR, self.MANIFEST)
+        self.manifest = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if manifest.get('version') == self.VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': self.VERSION, 'files': {}, 'stages': {}}
+    
+    def _save_manifest(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(self.manifest, file, indent=1)
+        os.replace(self.manifest_path + '.tmp', self.manifest_path)
+    
+    @staticmethod
+    def stages_for(target: str) -> List[str]:
+        """A target's stages and everything upstream of them, in run order"""
+        if target == 'all':
+            return list(STAGES)
+        if target not in STAGES:
+            raise ValueError(f"Unknown pipeline stage: {target}")
+        needed = set()
+        pending = [target]
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(STAGES[name].depends)
+        return [name for name in STAGES if name in needed]
+    
+    def _file_digest(self, filepath: str) -> Optional[str]:
+        """SHA-256 of an input file (None when absent), re-hashed only when its stat changed"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        known = self.manifest['files'].get(filepath)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        from utils.input_cache import InputCache
+        digest = InputCache.file_digest(filepath)
+        self.manifest['files'][filepath] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                            'sha256': digest}
+        return digest
+    
+    def fingerprints(self, names: List[str]) -> Dict[str, str]:
+        """Fingerprint of every named stage (names in run order)"""
+        fingerprints: Dict[str, str] = {}
+        for name in names:
+            stage = STAGES[name]
+            key = {
+                'version': self.VERSION,
+                'inputs': {f: self._file_digest(os.path.join(self.input_dir, f)) for f in stage.inputs},
+                'config': {k: getattr(Config, k) for k in stage.config},
+                'compress': self.compress,
+                'depends': {d: fingerprints[d] for d in stage.depends},
+            }
+            encoded = json.dumps(key, sort_keys=True, default=repr).encode('utf-8')
+            fingerprints[name] = hashlib.sha256(encoded).hexdigest()
+        return fingerprints
+    
+    def _up_to_date(self, name: str, fingerprint: str) -> bool:
+        """Last run matched this fingerprint and its outputs are untouched since"""
+        record = self.manifest['stages'].get(name)
+        if not record or record['fingerprint'] != fingerprint:
+            return False
+        for path, (size, mtime_ns) in record['outputs'].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+        return True
+    
+    def plan(self, target: str = 'all', force: bool = False) -> Tuple[List[str], Dict[str, str]]:
+        """(stages to run, fingerprints) for a target"""
+        names = self.stages_for(target)
+        fingerprints = self.fingerprints(names)
+        stale = [name for name in names if force or not self._up_to_date(name, fingerprints[name])]
+        return stale, fingerprints
+    
+    def run(self, target: str = 'all', force: bool = False) -> StageContext:
+        """Run the stale stages of a target and write their outputs in one concurrent pass"""
+        phase = self.profiler.phase if self.profiler else lambda name: nullcontext()
+        stale, fingerprints = self.plan(target, force)
+        for name in fingerprints:
+            if name not in stale:
+                self.logger.info(f"Stage '{name}' is up to date, keeping its outputs")
+        if not stale:
+            self._save_manifest()
+            return self.context
+        
+        context = self.context
+        self.logger.info(f"Running stages: {', '.join(stale)}")
+        with phase('load'):
+            context.load()
+        timetable = scheduler = None
+        if 'timetable' in stale:
+            self.logger.info("\n--- Generating Academic Timetable ---")
+            with phase('timetable'):
+                timetable = context.generator.timetable
+        if 'exams' in stale or 'seating' in stale:
+            # Seating needs the in-memory room allocation, so it re-runs the exam
+            # scheduler even when exam_schedule.csv itself is up to date
+            self.logger.info("\n--- Generating Exam Schedule ---")
+            with phase('exam'):
+                scheduler = context.exam_scheduler
+        
+        from services.output_writer import OutputWriter
+        self.logger.info("\n--- Writing Outputs ---")
+        with phase('export'):
+            written = OutputWriter(self.output_dir, compress=self.compress,
+                                   phase=self.profiler.phase if self.profiler else None).write(
+                timetable, scheduler, exams='exams' in stale, seating='seating' in stale)
+        
+        for name in stale:
+            outputs = {}
+            for output in STAGES[name].outputs:
+                path = written[output][0]
+                stat = os.stat(path)
+                outputs[path] = [stat.st_size, stat.st_mtime_ns]
+            self.manifest['stages'][name] = {'fingerprint': fingerprints[name], 'outputs': outputs}
+        self._save_manifest()
+        
+        if self.profiler:
+            if timetable is not None:
+                self.profiler.counters['timetable_entries'] = len(timetable)
+                self.profiler.counters['sessions_unplaced'] = len(context.generator.unplaced)
+            if scheduler is not None:
+                self.profiler.counters['exams'] = len(scheduler.exams)
+        return context
\ No newline at end of file
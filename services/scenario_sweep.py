@@ -0,0 +1,142 @@
+import fnmatch
+import gc
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Set, Any
+from models.course import Course
+from models.professor import Professor
+from models.room import Room
+from services.timetable_generator import TimetableGenerator
+from services.exam_scheduler import ExamScheduler
+from services.worker_state import shared, init_worker, fresh_resources
+from utils.logger import Logger
+from config import Config
+
+# Scenario keys that override Config attributes of the same name
+CONFIG_KEYS = ('TIME_SLOTS', 'WORKING_DAYS', 'LUNCH_SLOT', 'EXAM_SLOTS')
+SCENARIO_KEYS = set(CONFIG_KEYS) | {'name', 'add_rooms', 'remove_rooms', 'exam_start', 'config'}
+RESULT_FIELDS = ('scenario', 'sessions', 'placed', 'placement_rate', 'exams', 'exam_days',
+                 'rooms', 'room_utilization', 'seconds')
+
+def _apply_rooms(rooms: List[Room], scenario: Dict[str, Any]) -> List[Room]:
+    """Drop rooms matching remove_rooms patterns and append add_rooms"""
+    patterns = scenario.get('remove_rooms', ())
+    kept = [room for room in rooms
+            if not any(fnmatch.fnmatchcase(room.room_id, pattern) for pattern in patterns)]
+    for spec in scenario.get('add_rooms', ()):
+        kept.append(Room(spec['room_id'], int(spec['capacity']), spec.get('type', 'Lecture'),
+                         bool(spec.get('accessible', False))))
+    return kept
+
+def _run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate the timetable and exams of one scenario against the shared inputs"""
+    overrides = {key: scenario[key] for key in CONFIG_KEYS if key in scenario}
+    overrides.update(scenario.get('config', {}))
+    saved = {key: getattr(Config, key) for key in overrides}
+    start = time.perf_counter()
+    try:
+        for key, value in overrides.items():
+            setattr(Config, key, value)
+        professors, rooms = fresh_resources()
+        rooms = _apply_rooms(rooms, scenario)
+        courses, enrollments = shared['courses'], shared['enrollments']
+        
+        generator = TimetableGenerator(courses, professors, rooms, enrollments)
+        generator.generate()
+        exams = ExamScheduler(courses, rooms, enrollments, shared.get('accessible_students')
+                              ).generate_exam_schedule(scenario.get('exam_start', shared['exam_start']))
+        
+        placed, unplaced = len(generator.timetable), len(generator.unplaced)
+        teaching_slots = sum(1 for slot in Config.TIME_SLOTS if slot != Config.LUNCH_SLOT)
+        room_slots = len(rooms) * len(Config.WORKING_DAYS) * teaching_slots
+        in_rooms = sum(1 for entry in generator.timetable if entry.room_id)
+        return {
+            'scenario': scenario.get('name', ''),
+            'sessions': placed + unplaced,
+            'placed': placed,
+            'placement_rate': round(placed / (placed + unplaced), 4) if placed + unplaced else 1.0,
+            'exams': len(exams),
+            'exam_days': len({exam.date for exam in exams}),
+            'rooms': len(rooms),
+            'room_utilization': round(in_rooms / room_slots, 4) if room_slots else 0.0,
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+    finally:
+        for key, value in saved.items():
+            setattr(Config, key, value)
+
+
+class ScenarioSweep:
+    """Run what-if scenarios (config and room overrides) in parallel over one parsed dataset"""
+    
+    def __init__(self, courses: List[Course], professors: Dict[str, Professor], rooms: List[Room],
+                 enrollments: Dict[str, List[str]] = None, accessible_students: Set[str] = None,
+                 exam_start: str = None, workers: int = None):
+        self.courses = courses
+        self.professors = professors
+        self.rooms = rooms
+        self.enrollments = enrollments or {}
+        self.accessible_students = accessible_students
+        self.exam_start = exam_start or Config.EXAM_START_DATE
+        self.workers = workers or Config.SWEEP_WORKERS or os.cpu_count() or 1
+        self.logger = Logger("ScenarioSweep")
+    
+    @staticmethod
+    def validate(scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Check scenario keys; a baseline (no overrides) is put first when missing"""
+        for i, scenario in enumerate(scenarios):
+            unknown = set(scenario) - SCENARIO_KEYS
+            if unknown:
+                raise ValueError(f"Scenario {scenario.get('name', i)}: unknown keys {sorted(unknown)}")
+            for key in scenario.get('config', {}):
+                if not hasattr(Config, key):
+                    raise ValueError(f"Scenario {scenario.get('name', i)}: unknown config {key}")
+        if not any(set(s) <= {'name'} for s in scenarios):
+            scenarios = [{'name': 'baseline'}] + list(scenarios)
+        return [dict(s, name=s.get('name') or f"scenario-{i}") for i, s in enumerate(scenarios)]
+    
+    def run(self, scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Results per scenario, in input order"""
+        scenarios = self.validate(scenarios)
+        workers = min(self.workers, len(scenarios))
+        self.logger.info(f"Running {len(scenarios)} scenarios on {workers} workers...")
+        state = dict(courses=self.courses, professors=self.professors, rooms=self.rooms,
+                     enrollments=self.enrollments,
+                     accessible_students=self.accessible_students, exam_start=self.exam_start)
+        
+        # Forked workers inherit the parsed inputs copy-on-write instead of unpickling
+        # a copy each; freezing the GC keeps collections from touching (and so
+        # copying) those pages. Elsewhere the inputs are pickled once per worker.
+        context = (multiprocessing.get_context('fork')
+                   if 'fork' in multiprocessing.get_all_start_methods() else None)
+        gc.freeze()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=init_worker, initargs=(state,)) as executor:
+                results = list(executor.map(_run_scenario, scenarios))
+        finally:
+            gc.unfreeze()
+        return results
+    
+    @staticmethod
+    def format_table(results: List[Dict[str, Any]]) -> str:
+        """Plain-text comparison table"""
+        width = max([len('scenario')] + [len(r['scenario']) for r in results])
+        lines = [f"{'scenario':<{width}} {'placed':>13} {'rate':>7} {'exam days':>9} "
+                 f"{'rooms':>6} {'room use':>8} {'time':>8}"]
+        for r in results:
+            placed = f"{r['placed']}/{r['sessions']}"
+            lines.append(f"{r['scenario']:<{width}} {placed:>13} "
+                         f"{r['placement_rate']:>7.1%} {r['exam_days']:>9} {r['rooms']:>6} "
+                         f"{r['room_utilization']:>8.1%} {r['seconds']:>7.2f}s")
+        return '\n'.join(lines)
+    
+    def export_to_csv(self, results: List[Dict[str, Any]], filepath: str):
+        """Export the comparison to CSV"""
+        from utils.csv_handler import CSVHandler
+        csv_handler = CSVHandler()
+        
+        csv_handler.write_rows(filepath, RESULT_FIELDS,
+                               (tuple(r[field] for field in RESULT_FIELDS) for r in results))
\ No newline at end of file
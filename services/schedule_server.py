@@ -0,0 +1,301 @@
+import asyncio
+import json
+import socket
+from typing import List, Dict, Tuple, Optional, Any
+from models.timetable import TimetableEntry
+from models.timetable_index import RESOURCE_FIELDS
+from services.timetable_generator import TimetableGenerator
+from services.exam_scheduler import ExamScheduler
+from utils.logger import Logger
+from config import Config
+
+class ScheduleService:
+    """Answers queries and applies mutations against a generator's in-memory state
+    
+    Requests are dicts with an 'op' and its arguments; responses are
+    {'ok': True, 'result': ...} or {'ok': False, 'error': ...}, echoing any
+    request 'id'. Everything runs synchronously, so the server's event loop
+    serializes mutations without locks.
+    """
+    
+    def __init__(self, generator: TimetableGenerator, exam_scheduler: ExamScheduler = None):
+        self.generator = generator
+        self.exam_scheduler = exam_scheduler
+        self.grid = generator.grid
+        self.index = generator.build_index()
+        self.exams_by_course = {exam.course_code: exam for exam in exam_scheduler.exams} if exam_scheduler else {}
+        self.ops = {
+            'ping': self.ping,
+            'stats': self.stats,
+            'room_free': self.room_free,
+            'free_rooms': self.free_rooms,
+            'professor_free': self.professor_free,
+            'batch_free': self.batch_free,
+            'entries': self.entries,
+            'free_slots': self.free_slots,
+            'find_slot': self.find_slot,
+            'add_session': self.add_session,
+            'remove_session': self.remove_session,
+            'reschedule': self.reschedule,
+            'exam': self.exam,
+        }
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one request"""
+        response: Dict[str, Any] = {'id': request['id']} if 'id' in request else {}
+        try:
+            name = request.get('op')
+            op = self.ops.get(name) if isinstance(name, str) else None
+            if op is None:
+                response.update(ok=False, error=f"Unknown op: {name}")
+                return response
+            args = {key: value for key, value in request.items() if key not in ('op', 'id')}
+            response.update(ok=True, result=op(**args))
+        except KeyError as e:
+            response.update(ok=False, error=f"Unknown key: {e.args[0] if e.args else e}")
+        except (TypeError, ValueError) as e:
+            response.update(ok=False, error=str(e))
+        except Exception as e:
+            # One failing request must not take the connection (or the server) down
+            response.update(ok=False, error=f"{type(e).__name__}: {e}")
+        return response
+    
+    def _slot(self, time_slot: str) -> str:
+        """Validate a time slot; '10:00' is accepted for the slot starting then"""
+        if time_slot in self.grid.slot_index:
+            return time_slot
+        for slot in self.grid.slots:
+            if slot.split('-')[0] == time_slot:
+                return slot
+        raise KeyError(time_slot)
+    
+    def _day(self, day: str) -> str:
+        if day not in self.grid.day_index:
+            raise KeyError(day)
+        return day
+    
+    def _cell(self, day: str, time_slot: str) -> Tuple[str, str]:
+        """Validate a (day, time_slot) pair"""
+        return self._day(day), self._slot(time_slot)
+    
+    def ping(self) -> str:
+        return 'pong'
+    
+    def stats(self) -> Dict[str, int]:
+        """Size of the in-memory state"""
+        return {'entries': len(self.generator.timetable), 'unplaced': len(self.generator.unplaced),
+                'rooms': len(self.generator.rooms), 'courses': len(self.generator.courses),
+                'exams': len(self.exams_by_course)}
+    
+    def room_free(self, room_id: str, day: str, time_slot: str) -> bool:
+        day, time_slot = self._cell(day, time_slot)
+        return self.generator.rooms_by_id[room_id].is_available(day, time_slot)
+    
+    def free_rooms(self, day: str, time_slot: str, room_type: str = 'Lecture',
+                   min_capacity: int = 0) -> List[str]:
+        """Free rooms of a type, smallest first"""
+        day, time_slot = self._cell(day, time_slot)
+        return [room.room_id for room in self.generator.room_index.free_rooms(room_type, day, time_slot)
+                if room.capacity >= min_capacity]
+    
+    def professor_free(self, prof_id: str, day: str, time_slot: str) -> bool:
+        day, time_slot = self._cell(day, time_slot)
+        return self.generator.professors[prof_id].is_available(day, time_slot)
+    
+    def batch_free(self, batch_id: str, day: str, time_slot: str) -> bool:
+        day, time_slot = self._cell(day, time_slot)
+        return self.generator.batch_calendar.is_free(batch_id, day, time_slot)
+    
+    def entries(self, batch_id: str = None, room_id: str = None, instructor_id: str = None,
+                course_code: str = None, day: str = None, time_slot: str = None) -> List[Dict]:
+        """Timetable entries matching every given field, in week order"""
+        filters = [(kind, value) for kind, value in (('batch', batch_id), ('room', room_id),
+                                                     ('professor', instructor_id), ('course', course_code))
+                   if value is not None]
+        if not filters:
+            raise ValueError("entries needs batch_id, room_id, instructor_id or course_code")
+        if day is not None:
+            day = self._day(day)
+        if time_slot is not None:
+            time_slot = self._slot(time_slot)
+        (kind, value), rest = filters[0], filters[1:]
+        return [entry.to_dict() for entry in self.index.entries(kind, value, day, time_slot)
+                if all(getattr(entry, RESOURCE_FIELDS[k]) == v for k, v in rest)]
+    
+    def free_slots(self, batches: List[str] = (), professors: List[str] = (), rooms: List[str] = (),
+                   courses: List[str] = (), days: List[str] = None, skip_lunch: bool = True
+                   ) -> List[List[str]]:
+        """Cells where every listed resource is free"""
+        resources = ([('batch', b) for b in batches] + [('professor', p) for p in professors] +
+                     [('room', r) for r in rooms] + [('course', c) for c in courses])
+        if days is not None:
+            days = [self._day(day) for day in days]
+        return [list(cell) for cell in self.index.free_slots(resources, days, skip_lunch)]
+    
+    def _constraints(self, days: List[str] = None, time_slots: List[str] = None,
+                     avoid: List[List[str]] = None) -> Tuple[List[str], List[str], set]:
+        """Allowed days and slots, in grid order, plus cells to avoid"""
+        allowed_days = {self._day(day) for day in days or Config.WORKING_DAYS}
+        allowed_slots = {self._slot(slot) for slot in time_slots or Config.TIME_SLOTS}
+        return ([day for day in Config.WORKING_DAYS if day in allowed_days],
+                [slot for slot in Config.TIME_SLOTS if slot in allowed_slots],
+                {self._cell(*cell) for cell in avoid or ()})
+    
+    def _extra_index(self, course_code: str) -> int:
+        """Session index for an extra session of a course"""
+        course = self.generator.courses_by_code[course_code]
+        index = course.total_sessions()
+        while f"{course_code}-{index}" in self.generator.entries_by_slot:
+            index += 1
+        return index
+    
+    def _placement(self, course_code: str, index: int, constraints: Dict
+                   ) -> Optional[Tuple[str, str, Any]]:
+        course = self.generator.courses_by_code[course_code]
+        days, time_slots, avoid = self._constraints(**constraints)
+        return self.generator._find_slot(course, index, days, time_slots, avoid)
+    
+    def find_slot(self, course_code: str, **constraints) -> Optional[Dict[str, str]]:
+        """Where an extra session of a course would go; nothing is booked"""
+        placement = self._placement(course_code, self._extra_index(course_code), constraints)
+        if placement is None:
+            return None
+        day, time_slot, room = placement
+        return {'day': day, 'time_slot': time_slot, 'room_id': room.room_id}
+    
+    def add_session(self, course_code: str, **constraints) -> Optional[Dict]:
+        """Book an extra session of a course; None when no slot is free"""
+        index = self._extra_index(course_code)
+        placement = self._placement(course_code, index, constraints)
+        if placement is None:
+            return None
+        day, time_slot, room = placement
+        course = self.generator.courses_by_code[course_code]
+        entry = self.generator._place(course, index, day, time_slot, room)
+        self.index.add(entry)
+        return entry.to_dict()
+    
+    def remove_session(self, slot_id: str) -> List[Dict]:
+        """Cancel a session, or a lab hour's whole block, and free its resources
+        
+        Sessions the course needs become unplaced, so reschedule or repair
+        can put them back; extra sessions are simply gone.
+        """
+        generator = self.generator
+        entry: TimetableEntry = generator.entries_by_slot[slot_id]
+        course = generator.courses_by_code[entry.course_code]
+        entries = [entry]
+        if entry.session_type == 'Lab':
+            # Lab hours are booked as one block (R10), so they are cancelled as one
+            slot_ids = [f"{course.course_code}-{index}" for index in generator._lab_indices(course)]
+            entries = [generator.entries_by_slot[s] for s in slot_ids if s in generator.entries_by_slot]
+        for removed in entries:
+            generator._vacate(course, removed.day, removed.time_slot, generator.rooms_by_id[removed.room_id],
+                              lab=removed.session_type == 'Lab')
+            self.index.remove(removed)
+        generator._drop_entries(entries)
+        for removed in entries:
+            index = int(removed.slot_id.rsplit('-', 1)[1])
+            if index < course.total_sessions():
+                generator.unplaced.append((course, index))
+        return [removed.to_dict() for removed in entries]
+    
+    def reschedule(self, target: str, keep_on_failure: bool = False, **constraints) -> List[Dict]:
+        """Re-place a course or slot (see TimetableGenerator.reschedule)"""
+        days, time_slots, avoid = self._constraints(**constraints)
+        changes = self.generator.reschedule(target, {'days': days, 'time_slots': time_slots, 'avoid': avoid},
+                                            keep_on_failure=bool(keep_on_failure))
+        for before, after in changes:
+            if before is not None:
+                self.index.remove(before)
+            if after is not None:
+                self.index.add(after)
+        return [{'before': before.to_dict() if before else None,
+                 'after': after.to_dict() if after else None}
+                for before, after in changes]
+    
+    def exam(self, course_code: str) -> Dict:
+        return self.exams_by_course[course_code].to_dict()
+
+
+class ScheduleServer:
+    """asyncio JSON-lines server over TCP or a Unix socket in front of a ScheduleService"""
+    
+    def __init__(self, service: ScheduleService, host: str = None, port: int = None,
+                 path: str = None):
+        self.service = service
+        self.host = host or Config.SERVER_HOST
+        self.port = Config.SERVER_PORT if port is None else port
+        self.path = path
+        self.logger = Logger("ScheduleServer")
+        self._stop: Optional[asyncio.Event] = None
+    
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one JSON request per line until the client disconnects"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Bad request: {e}"}
+                else:
+                    if request.get('op') == 'shutdown':
+                        self._stop.set()
+                        response = {'ok': True, 'result': 'bye'}
+                    else:
+                        response = self.service.handle(request)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+                if self._stop.is_set():
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self):
+        """Serve until a 'shutdown' request arrives"""
+        self._stop = asyncio.Event()
+        if self.path:
+            server = await asyncio.start_unix_server(self._client, path=self.path)
+            self.logger.info(f"Serving on unix:{self.path}")
+        else:
+            server = await asyncio.start_server(self._client, self.host, self.port)
+            self.logger.info(f"Serving on {self.host}:{self.port}")
+        async with server:
+            await self._stop.wait()
+        self.logger.info("Server stopped")
+    
+    def run(self):
+        """Blocking entry point"""
+        asyncio.run(self.serve())
+
+
+class ScheduleClient:
+    """Minimal blocking client for a ScheduleServer"""
+    
+    def __init__(self, host: str = None, port: int = None, path: str = None, timeout: float = 10.0):
+        if path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host or Config.SERVER_HOST,
+                                                  Config.SERVER_PORT if port is None else port), timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile('rwb')
+    
+    def request(self, op: str, **args) -> Dict[str, Any]:
+        """Send one request and wait for its response"""
+        self.file.write(json.dumps(dict(args, op=op)).encode('utf-8') + b'\n')
+        self.file.flush()
+        return json.loads(self.file.readline())
+    
+    def close(self):
+        self.file.close()
+        self.sock.close()
\ No newline at end of file
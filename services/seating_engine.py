@@ -0,0 +1,55 @@
+import heapq
+from array import array
+from collections import deque
+from typing import List
+from models.exam import SeatMap
+from config import Config
+
+class SeatingEngine:
+    """Builds interleaved seat maps for rooms shared by several exams"""
+    
+    def __init__(self, min_gap: int = None):
+        # Seats required between two students of the same exam
+        self.min_gap = Config.MIN_SEATS_BETWEEN_SAME_EXAM if min_gap is None else min_gap
+    
+    def build(self, room_id: str, capacity: int, exam_codes: List[str], counts: List[int]) -> SeatMap:
+        """Seat counts[e] students of exam_codes[e] in seats 0..capacity-1
+        
+        Greedy with a cooldown queue: each seat goes to the exam with the most
+        students left among those whose last student sat at least min_gap
+        seats back. Spare seats are left empty when every exam is cooling
+        down; only when no spare seats remain is the gap broken.
+        """
+        seat_exam = array('i', [-1]) * capacity
+        seat_index = array('i', [-1]) * capacity
+        remaining = list(counts)
+        spare = capacity - sum(counts)
+        step = self.min_gap + 1
+        violations = 0
+        
+        ready = [(-n, e) for e, n in enumerate(counts) if n > 0]
+        heapq.heapify(ready)
+        cooling = deque()  # (first seat allowed, exam), in seat order
+        
+        for seat in range(capacity):
+            while cooling and cooling[0][0] <= seat:
+                _, e = cooling.popleft()
+                heapq.heappush(ready, (-remaining[e], e))
+            if ready:
+                _, e = heapq.heappop(ready)
+            elif not cooling:
+                break
+            elif spare > 0:
+                spare -= 1
+                continue
+            else:
+                _, e = cooling.popleft()
+                violations += 1
+            
+            seat_exam[seat] = e
+            seat_index[seat] = counts[e] - remaining[e]
+            remaining[e] -= 1
+            if remaining[e]:
+                cooling.append((seat + step, e))
+        
+        return SeatMap(room_id, list(exam_codes), seat_exam, seat_index, violations)
\ No newline at end of file
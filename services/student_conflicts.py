@@ -0,0 +1,112 @@
+from array import array
+from typing import List, Dict, Tuple, Mapping, Iterable
+from models.timetable import TimetableEntry
+from models.calendar import ResourceCalendar
+from models.enrollment import EnrollmentStore
+from services.exam_conflict import ConflictGraph, popcount
+
+class StudentConflicts:
+    """Which courses share students, and where those courses are currently taught
+    
+    The course-overlap matrix is the exam ConflictGraph's adjacency bitsets,
+    so "do A and B share a student" is one shift and mask. While scheduling,
+    blocked[i] holds the grid cells taken by courses sharing students with
+    course i, kept exact under release by per-(course, cell) counts.
+    """
+    
+    def __init__(self, course_codes: List[str], enrollments: Mapping[str, Iterable[str]],
+                 grid: ResourceCalendar = None):
+        self.grid = grid or ResourceCalendar.shared()
+        self.graph = ConflictGraph(course_codes, enrollments)
+        self.index = self.graph.index
+        self.enrollments = enrollments
+        self.blocked: List[int] = [0] * len(self.graph.course_codes)
+        self._counts = array('H', bytes(2 * len(self.graph.course_codes) * self.grid.size))
+        self._bitsets: Dict[str, int] = {}
+        self._student_index: Dict[str, int] = None
+    
+    def shares_students(self, code_a: str, code_b: str) -> bool:
+        return self.graph.conflicts(code_a, code_b)
+    
+    def student_bitset(self, course_code: str) -> int:
+        """Bitset over interned student ids of a course's students"""
+        bitset = self._bitsets.get(course_code)
+        if bitset is None:
+            if isinstance(self.enrollments, EnrollmentStore):
+                bitset = self.enrollments.student_bitset(course_code)
+            else:
+                if self._student_index is None:
+                    self._student_index = {}
+                    for students in self.enrollments.values():
+                        for student_id in students:
+                            self._student_index.setdefault(student_id, len(self._student_index))
+                bitset = 0
+                for student_id in self.enrollments.get(course_code, ()):
+                    bitset |= 1 << self._student_index[student_id]
+            self._bitsets[course_code] = bitset
+        return bitset
+    
+    def shared_students(self, code_a: str, code_b: str) -> int:
+        """Number of students taking both courses"""
+        if not self.shares_students(code_a, code_b):
+            return 0
+        return popcount(self.student_bitset(code_a) & self.student_bitset(code_b))
+    
+    def blocked_mask(self, course_code: str) -> int:
+        """Cells where a course sharing students with this one is taught"""
+        i = self.index.get(course_code)
+        return 0 if i is None else self.blocked[i]
+    
+    def occupy(self, course_code: str, day: str, time_slot: str):
+        """Record a session of course_code at (day, time_slot)"""
+        self._update(course_code, self.grid.index(day, time_slot), 1)
+    
+    def release(self, course_code: str, day: str, time_slot: str):
+        """Undo occupy()"""
+        self._update(course_code, self.grid.index(day, time_slot), -1)
+    
+    def _update(self, course_code: str, cell: int, step: int):
+        i = self.index.get(course_code)
+        if i is None:
+            return
+        counts, blocked, size = self._counts, self.blocked, self.grid.size
+        bit = 1 << cell
+        rest = self.graph.adjacency[i]
+        while rest:
+            low = rest & -rest
+            j = low.bit_length() - 1
+            rest ^= low
+            k = j * size + cell
+            counts[k] += step
+            if counts[k]:
+                blocked[j] |= bit
+            else:
+                blocked[j] &= ~bit
+    
+    def clashes(self, timetable: List[TimetableEntry]) -> List[Tuple[TimetableEntry, TimetableEntry, int]]:
+        """(entry, entry, shared students) for sessions of different batches sharing students and a cell"""
+        by_cell: Dict[Tuple[str, str], List[TimetableEntry]] = {}
+        for entry in timetable:
+            if entry.course_code in self.index:
+                by_cell.setdefault((entry.day, entry.time_slot), []).append(entry)
+        
+        adjacency = self.graph.adjacency
+        found = []
+        for entries in by_cell.values():
+            if len(entries) < 2:
+                continue
+            present = 0
+            for entry in entries:
+                present |= 1 << self.index[entry.course_code]
+            for a, entry_a in enumerate(entries):
+                i = self.index[entry_a.course_code]
+                if not adjacency[i] & present:
+                    continue
+                for entry_b in entries[a + 1:]:
+                    # Same-batch pairs are batch clashes already
+                    if entry_b.batch_id == entry_a.batch_id:
+                        continue
+                    if (adjacency[i] >> self.index[entry_b.course_code]) & 1:
+                        found.append((entry_a, entry_b,
+                                      self.shared_students(entry_a.course_code, entry_b.course_code)))
+        return found
\ No newline at end of file
@@ -1,57 +1,131 @@
-from typing import List, Dict
+from bisect import bisect_left
+from dataclasses import replace
+from typing import List, Dict, Tuple, Iterable, Optional, Set
 from models.course import Course
 from models.professor import Professor
 from models.room import Room
 from models.timetable import TimetableEntry
+from models.calendar import ResourceCalendar
+from models.room_index import RoomIndex
+from models.free_runs import FreeRunTable
+from models.timetable_index import TimetableIndex
+from models.unplaced import UnplacedSessions
+from models.enrollment import EnrollmentStore
 from services.validator import Validator
+from services.student_conflicts import StudentConflicts
 from config import Config
 from utils.logger import Logger
+from utils.profiler import Profiler
 import random
 
 class TimetableGenerator:
     """Service for generating academic timetables"""
     
     def __init__(self, courses: List[Course], professors: Dict[str, Professor], 
-                 rooms: List[Room]):
+                 rooms: List[Room], enrollments: Dict[str, List[str]] = None, 
+                 seed: int = None, profiler: Profiler = None, backend: str = None):
         self.courses = courses
         self.professors = professors
         self.rooms = rooms
+        self.enrollments = enrollments or {}
+        self.seed = seed
+        self.backend = backend or Config.PLACEMENT_BACKEND
+        if self.backend not in ('slots', 'intervals'):
+            raise ValueError(f"Unknown placement backend: {self.backend}")
+        self.rng = random.Random(seed) if seed is not None else None
         self.validator = Validator()
         self.logger = Logger("TimetableGenerator")
         self.timetable: List[TimetableEntry] = []
         
         # Track usage
-        self.batch_schedule: Dict[str, Dict] = {}
-        self.course_daily_count: Dict[str, Dict] = {}
+        self.grid = ResourceCalendar.shared()
+        self.batch_calendar = ResourceCalendar()
+        self.room_index = RoomIndex(rooms, self.grid)
+        # Free-run tables make "can a lab block start here" a lookup per resource
+        self.room_runs = FreeRunTable(self.grid)
+        self.batch_runs = FreeRunTable(self.grid)
+        self.professor_runs = FreeRunTable(self.grid)
+        for room in rooms:
+            if room.occupied_mask:
+                self.room_runs.load(room.room_id, room.occupied_mask)
+        for prof_id, professor in professors.items():
+            if professor.assigned_mask:
+                self.professor_runs.load(prof_id, professor.assigned_mask)
+        self.course_daily_count: Dict[str, int] = {}
+        self.unplaced = UnplacedSessions()
+        
+        self.entries_by_slot: Dict[str, TimetableEntry] = {}
+        # slot_id -> position in self.timetable, so dropping an entry is O(1)
+        self.positions: Dict[str, int] = {}
+        self.courses_by_code = {course.course_code: course for course in courses}
+        self.rooms_by_id = {room.room_id: room for room in rooms}
+        
+        # Courses sharing students (electives across batches) must not share a slot
+        self.student_conflicts: Optional[StudentConflicts] = None
+        if Config.STUDENT_AWARE_SCHEDULING and self.enrollments:
+            self.student_conflicts = StudentConflicts([c.course_code for c in courses],
+                                                      self.enrollments, self.grid)
+        
+        # Hot-path counters; None keeps instrumentation to a single check
+        self.counters: Optional[Dict[str, int]] = profiler.counters if profiler else None
+        self.room_index.counters = self.counters
     
     def generate(self) -> List[TimetableEntry]:
         """Generate complete timetable"""
         self.logger.info("Starting timetable generation...")
         
-        for course in self.courses:
+        courses = list(self.courses)
+        if self.rng:
+            # Randomized start: course order drives which sessions win contested slots
+            self.rng.shuffle(courses)
+        
+        placer = None
+        if self.backend == 'intervals':
+            from services.interval_placement import IntervalPlacer
+            placer = IntervalPlacer(self)
+        
+        for course in courses:
             if not self.validator.validate_course(course, self.professors):
                 continue
             
-            self._schedule_course(course)
+            if placer:
+                placer.place_course(course)
+            else:
+                self._schedule_course(course)
         
         self.logger.info(f"Generated {len(self.timetable)} timetable entries")
+        if self.unplaced:
+            self.logger.warning(f"{len(self.unplaced)} sessions could not be placed")
         return self.timetable
     
     def _schedule_course(self, course: Course):
         """Schedule all sessions for a course"""
-        sessions_needed = course.total_sessions()
+        sessions_needed = course.class_sessions()
         sessions_scheduled = 0
+        professor = self.professors[course.instructor_id]
+        batch_size = self._batch_size(course)
+        batch_masks = self.batch_calendar.masks
+        conflicts = self.student_conflicts
+        course_index = conflicts.index.get(course.course_code) if conflicts else None
+        counters = self.counters
+        days, time_slots = Config.WORKING_DAYS, Config.TIME_SLOTS
+        if self.rng:
+            days = self.rng.sample(days, len(days))
+            time_slots = self.rng.sample(time_slots, len(time_slots))
         
-        for day in Config.WORKING_DAYS:
+        for day in days:
             if sessions_scheduled >= sessions_needed:
                 break
             
             # Check if course already scheduled today (R5)
             day_key = f"{course.course_code}-{day}"
             if day_key in self.course_daily_count:
+                if counters is not None:
+                    counters['reject_course_day'] = counters.get('reject_course_day', 0) + 1
                 continue
             
-            for slot_idx, time_slot in enumerate(Config.TIME_SLOTS):
+            day_bits = self.grid.bits[day]
+            for time_slot in time_slots:
                 if sessions_scheduled >= sessions_needed:
                     break
                 
@@ -59,63 +133,512 @@ class TimetableGenerator:
                 if time_slot == Config.LUNCH_SLOT:
                     continue
                 
+                bit = day_bits[time_slot]
+                if counters is not None:
+                    counters['slot_probes'] = counters.get('slot_probes', 0) + 1
+                
                 # Check if batch is free
-                if not self._is_batch_free(course.batch_id, day, time_slot):
+                if batch_masks.get(course.batch_id, 0) & bit:
+                    if counters is not None:
+                        counters['reject_batch_busy'] = counters.get('reject_batch_busy', 0) + 1
+                    continue
+                
+                # Check no course sharing students is taught then
+                if course_index is not None and conflicts.blocked[course_index] & bit:
+                    if counters is not None:
+                        counters['reject_student_clash'] = counters.get('reject_student_clash', 0) + 1
                     continue
                 
                 # Check if professor is free
-                if not self._is_professor_free(course.instructor_id, day, time_slot):
+                if professor.assigned_mask & bit:
+                    if counters is not None:
+                        counters['reject_professor_busy'] = counters.get('reject_professor_busy', 0) + 1
                     continue
                 
                 # Find available room
-                room_type = 'Lab' if course.needs_lab() and sessions_scheduled >= course.L else 'Lecture'
-                room = self._find_available_room(day, time_slot, room_type)
+                session_type, room_type = self._session_kind(course, sessions_scheduled)
+                room = self._find_available_room(day, time_slot, room_type, batch_size)
                 
                 if room:
-                    # Create timetable entry
-                    session_type = 'Lecture' if sessions_scheduled < course.L else 'Tutorial'
-                    entry = TimetableEntry(
-                        slot_id=f"{course.course_code}-{sessions_scheduled}",
-                        day=day,
-                        time_slot=time_slot,
-                        course_code=course.course_code,
-                        course_name=course.course_name,
-                        room_id=room.room_id,
-                        instructor_id=course.instructor_id,
-                        batch_id=course.batch_id,
-                        session_type=session_type
-                    )
-                    
-                    self.timetable.append(entry)
-                    
-                    # Update tracking
-                    room.occupy_slot(day, time_slot)
-                    self.professors[course.instructor_id].assign_slot(day, time_slot)
-                    self._mark_batch_busy(course.batch_id, day, time_slot)
-                    self.course_daily_count[day_key] = True
-                    
+                    self._place(course, sessions_scheduled, day, time_slot, room, session_type)
                     sessions_scheduled += 1
+                elif counters is not None:
+                    counters['reject_no_room'] = counters.get('reject_no_room', 0) + 1
+        
+        for index in range(sessions_scheduled, sessions_needed):
+            self.unplaced.append((course, index))
+        if counters is not None and sessions_scheduled < sessions_needed:
+            counters['greedy_unplaced'] = counters.get('greedy_unplaced', 0) + sessions_needed - sessions_scheduled
+        
+        if course.needs_lab():
+            self._schedule_lab(course)
+    
+    def _schedule_lab(self, course: Course):
+        """Place a course's P lab hours as one contiguous block in a Lab room (R10)"""
+        days = self._lab_days(course)
+        if self.rng:
+            days = self.rng.sample(days, len(days))
+        block = self._find_lab_block(course, days, Config.TIME_SLOTS, set())
+        if block is None:
+            self.unplaced.extend((course, index) for index in self._lab_indices(course))
+            if self.counters is not None:
+                self.counters['reject_lab_block'] = self.counters.get('reject_lab_block', 0) + 1
+            return
+        day, time_slots, room = block
+        for index, time_slot in zip(self._lab_indices(course), time_slots):
+            self._place(course, index, day, time_slot, room, 'Lab')
+    
+    def _lab_days(self, course: Course) -> List[str]:
+        """Days a lab block may fall on: a lecture day or the working day after one (R10)"""
+        days = Config.WORKING_DAYS
+        lecture_days = set()
+        for index in range(course.L):
+            entry = self.entries_by_slot.get(f"{course.course_code}-{index}")
+            if entry is not None:
+                lecture_days.add(entry.day)
+        if not lecture_days:
+            return list(days)
+        return [day for i, day in enumerate(days)
+                if day in lecture_days or (i > 0 and days[i - 1] in lecture_days)]
+    
+    def _find_lab_block(self, course: Course, days: List[str], time_slots: List[str],
+                        avoid: Set[Tuple[str, str]], keep: Tuple[str, str] = None
+                        ) -> Optional[Tuple[str, List[str], Room]]:
+        """(day, time slots, room) for a course's lab block against current occupancy
+        
+        Each start cell is checked with one free-run lookup for the batch, the
+        professor and each candidate room; runs never cross the lunch slot.
+        """
+        length = course.P
+        grid = self.grid
+        per_day = grid.slots_per_day
+        batch_id, prof_id = course.batch_id, course.instructor_id
+        typed_rooms = self.room_index.rooms_by_type.get('Lab', [])
+        rooms = typed_rooms[bisect_left(self.room_index.capacities.get('Lab', []), self._batch_size(course)):]
+        blocked = 0
+        if self.student_conflicts is not None:
+            blocked = self.student_conflicts.blocked_mask(course.course_code)
+        block_mask = (1 << length) - 1
+        allowed = set(time_slots)
+        
+        # Staying put is always the smallest change
+        starts = [keep] if keep is not None and keep[0] in days else []
+        starts += [(day, time_slot) for day in days for time_slot in grid.slots if time_slot in allowed]
+        for day, start in starts:
+            cell = grid.index(day, start)
+            if not (self.batch_runs.fits(batch_id, cell, length)
+                    and self.professor_runs.fits(prof_id, cell, length)):
+                continue
+            if blocked & (block_mask << cell):
+                continue
+            block = grid.slots[cell % per_day:cell % per_day + length]
+            if any(slot not in allowed or (day, slot) in avoid for slot in block):
+                continue
+            for room in rooms:
+                if self.room_runs.fits(room.room_id, cell, length):
+                    return day, block, room
+        return None
+    
+    @staticmethod
+    def _lab_indices(course: Course) -> range:
+        """Session indices of a course's lab hours"""
+        return range(course.class_sessions(), course.total_sessions())
+    
+    @staticmethod
+    def _is_lab(course: Course, index: int) -> bool:
+        """Check if a session index is one of the course's lab hours"""
+        return course.class_sessions() <= index < course.total_sessions()
+    
+    @staticmethod
+    def _session_kind(course: Course, index: int) -> Tuple[str, str]:
+        """Session type and required room type of a course's index-th session
+        
+        Sessions past the lab hours (extra sessions) are tutorials.
+        """
+        if index < course.L:
+            return 'Lecture', 'Lecture'
+        if TimetableGenerator._is_lab(course, index):
+            return 'Lab', 'Lab'
+        return 'Tutorial', 'Lecture'
+    
+    def _place(self, course: Course, index: int, day: str, time_slot: str, room: Room, 
+               session_type: str = None) -> TimetableEntry:
+        """Create a timetable entry for a session and occupy its resources"""
+        if session_type is None:
+            session_type, _ = self._session_kind(course, index)
+        entry = TimetableEntry(
+            slot_id=f"{course.course_code}-{index}",
+            day=day,
+            time_slot=time_slot,
+            course_code=course.course_code,
+            course_name=course.course_name,
+            room_id=room.room_id,
+            instructor_id=course.instructor_id,
+            batch_id=course.batch_id,
+            session_type=session_type
+        )
+        
+        self._add_entry(entry)
+        self._occupy(course, day, time_slot, room, lab=session_type == 'Lab')
+        return entry
+    
+    def _add_entry(self, entry: TimetableEntry):
+        """Append an entry to the timetable and its lookups (resources are not touched)"""
+        self.positions[entry.slot_id] = len(self.timetable)
+        self.timetable.append(entry)
+        self.entries_by_slot[entry.slot_id] = entry
+    
+    def _occupy(self, course: Course, day: str, time_slot: str, room: Room, lab: bool = False):
+        """Mark room, professor, batch and course-day as used (lab hours do not count for R5)"""
+        self.room_index.occupy(room, day, time_slot)
+        self.professors[course.instructor_id].assign_slot(day, time_slot)
+        self._mark_batch_busy(course.batch_id, day, time_slot)
+        cell = self.grid.index(day, time_slot)
+        self.room_runs.occupy(room.room_id, cell)
+        self.batch_runs.occupy(course.batch_id, cell)
+        self.professor_runs.occupy(course.instructor_id, cell)
+        if not lab:
+            day_key = f"{course.course_code}-{day}"
+            self.course_daily_count[day_key] = self.course_daily_count.get(day_key, 0) + 1
+        if self.student_conflicts is not None:
+            self.student_conflicts.occupy(course.course_code, day, time_slot)
+    
+    def _vacate(self, course: Course, day: str, time_slot: str, room: Room, lab: bool = False):
+        """Undo _occupy for one session"""
+        self.room_index.release(room, day, time_slot)
+        self.professors[course.instructor_id].release_slot(day, time_slot)
+        self.batch_calendar.release(course.batch_id, day, time_slot)
+        cell = self.grid.index(day, time_slot)
+        self.room_runs.release(room.room_id, cell)
+        self.batch_runs.release(course.batch_id, cell)
+        self.professor_runs.release(course.instructor_id, cell)
+        if not lab:
+            day_key = f"{course.course_code}-{day}"
+            count = self.course_daily_count.get(day_key, 0) - 1
+            if count > 0:
+                self.course_daily_count[day_key] = count
+            else:
+                self.course_daily_count.pop(day_key, None)
+        if self.student_conflicts is not None:
+            self.student_conflicts.release(course.course_code, day, time_slot)
+    
+    def load_timetable(self, entries: Iterable[TimetableEntry]) -> List[TimetableEntry]:
+        """Adopt existing entries, occupying their resources; sessions not listed become unplaced"""
+        self._require_slots("load_timetable")
+        placed = set()
+        for entry in entries:
+            course = self.courses_by_code[entry.course_code]
+            self._add_entry(entry)
+            self._occupy(course, entry.day, entry.time_slot, self.rooms_by_id[entry.room_id],
+                         lab=entry.session_type == 'Lab')
+            placed.add(entry.slot_id)
+        
+        for course in self.courses:
+            for index in range(course.total_sessions()):
+                if f"{course.course_code}-{index}" not in placed:
+                    self.unplaced.append((course, index))
+        return self.timetable
+    
+    def _drop_entries(self, entries: List[TimetableEntry]):
+        """Remove entries from the timetable (their resources must already be vacated)
+        
+        The last entry fills each hole, so the cost does not grow with the
+        timetable; entry order is not kept.
+        """
+        for entry in entries:
+            position = self.positions.pop(entry.slot_id, None)
+            if position is None:
+                continue
+            del self.entries_by_slot[entry.slot_id]
+            last = self.timetable.pop()
+            if last is not entry:
+                self.timetable[position] = last
+                self.positions[last.slot_id] = position
+    
+    def reschedule(self, target: str, constraints: Dict = None, keep_on_failure: bool = False
+                   ) -> List[Tuple[Optional[TimetableEntry], Optional[TimetableEntry]]]:
+        """Re-place the sessions of a course code or a single slot_id (R7)
+        
+        Only the targeted sessions are released; everything else keeps its
+        occupancy; a lab hour moves with the rest of its block. Supported
+        constraints: 'avoid' (iterable of (day, time_slot)), 'days' and
+        'time_slots' (allowed values; an unknown one raises ValueError).
+        Returns (before, after) pairs for sessions that changed; before is None
+        for a newly placed session and after is None for one that could no
+        longer be placed. With keep_on_failure, a reschedule that would leave a
+        placed session without a slot is not applied and returns no changes.
+        """
+        self._require_slots("reschedule")
+        constraints = constraints or {}
+        if target in self.entries_by_slot:
+            entry = self.entries_by_slot[target]
+            course = self.courses_by_code[entry.course_code]
+            index = int(target.rsplit('-', 1)[1])
+            if self._is_lab(course, index):
+                sessions = [(course, i) for i in self._lab_indices(course)]
+            else:
+                sessions = [(course, index)]
+        elif target in self.courses_by_code:
+            course = self.courses_by_code[target]
+            sessions = [(course, index) for index in range(course.total_sessions())]
+        else:
+            raise KeyError(f"Unknown course or slot: {target}")
+        
+        avoid = {tuple(cell) for cell in constraints.get('avoid', ())}
+        allowed_days = set(constraints.get('days', Config.WORKING_DAYS))
+        allowed_slots = set(constraints.get('time_slots', Config.TIME_SLOTS))
+        for day in allowed_days.difference(Config.WORKING_DAYS):
+            raise ValueError(f"Unknown day: {day}")
+        for slot in allowed_slots.difference(Config.TIME_SLOTS):
+            raise ValueError(f"Unknown time slot: {slot}")
+        days = [day for day in Config.WORKING_DAYS if day in allowed_days]
+        time_slots = [slot for slot in Config.TIME_SLOTS if slot in allowed_slots]
+        
+        # Release only the targeted sessions
+        released = []
+        for course, index in sessions:
+            entry = self.entries_by_slot.get(f"{course.course_code}-{index}")
+            if entry is not None:
+                before = replace(entry)
+                self._vacate(course, entry.day, entry.time_slot, self.rooms_by_id[entry.room_id],
+                             lab=self._is_lab(course, index))
+                released.append((course, index, entry, before))
+            elif (course, index) in self.unplaced:
+                released.append((course, index, None, None))
+        
+        def keep_cell(before: Optional[TimetableEntry]) -> Optional[Tuple[str, str]]:
+            if before is None or (before.day, before.time_slot) in avoid:
+                return None
+            if before.day not in allowed_days or before.time_slot not in allowed_slots:
+                return None
+            return before.day, before.time_slot
+        
+        # Lab blocks are re-placed after the lectures they follow
+        labs = [item for item in released if self._is_lab(item[0], item[1])]
+        released = [item for item in released if not self._is_lab(item[0], item[1])]
+        
+        # Sessions that may stay put go first so moved ones cannot displace them
+        released.sort(key=lambda item: keep_cell(item[3]) is None)
+        
+        changes = []
+        dropped = []
+        for course, index, entry, before in released:
+            placement = self._find_slot(course, index, days, time_slots, avoid, keep_cell(before))
+            
+            if placement is None:
+                if entry is not None:
+                    dropped.append(entry)
+                    self.unplaced.append((course, index))
+                    changes.append((before, None))
+                continue
+            
+            day, time_slot, room = placement
+            if entry is None:
+                self.unplaced.remove((course, index))
+                changes.append((None, self._place(course, index, day, time_slot, room)))
+                continue
+            
+            self._occupy(course, day, time_slot, room)
+            entry.day, entry.time_slot, entry.room_id = day, time_slot, room.room_id
+            if (day, time_slot, room.room_id) != (before.day, before.time_slot, before.room_id):
+                changes.append((before, entry))
+        
+        if labs:
+            self._rebook_lab(labs, days, time_slots, avoid, changes, dropped)
+        
+        if keep_on_failure and dropped:
+            self._undo_reschedule(changes)
+            self.logger.info(f"Rescheduled {target}: not applied, {len(dropped)} session(s) found no slot")
+            return []
+        
+        if dropped:
+            self._drop_entries(dropped)
+        
+        self.logger.info(f"Rescheduled {target}: {len(changes)} session(s) changed")
+        return changes
+    
+    def _undo_reschedule(self, changes: List[Tuple[Optional[TimetableEntry], Optional[TimetableEntry]]]):
+        """Put every session a reschedule touched back where it was"""
+        # Free the new cells first so the old ones can all be re-occupied
+        restore = []
+        for before, after in changes:
+            if after is None:
+                continue
+            course = self.courses_by_code[after.course_code]
+            self._vacate(course, after.day, after.time_slot, self.rooms_by_id[after.room_id],
+                         lab=after.session_type == 'Lab')
+            if before is None:
+                self._drop_entries([after])
+                self.unplaced.append((course, int(after.slot_id.rsplit('-', 1)[1])))
+            else:
+                after.day, after.time_slot, after.room_id = before.day, before.time_slot, before.room_id
+                restore.append(after)
+        
+        # Sessions that found no slot were vacated but never changed
+        restore.extend(self.entries_by_slot[before.slot_id] for before, after in changes if after is None)
+        for entry in restore:
+            course = self.courses_by_code[entry.course_code]
+            self.unplaced.discard((course, int(entry.slot_id.rsplit('-', 1)[1])))
+            self._occupy(course, entry.day, entry.time_slot, self.rooms_by_id[entry.room_id],
+                         lab=entry.session_type == 'Lab')
+    
+    def _rebook_lab(self, labs: List[Tuple[Course, int, Optional[TimetableEntry], Optional[TimetableEntry]]],
+                    days: List[str], time_slots: List[str], avoid: Set[Tuple[str, str]],
+                    changes: List, dropped: List[TimetableEntry]):
+        """Re-place a released lab block as a whole (see reschedule)"""
+        course = labs[0][0]
+        labs.sort(key=lambda item: item[1])
+        keep = None
+        if all(before is not None for _, _, _, before in labs):
+            keep = labs[0][3].day, labs[0][3].time_slot
+        lab_days = [day for day in self._lab_days(course) if day in days]
+        block = self._find_lab_block(course, lab_days, time_slots, avoid, keep)
+        
+        for k, (course, index, entry, before) in enumerate(labs):
+            if block is None:
+                if entry is not None:
+                    dropped.append(entry)
+                    self.unplaced.append((course, index))
+                    changes.append((before, None))
+                continue
+            
+            day, block_slots, room = block
+            if entry is None:
+                self.unplaced.remove((course, index))
+                changes.append((None, self._place(course, index, day, block_slots[k], room, 'Lab')))
+                continue
+            
+            self._occupy(course, day, block_slots[k], room, lab=True)
+            entry.day, entry.time_slot, entry.room_id = day, block_slots[k], room.room_id
+            if (day, block_slots[k], room.room_id) != (before.day, before.time_slot, before.room_id):
+                changes.append((before, entry))
+    
+    def repair_unplaced(self) -> int:
+        """Try to place every unplaced session against current occupancy; returns how many were placed"""
+        self._require_slots("repair_unplaced")
+        remaining = []
+        labs: Dict[str, Tuple[Course, List[int]]] = {}
+        for course, index in self.unplaced:
+            if self._is_lab(course, index):
+                labs.setdefault(course.course_code, (course, []))[1].append(index)
+                continue
+            placement = self._find_slot(course, index, Config.WORKING_DAYS, Config.TIME_SLOTS, set())
+            if placement is None:
+                remaining.append((course, index))
+            else:
+                day, time_slot, room = placement
+                self._place(course, index, day, time_slot, room)
+        
+        # Only whole lab blocks are placed; a partly placed block stays as it is
+        for course, indices in labs.values():
+            block = None
+            if len(indices) == course.P:
+                block = self._find_lab_block(course, self._lab_days(course), Config.TIME_SLOTS, set())
+            if block is None:
+                remaining.extend((course, index) for index in indices)
+                continue
+            day, time_slots, room = block
+            for index, time_slot in zip(sorted(indices), time_slots):
+                self._place(course, index, day, time_slot, room, 'Lab')
+        
+        placed = len(self.unplaced) - len(remaining)
+        self.unplaced.replace(remaining)
+        return placed
+    
+    def _find_slot(self, course: Course, index: int, days: List[str], time_slots: List[str], 
+                   avoid: Set[Tuple[str, str]], keep: Tuple[str, str] = None
+                   ) -> Optional[Tuple[str, str, Room]]:
+        """Find (day, time_slot, room) for one session against current occupancy"""
+        _, room_type = self._session_kind(course, index)
+        batch_size = self._batch_size(course)
+        professor = self.professors[course.instructor_id]
+        batch_mask = self.batch_calendar.mask(course.batch_id)
+        if self.student_conflicts is not None:
+            batch_mask |= self.student_conflicts.blocked_mask(course.course_code)
+        
+        def free(day: str, time_slot: str) -> bool:
+            bit = self.grid.bits[day][time_slot]
+            return not (batch_mask & bit or professor.assigned_mask & bit)
+        
+        # Staying put is always the smallest change
+        if keep is not None and free(*keep):
+            room = self._find_available_room(keep[0], keep[1], room_type, batch_size)
+            if room:
+                return keep[0], keep[1], room
+        
+        # Prefer days without this course (R5); fall back to any day
+        for respect_daily_limit in (True, False):
+            for day in days:
+                if respect_daily_limit and f"{course.course_code}-{day}" in self.course_daily_count:
+                    continue
+                for time_slot in time_slots:
+                    if time_slot == Config.LUNCH_SLOT or (day, time_slot) in avoid:
+                        continue
+                    if not free(day, time_slot):
+                        continue
+                    room = self._find_available_room(day, time_slot, room_type, batch_size)
+                    if room:
+                        return day, time_slot, room
+        return None
+    
+    def build_index(self) -> TimetableIndex:
+        """Query index over the current timetable (not updated by later changes)"""
+        self._require_slots("build_index")
+        return TimetableIndex(self.timetable, self.grid)
+    
+    def export_changes_to_csv(self, filepath: str, 
+                              changes: List[Tuple[Optional[TimetableEntry], Optional[TimetableEntry]]]):
+        """Export only the rows changed by reschedule()"""
+        from utils.csv_handler import CSVHandler
+        csv_handler = CSVHandler()
+        
+        rows = []
+        for before, after in changes:
+            if after is None:
+                rows.append(('removed',) + before.to_row())
+            else:
+                rows.append(('added' if before is None else 'moved',) + after.to_row())
+        csv_handler.write_rows(filepath, ('change',) + TimetableEntry.FIELDS, rows)
+    
+    def _require_slots(self, operation: str):
+        """Interval placements live in the placer's calendars, not the slot grid these operations use"""
+        if self.backend != 'slots':
+            raise ValueError(f"{operation} needs the 'slots' placement backend, not '{self.backend}'")
     
     def _is_batch_free(self, batch_id: str, day: str, slot: str) -> bool:
         """Check if batch is free at given time"""
-        key = f"{batch_id}-{day}-{slot}"
-        return key not in self.batch_schedule
+        return self.batch_calendar.is_free(batch_id, day, slot)
     
     def _mark_batch_busy(self, batch_id: str, day: str, slot: str):
         """Mark batch as busy"""
-        key = f"{batch_id}-{day}-{slot}"
-        self.batch_schedule[key] = True
+        self.batch_calendar.occupy(batch_id, day, slot)
     
     def _is_professor_free(self, prof_id: str, day: str, slot: str) -> bool:
         """Check if professor is free"""
         return self.professors[prof_id].is_available(day, slot)
     
-    def _find_available_room(self, day: str, slot: str, room_type: str) -> Room:
-        """Find an available room of specified type"""
-        for room in self.rooms:
-            if room.room_type == room_type and room.is_available(day, slot):
-                return room
-        return None
+    def _batch_size(self, course: Course) -> int:
+        """Number of students enrolled in a course (0 when unknown)"""
+        if isinstance(self.enrollments, EnrollmentStore):
+            return self.enrollments.course_size(course.course_code)
+        return len(self.enrollments.get(course.course_code, []))
+    
+    def _find_available_room(self, day: str, slot: str, room_type: str, 
+                             min_capacity: int = 0) -> Room:
+        """Find the smallest available room of specified type that fits"""
+        return self.room_index.find(room_type, day, slot, min_capacity)
+    
+    def optimize(self, seed: int = None, time_limit: float = None, 
+                 max_iterations: int = None):
+        """Improve the generated timetable by local search; returns OptimizationStats"""
+        if self.backend != 'slots':
+            self.logger.warning("Local search works on the slot grid; skipped for the interval backend")
+            return None
+        from services.timetable_optimizer import TimetableOptimizer
+        seed = Config.OPTIMIZER_SEED if seed is None else seed
+        optimizer = TimetableOptimizer(self, seed=seed, time_limit=time_limit, 
+                                       max_iterations=max_iterations)
+        return optimizer.optimize()
     
     def export_to_csv(self, filepath: str):
         """Export timetable to CSV"""
@@ -0,0 +1,411 @@
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Optional, Set
+from models.course import Course
+from models.timetable import TimetableEntry
+from config import Config
+from utils.logger import Logger
+
+@dataclass
+class OptimizationStats:
+    """Convergence statistics of an optimizer run"""
+    seed: int
+    iterations: int = 0
+    accepted: int = 0
+    improved: int = 0
+    infeasible: int = 0
+    initial_cost: float = 0.0
+    best_cost: float = 0.0
+    final_cost: float = 0.0
+    elapsed: float = 0.0
+    initial_breakdown: Dict[str, int] = field(default_factory=dict)
+    final_breakdown: Dict[str, int] = field(default_factory=dict)
+    history: List[Tuple[int, float]] = field(default_factory=list)  # (iteration, best cost)
+    
+    def to_dict(self):
+        """Convert to dictionary for reporting"""
+        return {
+            'seed': self.seed,
+            'iterations': self.iterations,
+            'accepted': self.accepted,
+            'improved': self.improved,
+            'infeasible': self.infeasible,
+            'initial_cost': self.initial_cost,
+            'best_cost': self.best_cost,
+            'final_cost': self.final_cost,
+            'elapsed': round(self.elapsed, 4),
+            'initial_breakdown': self.initial_breakdown,
+            'final_breakdown': self.final_breakdown,
+            'history': self.history
+        }
+
+
+class _Session:
+    """One movable session; entry is None while unplaced"""
+    __slots__ = ('course', 'index', 'room_type', 'batch_size', 'entry')
+    
+    def __init__(self, course: Course, index: int, room_type: str, batch_size: int,
+                 entry: Optional[TimetableEntry]):
+        self.course = course
+        self.index = index
+        self.room_type = room_type
+        self.batch_size = batch_size
+        self.entry = entry
+
+
+class TimetableOptimizer:
+    """Simulated-annealing improvement of a greedy timetable with delta cost evaluation
+
+    Hard constraints (room, professor and batch clashes, lunch) are never broken by a
+    move. The cost counts unplaced sessions, R4 professor breaks, R5 repeats of a course
+    on one day and, as a soft preference, idle gaps in a batch's day. Every cost term
+    belongs to a (resource, day) group whose value is read from a table indexed by that
+    day's slot mask, so a move is scored by re-reading only the groups it touches.
+    """
+    
+    WEIGHTS = {'unplaced': 1000, 'professor_break': 10, 'daily_limit': 10, 'batch_gap': 1}
+    
+    def __init__(self, generator, seed: int = 0, time_limit: float = None,
+                 max_iterations: int = None, initial_temperature: float = 10.0,
+                 cooling: float = 0.9995, weights: Dict[str, float] = None):
+        self.generator = generator
+        self.seed = seed
+        self.time_limit = Config.OPTIMIZER_TIME_LIMIT if time_limit is None else time_limit
+        self.max_iterations = max_iterations
+        self.initial_temperature = initial_temperature
+        self.cooling = cooling
+        self.weights = dict(self.WEIGHTS, **(weights or {}))
+        self.rng = random.Random(seed)
+        self.logger = Logger("TimetableOptimizer")
+        
+        grid = generator.grid
+        self.grid = grid
+        self.slots_per_day = grid.slots_per_day
+        self.day_full = (1 << self.slots_per_day) - 1
+        lunch = grid.slot_index.get(Config.LUNCH_SLOT)
+        self.cells = [(day, slot, d) for d, day in enumerate(grid.days)
+                      for slot in grid.slots if slot != Config.LUNCH_SLOT]
+        self.break_table = self._build_break_table()
+        self.gap_table = self._build_gap_table(lunch)
+        
+        self.sessions: List[_Session] = []
+        self.unplaced: List[_Session] = []
+        self._changed: Dict[_Session, Optional[Tuple[str, str, str]]] = {}
+        self.by_batch: Dict[str, List[_Session]] = {}
+        self._collect_sessions()
+    
+    def _build_break_table(self) -> List[int]:
+        """R4 violations (consecutive sessions closer than MIN_BREAK_HOURS) per day mask"""
+        table = []
+        for mask in range(1 << self.slots_per_day):
+            slots = [s for s in range(self.slots_per_day) if (mask >> s) & 1]
+            table.append(sum(1 for a, b in zip(slots, slots[1:]) if b - a < Config.MIN_BREAK_HOURS))
+        return table
+    
+    def _build_gap_table(self, lunch: Optional[int]) -> List[int]:
+        """Idle non-lunch slots between a batch's first and last session per day mask"""
+        table = []
+        for mask in range(1 << self.slots_per_day):
+            slots = [s for s in range(self.slots_per_day) if (mask >> s) & 1]
+            if len(slots) < 2:
+                table.append(0)
+                continue
+            idle = [s for s in range(slots[0], slots[-1]) if not (mask >> s) & 1 and s != lunch]
+            table.append(len(idle))
+        return table
+    
+    def _collect_sessions(self):
+        """Wrap the generator's placed and unplaced sessions; lab blocks stay where they are"""
+        gen = self.generator
+        for entry in gen.timetable:
+            course = gen.courses_by_code[entry.course_code]
+            index = int(entry.slot_id.rsplit('-', 1)[1])
+            if not gen._is_lab(course, index):
+                self._add_session(course, index, entry)
+        for course, index in gen.unplaced:
+            if not gen._is_lab(course, index):
+                self.unplaced.append(self._add_session(course, index, None))
+    
+    def _add_session(self, course: Course, index: int, entry: Optional[TimetableEntry]) -> _Session:
+        _, room_type = self.generator._session_kind(course, index)
+        session = _Session(course, index, room_type, self.generator._batch_size(course), entry)
+        self.sessions.append(session)
+        self.by_batch.setdefault(course.batch_id, []).append(session)
+        return session
+    
+    # Cost evaluation
+    
+    def _group_cost(self, group: Tuple[str, str, int]) -> float:
+        """Cost of one (kind, resource, day) group from the generator's live state"""
+        kind, key, d = group
+        shift = d * self.slots_per_day
+        gen = self.generator
+        if kind == 'p':
+            mask = (gen.professors[key].assigned_mask >> shift) & self.day_full
+            return self.weights['professor_break'] * self.break_table[mask]
+        if kind == 'b':
+            mask = (gen.batch_calendar.masks.get(key, 0) >> shift) & self.day_full
+            return self.weights['batch_gap'] * self.gap_table[mask]
+        count = gen.course_daily_count.get(f"{key}-{self.grid.days[d]}", 0)
+        return self.weights['daily_limit'] * max(0, count - Config.MAX_SESSIONS_PER_DAY)
+    
+    @staticmethod
+    def _groups(course: Course, d: int) -> List[Tuple[str, str, int]]:
+        return [('p', course.instructor_id, d), ('b', course.batch_id, d), ('c', course.course_code, d)]
+    
+    def _cost_of(self, groups: Set[Tuple[str, str, int]]) -> float:
+        return sum(self._group_cost(group) for group in groups)
+    
+    def total_cost(self) -> float:
+        """Full cost of the current state (used for reporting, not per move)"""
+        groups = set()
+        for session in self.sessions:
+            if session.entry is not None:
+                groups.update(self._groups(session.course, self.grid.day_index[session.entry.day]))
+        return self._cost_of(groups) + self.weights['unplaced'] * len(self.unplaced)
+    
+    def breakdown(self) -> Dict[str, int]:
+        """Constraint counts of the current state"""
+        counts = self.generator.validator.count_violations(self.generator.timetable,
+                                                           self.generator.professors)
+        counts['unplaced'] = len(self.unplaced)
+        return counts
+    
+    # Moves
+    
+    def _free_for(self, session: _Session, day: str, slot: str):
+        """Room for a session at (day, slot) if its batch, professor and students are free, else None"""
+        gen = self.generator
+        bit = self.grid.bits[day][slot]
+        course = session.course
+        if gen.batch_calendar.masks.get(course.batch_id, 0) & bit:
+            return None
+        if gen.professors[course.instructor_id].assigned_mask & bit:
+            return None
+        if gen.student_conflicts is not None and gen.student_conflicts.blocked_mask(course.course_code) & bit:
+            return None
+        return gen.room_index.find(session.room_type, day, slot, session.batch_size)
+    
+    def _keeps_lab(self, session: _Session, day: str) -> bool:
+        """Moving a lecture to day still leaves a lecture on its lab block's day or the day before (R10)"""
+        course = session.course
+        if session.index >= course.L or not course.P:
+            return True
+        gen = self.generator
+        lab = gen.entries_by_slot.get(f"{course.course_code}-{course.class_sessions()}")
+        if lab is None:
+            return True
+        d = self.grid.day_index[lab.day]
+        aligned = {lab.day, self.grid.days[d - 1]} if d > 0 else {lab.day}
+        if day in aligned:
+            return True
+        for index in range(course.L):
+            entry = gen.entries_by_slot.get(f"{course.course_code}-{index}")
+            if index != session.index and entry is not None and entry.day in aligned:
+                return True
+        return False
+    
+    def _move(self, session: _Session, day: str, slot: str, room):
+        """Relocate a placed session, keeping its entry in sync"""
+        entry = session.entry
+        gen = self.generator
+        gen._vacate(session.course, entry.day, entry.time_slot, gen.rooms_by_id[entry.room_id])
+        gen._occupy(session.course, day, slot, room)
+        entry.day, entry.time_slot, entry.room_id = day, slot, room.room_id
+    
+    def _try_relocate(self, temperature: float) -> Optional[float]:
+        """Move a random placed session to a random cell; returns the accepted delta"""
+        session = self.rng.choice(self.sessions)
+        if session.entry is None:
+            return self._try_place(session, temperature)
+        day, slot, d_new = self.rng.choice(self.cells)
+        entry = session.entry
+        if entry.day == day and entry.time_slot == slot:
+            return None
+        if entry.day != day and not self._keeps_lab(session, day):
+            return None
+        room = self._free_for(session, day, slot)
+        if room is None:
+            return None
+        
+        d_old = self.grid.day_index[entry.day]
+        groups = set(self._groups(session.course, d_old) + self._groups(session.course, d_new))
+        before = self._cost_of(groups)
+        old = (entry.day, entry.time_slot, self.generator.rooms_by_id[entry.room_id])
+        self._remember(session)
+        self._move(session, day, slot, room)
+        delta = self._cost_of(groups) - before
+        if self._accept(delta, temperature):
+            return delta
+        self._move(session, *old)
+        return None
+    
+    def _try_place(self, session: _Session, temperature: float) -> Optional[float]:
+        """Place an unplaced session at a random cell"""
+        day, slot, d = self.rng.choice(self.cells)
+        room = self._free_for(session, day, slot)
+        if room is None:
+            return None
+        
+        groups = set(self._groups(session.course, d))
+        before = self._cost_of(groups)
+        gen = self.generator
+        gen._occupy(session.course, day, slot, room)
+        delta = self._cost_of(groups) - before - self.weights['unplaced']
+        gen._vacate(session.course, day, slot, room)
+        if not self._accept(delta, temperature):
+            return None
+        
+        self._remember(session)
+        session.entry = gen._place(session.course, session.index, day, slot, room)
+        self.unplaced.remove(session)
+        if (session.course, session.index) in gen.unplaced:
+            gen.unplaced.remove((session.course, session.index))
+        return delta
+    
+    def _try_swap(self, temperature: float) -> Optional[float]:
+        """Swap the cells of two placed sessions of the same batch"""
+        a = self.rng.choice(self.sessions)
+        if a.entry is None:
+            return None
+        b = self.rng.choice(self.by_batch[a.course.batch_id])
+        if b is a or b.entry is None or (a.entry.day == b.entry.day and a.entry.time_slot == b.entry.time_slot):
+            return None
+        if not (self._keeps_lab(a, b.entry.day) and self._keeps_lab(b, a.entry.day)):
+            return None
+        
+        gen = self.generator
+        ea, eb = a.entry, b.entry
+        da, db = self.grid.day_index[ea.day], self.grid.day_index[eb.day]
+        groups = set(self._groups(a.course, da) + self._groups(a.course, db) +
+                     self._groups(b.course, da) + self._groups(b.course, db))
+        before = self._cost_of(groups)
+        old_a = (ea.day, ea.time_slot, gen.rooms_by_id[ea.room_id])
+        old_b = (eb.day, eb.time_slot, gen.rooms_by_id[eb.room_id])
+        self._remember(a)
+        self._remember(b)
+        
+        gen._vacate(a.course, *old_a)
+        gen._vacate(b.course, *old_b)
+        room_a = self._free_for(a, old_b[0], old_b[1])
+        if room_a is not None:
+            gen._occupy(a.course, old_b[0], old_b[1], room_a)
+            room_b = self._free_for(b, old_a[0], old_a[1])
+            if room_b is not None:
+                gen._occupy(b.course, old_a[0], old_a[1], room_b)
+                ea.day, ea.time_slot, ea.room_id = old_b[0], old_b[1], room_a.room_id
+                eb.day, eb.time_slot, eb.room_id = old_a[0], old_a[1], room_b.room_id
+                delta = self._cost_of(groups) - before
+                if self._accept(delta, temperature):
+                    return delta
+                gen._vacate(b.course, old_a[0], old_a[1], room_b)
+            gen._vacate(a.course, old_b[0], old_b[1], room_a)
+        
+        gen._occupy(a.course, *old_a)
+        gen._occupy(b.course, *old_b)
+        ea.day, ea.time_slot, ea.room_id = old_a[0], old_a[1], old_a[2].room_id
+        eb.day, eb.time_slot, eb.room_id = old_b[0], old_b[1], old_b[2].room_id
+        return None
+    
+    def _accept(self, delta: float, temperature: float) -> bool:
+        if delta <= 0:
+            return True
+        return temperature > 0 and self.rng.random() < math.exp(-delta / temperature)
+    
+    # Best-state bookkeeping
+    
+    def _remember(self, session: _Session):
+        """Record a session's position at the last best state before it first changes"""
+        if session not in self._changed:
+            e = session.entry
+            self._changed[session] = (e.day, e.time_slot, e.room_id) if e is not None else None
+    
+    def _restore_best(self):
+        """Return every session changed since the best state to its recorded position"""
+        gen = self.generator
+        for session in self._changed:
+            e = session.entry
+            if e is not None:
+                gen._vacate(session.course, e.day, e.time_slot, gen.rooms_by_id[e.room_id])
+        
+        dropped = []
+        for session, position in self._changed.items():
+            if position is None:
+                if session.entry is not None:
+                    # Placed after the best state: unplace it again
+                    dropped.append(session.entry)
+                    session.entry = None
+                    self.unplaced.append(session)
+                    gen.unplaced.append((session.course, session.index))
+                continue
+            day, slot, room_id = position
+            session.entry.day, session.entry.time_slot, session.entry.room_id = day, slot, room_id
+            gen._occupy(session.course, day, slot, gen.rooms_by_id[room_id])
+        if dropped:
+            gen._drop_entries(dropped)
+        self._changed.clear()
+    
+    def optimize(self) -> OptimizationStats:
+        """Run the annealing loop until the time or iteration budget is spent
+
+        For a fixed seed and max_iterations the result is deterministic; a time
+        limit can only cut the same sequence of moves short.
+        """
+        stats = OptimizationStats(seed=self.seed)
+        stats.initial_breakdown = self.breakdown()
+        current = best = stats.initial_cost = self.total_cost()
+        stats.history.append((0, best))
+        self._changed.clear()
+        
+        if not self.sessions or (not self.time_limit and self.max_iterations is None):
+            stats.best_cost = stats.final_cost = current
+            stats.final_breakdown = stats.initial_breakdown
+            return stats
+        
+        self.logger.info(f"Optimizing timetable (seed={self.seed}, initial cost={current})...")
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit else None
+        temperature = self.initial_temperature
+        
+        while self.max_iterations is None or stats.iterations < self.max_iterations:
+            # Checking the clock every 256 moves keeps its cost off the hot path
+            if deadline is not None and not stats.iterations & 255 and time.perf_counter() >= deadline:
+                break
+            stats.iterations += 1
+            
+            roll = self.rng.random()
+            if self.unplaced and roll < 0.2:
+                delta = self._try_place(self.rng.choice(self.unplaced), temperature)
+            elif roll < 0.6:
+                delta = self._try_swap(temperature)
+            else:
+                delta = self._try_relocate(temperature)
+            temperature *= self.cooling
+            
+            if delta is None:
+                stats.infeasible += 1
+                continue
+            stats.accepted += 1
+            current += delta
+            if current <= best:
+                if current < best:
+                    stats.improved += 1
+                    stats.history.append((stats.iterations, current))
+                best = current
+                self._changed.clear()
+                if best <= 0:
+                    break  # nothing left to improve
+        
+        if current > best:
+            self._restore_best()
+            current = best
+        
+        stats.elapsed = time.perf_counter() - start
+        stats.best_cost = best
+        stats.final_cost = current
+        stats.final_breakdown = self.breakdown()
+        self.logger.info(f"Optimization finished: cost {stats.initial_cost} -> {stats.final_cost} "
+                         f"in {stats.iterations} iterations ({stats.elapsed:.2f}s)")
+        return stats
\ No newline at end of file
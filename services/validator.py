@@ -1,8 +1,14 @@
-from typing import List, Dict
+from collections import Counter
+from typing import List, Dict, Tuple, Set
+from models.audit import AuditReport, Violation
 from models.course import Course
 from models.professor import Professor
 from models.room import Room
+from models.timetable import TimetableEntry
+from models.enrollment import EnrollmentStore
+from models.intervals import MINUTES_PER_DAY, slot_bounds, format_minutes
 from utils.logger import Logger
+from config import Config
 
 class Validator:
     """Service for validating scheduling constraints"""
@@ -29,8 +35,362 @@ class Validator:
             return True
         
         hours_between = current_slot_index - last_slot_index
-        return hours_between >= 3
+        return hours_between >= Config.MIN_BREAK_HOURS
     
     def check_room_capacity(self, room: Room, required_capacity: int) -> bool:
         """Check if room has sufficient capacity"""
-        return room.capacity >= required_capacity
\ No newline at end of file
+        return room.capacity >= required_capacity
+    
+    def count_violations(self, timetable: List[TimetableEntry], 
+                         professors: Dict[str, Professor] = None) -> Dict[str, int]:
+        """Count R4 (professor break) and R5 (one session per course per day) violations
+        
+        A lab block is one session: it counts from its first hour for R4 and
+        not at all for R5.
+        """
+        professors = professors or {}
+        slot_index = {slot: i for i, slot in enumerate(Config.TIME_SLOTS)}
+        
+        prof_days: Dict[Tuple[str, str], List[int]] = {}
+        course_days: Dict[Tuple[str, str], int] = {}
+        lab_starts: Dict[Tuple[str, str, str], int] = {}
+        for entry in timetable:
+            slot = slot_index[entry.time_slot]
+            if entry.session_type == 'Lab':
+                key = (entry.instructor_id, entry.day, entry.course_code)
+                lab_starts[key] = min(slot, lab_starts.get(key, slot))
+                continue
+            prof_days.setdefault((entry.instructor_id, entry.day), []).append(slot)
+            key = (entry.course_code, entry.day)
+            course_days[key] = course_days.get(key, 0) + 1
+        for (prof_id, day, _), slot in lab_starts.items():
+            prof_days.setdefault((prof_id, day), []).append(slot)
+        
+        professor_break = 0
+        for (prof_id, day), slots in prof_days.items():
+            slots.sort()
+            for last, current in zip(slots, slots[1:]):
+                if not self.check_professor_break(professors.get(prof_id), day, current, last):
+                    professor_break += 1
+        
+        daily_limit = sum(max(0, count - Config.MAX_SESSIONS_PER_DAY) for count in course_days.values())
+        
+        return {'professor_break': professor_break, 'daily_limit': daily_limit}
+    
+    def audit(self, timetable: List[TimetableEntry], rooms: List[Room] = None,
+              enrollments: Dict[str, List[str]] = None) -> AuditReport:
+        """Audit a whole timetable for clashes, R4, R5, lunch-slot use, room capacity and student clashes"""
+        days, slots = Config.WORKING_DAYS, Config.TIME_SLOTS
+        n_days, n_slots = len(days), len(slots)
+        report = AuditReport(entries_checked=len(timetable))
+        violations = report.violations
+        
+        # Flatten the timetable into int columns: cell = day * slots + slot, -1 if unknown
+        cell_of = {(day, slot): d * n_slots + s
+                   for d, day in enumerate(days) for s, slot in enumerate(slots)}
+        cells = [cell_of.get((e.day, e.time_slot), -1) for e in timetable]
+        # Interval-backend entries sit off the grid; they are checked on minute bounds instead
+        bounds = self._minute_bounds(timetable) if -1 in cells else {}
+        if -1 in cells:
+            for i, cell in enumerate(cells):
+                if cell < 0 and i not in bounds:
+                    entry = timetable[i]
+                    violations.append(Violation('invalid_slot', entry.course_code, entry.day,
+                                                entry.time_slot, [entry.slot_id],
+                                                "unknown day or time slot"))
+        on_intervals = any(cells[i] < 0 for i in bounds)
+        if on_intervals:
+            self._audit_intervals(timetable, bounds, enrollments, violations)
+        else:
+            self._audit_grid(timetable, cells, violations)
+        
+        # R5: sessions per course-day; lab hours do not count
+        course_col, _ = self._intern([e.course_code for e in timetable])
+        day_of = [cell // n_slots if cell >= 0 else bounds[i][0] if i in bounds else -1
+                  for i, cell in enumerate(cells)]
+        course_days = [c * n_days + day if day >= 0 and timetable[i].session_type != 'Lab' else -1 - i
+                       for i, (c, day) in enumerate(zip(course_col, day_of))]
+        over = {key for key, count in Counter(course_days).items()
+                if count > Config.MAX_SESSIONS_PER_DAY}
+        if over:
+            for key, indices in self._group_indices(course_days, over).items():
+                entry = timetable[indices[0]]
+                violations.append(Violation(
+                    'daily_limit', entry.course_code, entry.day, '',
+                    [timetable[i].slot_id for i in indices],
+                    f"{len(indices)} sessions, maximum {Config.MAX_SESSIONS_PER_DAY}"))
+        
+        # R8: nothing in the lunch slot (the interval check covers off-grid sessions)
+        if Config.LUNCH_SLOT in slots and not on_intervals:
+            lunch = slots.index(Config.LUNCH_SLOT)
+            for i, cell in enumerate(cells):
+                if cell >= 0 and cell % n_slots == lunch:
+                    entry = timetable[i]
+                    violations.append(Violation('lunch_slot', entry.course_code, entry.day,
+                                                entry.time_slot, [entry.slot_id],
+                                                "session in lunch slot"))
+        
+        if rooms is not None and enrollments is not None:
+            self._audit_capacity(timetable, rooms, enrollments, violations)
+        if enrollments and not on_intervals:
+            self._audit_student_clashes(timetable, enrollments, violations)
+        
+        self.logger.info(f"Audited {len(timetable)} entries: {len(violations)} violations")
+        return report
+    
+    def _audit_grid(self, timetable: List[TimetableEntry], cells: List[int], violations: List[Violation]):
+        """Clashes and R4 on the slot grid (cells from audit, -1 if off the grid)"""
+        days, slots = Config.WORKING_DAYS, Config.TIME_SLOTS
+        n_slots = len(slots)
+        size = len(days) * n_slots
+        
+        # Flat (resource, day, slot) keys; self-study sessions carry no room
+        room_col, room_names = self._intern([e.room_id for e in timetable])
+        prof_col, prof_names = self._intern([e.instructor_id for e in timetable])
+        batch_col, batch_names = self._intern([e.batch_id for e in timetable])
+        no_room = room_names.index('') if '' in room_names else -1
+        prof_keys = self._flat_keys(prof_col, cells, size)
+        
+        self._audit_clashes(timetable, violations, 'room_clash',
+                            self._flat_keys(room_col, cells, size, skip=no_room), room_names, size)
+        self._audit_clashes(timetable, violations, 'professor_clash', prof_keys, prof_names, size)
+        self._audit_clashes(timetable, violations, 'batch_clash',
+                            self._flat_keys(batch_col, cells, size), batch_names, size)
+        
+        # A lab block is one session: only its first hour counts for R4
+        labs = {i for i, e in enumerate(timetable) if e.session_type == 'Lab' and cells[i] >= 0}
+        break_keys = prof_keys
+        if labs:
+            lab_starts: Dict[Tuple[str, str], int] = {}
+            for i in sorted(labs, key=cells.__getitem__):
+                lab_starts.setdefault((timetable[i].course_code, timetable[i].day), i)
+            starts = set(lab_starts.values())
+            break_keys = [-1 - i if i in labs and i not in starts else key
+                          for i, key in enumerate(prof_keys)]
+        
+        # R4: neighbouring busy slots of a professor-day share key // n_slots
+        busy = sorted(set(k for k in break_keys if k >= 0))
+        short = [(a, b) for a, b in zip(busy, busy[1:])
+                 if b - a < Config.MIN_BREAK_HOURS and a // n_slots == b // n_slots]
+        if short:
+            first = self._first_index(break_keys, {k for pair in short for k in pair})
+            for a, b in short:
+                p, cell = divmod(b, size)
+                day, s = divmod(cell, n_slots)
+                violations.append(Violation(
+                    'professor_break', prof_names[p], days[day], slots[s],
+                    [timetable[first[a]].slot_id, timetable[first[b]].slot_id],
+                    f"{b - a}h after {slots[a % n_slots]}, minimum {Config.MIN_BREAK_HOURS}h"))
+    
+    @staticmethod
+    def _minute_bounds(timetable: List[TimetableEntry]) -> Dict[int, Tuple[int, int, int]]:
+        """Entry index -> (day index, start, end minute) for entries on a working day with an HH:MM-HH:MM time"""
+        day_index = {day: d for d, day in enumerate(Config.WORKING_DAYS)}
+        bounds = {}
+        for i, entry in enumerate(timetable):
+            d = day_index.get(entry.day)
+            if d is None:
+                continue
+            try:
+                start, end = slot_bounds(entry.time_slot)
+            except ValueError:
+                continue
+            if 0 <= start < end <= MINUTES_PER_DAY:
+                bounds[i] = (d, start, end)
+        return bounds
+    
+    def _audit_intervals(self, timetable: List[TimetableEntry], bounds: Dict[int, Tuple[int, int, int]],
+                         enrollments: Dict[str, List[str]], violations: List[Violation]):
+        """Clashes, R4, R6, R8 and student clashes on minute bounds, for interval-backend timetables
+        
+        Mirrors IntervalPlacer: every room, professor and batch keeps
+        MIN_BREAK_MINUTES between sessions (R6) and a professor's sessions start
+        MIN_BREAK_HOURS apart (R4). A lab block's back-to-back hours are one session.
+        """
+        # (week start, week end, entry indices) per session
+        sessions: List[Tuple[int, int, List[int]]] = []
+        lab_hours: Dict[Tuple[str, int], List[Tuple[int, int, int]]] = {}
+        for i, (d, start, end) in bounds.items():
+            start, end = d * MINUTES_PER_DAY + start, d * MINUTES_PER_DAY + end
+            if timetable[i].session_type == 'Lab':
+                lab_hours.setdefault((timetable[i].course_code, d), []).append((start, end, i))
+            else:
+                sessions.append((start, end, [i]))
+        for hours in lab_hours.values():
+            hours.sort()
+            start, end, indices = hours[0][0], hours[0][1], [hours[0][2]]
+            for next_start, next_end, i in hours[1:]:
+                if next_start > end:
+                    sessions.append((start, end, indices))
+                    start, indices = next_start, []
+                end = max(end, next_end)
+                indices.append(i)
+            sessions.append((start, end, indices))
+        sessions.sort()
+        describe = self._describe_session
+        
+        def slot_ids(*pair: Tuple[int, int, List[int]]) -> List[str]:
+            return [timetable[i].slot_id for _, _, indices in pair for i in indices]
+        
+        spacing = Config.MIN_BREAK_HOURS * 60
+        for field, rule in (('room_id', 'room_clash'), ('instructor_id', 'professor_clash'),
+                            ('batch_id', 'batch_clash')):
+            by_resource: Dict[str, List[Tuple[int, int, List[int]]]] = {}
+            for session in sessions:
+                resource = getattr(timetable[session[2][0]], field)
+                if resource:
+                    by_resource.setdefault(resource, []).append(session)
+            for resource, booked in by_resource.items():
+                latest = booked[0]  # the session ending last so far
+                for previous, session in zip(booked, booked[1:]):
+                    if session[0] // MINUTES_PER_DAY != previous[0] // MINUTES_PER_DAY:
+                        latest = session
+                        continue
+                    day, time_slot = describe(session)
+                    if session[0] < latest[1]:
+                        violations.append(Violation(rule, resource, day, time_slot, slot_ids(latest, session),
+                                                    "overlapping sessions"))
+                    elif session[0] - latest[1] < Config.MIN_BREAK_MINUTES:
+                        violations.append(Violation(
+                            'short_break', resource, day, time_slot, slot_ids(latest, session),
+                            f"{session[0] - latest[1]} min break, minimum {Config.MIN_BREAK_MINUTES} min"))
+                    if rule == 'professor_clash' and session[0] - previous[0] < spacing:
+                        violations.append(Violation(
+                            'professor_break', resource, day, time_slot, slot_ids(previous, session),
+                            f"{session[0] - previous[0]} min after {format_minutes(previous[0])}, "
+                            f"minimum {Config.MIN_BREAK_HOURS}h"))
+                    if session[1] > latest[1]:
+                        latest = session
+        
+        # R8: nothing overlapping the lunch slot
+        if Config.LUNCH_SLOT:
+            lunch_start, lunch_end = slot_bounds(Config.LUNCH_SLOT)
+            for session in sessions:
+                offset = session[0] - session[0] % MINUTES_PER_DAY
+                if session[0] < offset + lunch_end and offset + lunch_start < session[1]:
+                    day, time_slot = describe(session)
+                    violations.append(Violation('lunch_slot', timetable[session[2][0]].course_code, day,
+                                                time_slot, slot_ids(session), "session in lunch slot"))
+        
+        if enrollments:
+            self._audit_interval_student_clashes(timetable, sessions, enrollments, violations)
+    
+    @staticmethod
+    def _describe_session(session: Tuple[int, int, List[int]]) -> Tuple[str, str]:
+        """(day, 'HH:MM-HH:MM') of a session in week minutes"""
+        start, end, _ = session
+        return Config.WORKING_DAYS[start // MINUTES_PER_DAY], f"{format_minutes(start)}-{format_minutes(end)}"
+    
+    def _audit_interval_student_clashes(self, timetable: List[TimetableEntry],
+                                        sessions: List[Tuple[int, int, List[int]]],
+                                        enrollments: Dict[str, List[str]], violations: List[Violation]):
+        """Overlapping sessions of different batches whose courses share students"""
+        from services.student_conflicts import StudentConflicts
+        codes = list(dict.fromkeys(e.course_code for e in timetable))
+        conflicts = StudentConflicts(codes, enrollments)
+        adjacency, index = conflicts.graph.adjacency, conflicts.index
+        # Sweep in start order, keeping the sessions still running
+        running: List[Tuple[int, int, List[int]]] = []
+        for session in sessions:
+            running = [other for other in running if other[1] > session[0]]
+            a = timetable[session[2][0]]
+            i = index.get(a.course_code)
+            if i is not None:
+                for other in running:
+                    b = timetable[other[2][0]]
+                    j = index.get(b.course_code)
+                    if j is None or b.batch_id == a.batch_id or not (adjacency[i] >> j) & 1:
+                        continue
+                    day, time_slot = self._describe_session(session)
+                    violations.append(Violation(
+                        'student_clash', f"{b.course_code}/{a.course_code}", day, time_slot,
+                        [timetable[k].slot_id for k in other[2] + session[2]],
+                        f"{conflicts.shared_students(a.course_code, b.course_code)} student(s) enrolled in both"))
+            running.append(session)
+    
+    def audit_csv(self, filepath: str, rooms: List[Room] = None,
+                  enrollments: Dict[str, List[str]] = None) -> AuditReport:
+        """Audit a timetable CSV file"""
+        from services.data_loader import DataLoader
+        return self.audit(DataLoader().load_timetable(filepath), rooms, enrollments)
+    
+    def export_audit_to_csv(self, report: AuditReport, filepath: str):
+        """Export audit violations to CSV"""
+        from utils.csv_handler import CSVHandler
+        csv_handler = CSVHandler()
+        
+        csv_handler.write_rows(filepath, Violation.FIELDS, (v.to_row() for v in report.violations))
+    
+    @staticmethod
+    def _intern(values: List[str]) -> Tuple[List[int], List[str]]:
+        """Map values to dense ints; returns (column, names)"""
+        ids = {value: i for i, value in enumerate(dict.fromkeys(values))}
+        return [ids[value] for value in values], list(ids)
+    
+    @staticmethod
+    def _flat_keys(column: List[int], cells: List[int], size: int, skip: int = -1) -> List[int]:
+        """resource * size + cell per entry; skipped or unplaceable entries get a unique negative key"""
+        return [r * size + cell if cell >= 0 and r != skip else -1 - i
+                for i, (r, cell) in enumerate(zip(column, cells))]
+    
+    @staticmethod
+    def _first_index(keys: List[int], wanted: Set[int]) -> Dict[int, int]:
+        """Index of the first entry carrying each wanted key"""
+        first: Dict[int, int] = {}
+        for i, key in enumerate(keys):
+            if key in wanted and key not in first:
+                first[key] = i
+        return first
+    
+    @staticmethod
+    def _group_indices(keys: List[int], wanted: Set[int]) -> Dict[int, List[int]]:
+        """Entry indices for each wanted key, in timetable order"""
+        groups: Dict[int, List[int]] = {key: [] for key in wanted}
+        for i, key in enumerate(keys):
+            if key in wanted:
+                groups[key].append(i)
+        return groups
+    
+    def _audit_clashes(self, timetable: List[TimetableEntry], violations: List[Violation],
+                       rule: str, keys: List[int], names: List[str], size: int):
+        """Report entries sharing a (resource, day, slot) key"""
+        if len(set(keys)) == len(keys):
+            return
+        clashing = {key for key, count in Counter(keys).items() if count > 1}
+        for key, indices in self._group_indices(keys, clashing).items():
+            entry = timetable[indices[0]]
+            violations.append(Violation(rule, names[key // size], entry.day, entry.time_slot,
+                                        [timetable[i].slot_id for i in indices],
+                                        f"{len(indices)} sessions at once"))
+    
+    @staticmethod
+    def _audit_student_clashes(timetable: List[TimetableEntry], enrollments: Dict[str, List[str]],
+                               violations: List[Violation]):
+        """Sessions of different batches in one slot that share enrolled students"""
+        from services.student_conflicts import StudentConflicts
+        codes = list(dict.fromkeys(e.course_code for e in timetable))
+        for a, b, shared in StudentConflicts(codes, enrollments).clashes(timetable):
+            violations.append(Violation('student_clash', f"{a.course_code}/{b.course_code}", a.day,
+                                        a.time_slot, [a.slot_id, b.slot_id],
+                                        f"{shared} student(s) enrolled in both"))
+    
+    @staticmethod
+    def _audit_capacity(timetable: List[TimetableEntry], rooms: List[Room],
+                        enrollments: Dict[str, List[str]], violations: List[Violation]):
+        """Report sessions whose room has fewer seats than the course has students"""
+        capacity = {room.room_id: room.capacity for room in rooms}
+        sizes: Dict[str, int] = {}
+        for entry in timetable:
+            seats = capacity.get(entry.room_id)
+            if seats is None:
+                continue
+            students = sizes.get(entry.course_code)
+            if students is None:
+                if isinstance(enrollments, EnrollmentStore):
+                    students = enrollments.course_size(entry.course_code)
+                else:
+                    students = len(enrollments.get(entry.course_code, []))
+                sizes[entry.course_code] = students
+            if students > seats:
+                violations.append(Violation('capacity', entry.room_id, entry.day, entry.time_slot,
+                                            [entry.slot_id], f"{students} students, {seats} seats"))
\ No newline at end of file
@@ -0,0 +1,44 @@
+from typing import List, Dict, Tuple, Any, Iterable
+from models.course import Course
+from models.professor import Professor
+from models.room import Room
+from models.timetable import TimetableEntry
+
+# Parsed inputs installed once per worker process by init_worker
+shared: Dict[str, Any] = {}
+
+def init_worker(state: Dict[str, Any]):
+    """Keep the parsed inputs in the worker so tasks only carry their own arguments"""
+    import logging
+    logging.disable(logging.INFO)
+    shared.update(state)
+
+def fresh_resources() -> Tuple[Dict[str, Professor], List[Room]]:
+    """Copies of the shared professors and rooms with empty calendars"""
+    professors = {pid: Professor(p.prof_id, p.name, p.department, p.max_hours_per_week)
+                  for pid, p in shared['professors'].items()}
+    rooms = [Room(r.room_id, r.capacity, r.room_type, r.accessible) for r in shared['rooms']]
+    return professors, rooms
+
+def timetable_rows(timetable: Iterable[TimetableEntry]) -> List[Tuple[str, str, str, str, str, str]]:
+    """Compact rows a worker sends back instead of TimetableEntry objects"""
+    return [(e.slot_id, e.day, e.time_slot, e.course_code, e.room_id, e.session_type)
+            for e in timetable]
+
+def entries_from_rows(courses: Dict[str, Course], rows) -> List[TimetableEntry]:
+    """Rebuild timetable entries from compact worker rows"""
+    entries = []
+    for slot_id, day, time_slot, course_code, room_id, session_type in rows:
+        course = courses[course_code]
+        entries.append(TimetableEntry(
+            slot_id=slot_id,
+            day=day,
+            time_slot=time_slot,
+            course_code=course_code,
+            course_name=course.course_name,
+            room_id=room_id,
+            instructor_id=course.instructor_id,
+            batch_id=course.batch_id,
+            session_type=session_type
+        ))
+    return entries
\ No newline at end of file
@@ -1,6 +1,19 @@
 import csv
 import os
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Tuple, Iterator, Iterable, Callable, Any, Optional
+
+# (header name, converter, default) - a default of REQUIRED makes the column mandatory
+ColumnSpec = Tuple[str, Callable[[str], Any], Any]
+REQUIRED = object()
+
+def _parse_range(filepath: str, start: int, end: int,
+                 columns: List[Tuple[Optional[int], Callable, Any]]) -> List[list]:
+    """Parse the rows whose first byte lies in [start, end) into typed column lists"""
+    # Column-wise results pickle back to the parent far cheaper than per-row tuples
+    rows = list(CSVHandler._iter_range(filepath, start, end, columns))
+    return [list(column) for column in zip(*rows)] if rows else [[] for _ in columns]
 
 class CSVHandler:
     """Utility class for CSV operations"""
@@ -35,4 +48,140 @@ class CSVHandler:
             writer.writeheader()
             writer.writerows(data)
         
-        print(f"Successfully wrote {len(data)} records to {filepath}")
\ No newline at end of file
+        print(f"Successfully wrote {len(data)} records to {filepath}")
+    
+    @staticmethod
+    def write_rows(filepath: str, fieldnames: Iterable[str], rows: Iterable[tuple]) -> int:
+        """Stream tuples to a CSV file without building dictionaries"""
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        
+        count = 0
+        with open(filepath, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(fieldnames)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        
+        if count:
+            print(f"Successfully wrote {count} records to {filepath}")
+        else:
+            print(f"Warning: No data to write to {filepath}")
+        return count
+    
+    @staticmethod
+    def read_header(filepath: str) -> List[str]:
+        """Read the header row of a CSV file"""
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+        
+        with open(filepath, 'r', encoding='utf-8', newline='') as file:
+            return next(csv.reader(file), [])
+    
+    @staticmethod
+    def resolve_columns(header: List[str], spec: List[ColumnSpec]) -> List[Tuple[Optional[int], Callable, Any]]:
+        """Map a column spec onto header positions"""
+        positions = {name: i for i, name in enumerate(header)}
+        columns = []
+        for name, convert, default in spec:
+            if name not in positions and default is REQUIRED:
+                raise KeyError(name)
+            columns.append((positions.get(name), convert, default))
+        return columns
+    
+    @staticmethod
+    def iter_records(filepath: str, spec: List[ColumnSpec]) -> Iterator[tuple]:
+        """Stream typed tuples from a CSV file, one per data row"""
+        columns = CSVHandler.resolve_columns(CSVHandler.read_header(filepath), spec)
+        
+        with open(filepath, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            yield from CSVHandler._convert_rows(reader, columns, filepath)
+    
+    @staticmethod
+    def iter_records_parallel(filepath: str, spec: List[ColumnSpec], workers: int,
+                              chunk_bytes: int = 8 * 1024 * 1024) -> Iterator[tuple]:
+        """Stream typed tuples parsed from byte ranges in a process pool (rows must not span lines)"""
+        columns = CSVHandler.resolve_columns(CSVHandler.read_header(filepath), spec)
+        size = os.path.getsize(filepath)
+        ranges = [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_parse_range, filepath, start, end, columns)
+                       for start, end in ranges]
+            for future in futures:
+                yield from zip(*future.result())
+    
+    @staticmethod
+    def _iter_range(filepath: str, start: int, end: int,
+                    columns: List[Tuple[Optional[int], Callable, Any]]) -> Iterator[tuple]:
+        """Yield typed tuples for rows starting inside [start, end) of the file"""
+        with open(filepath, 'rb') as file:
+            if start == 0:
+                file.readline()  # header
+            else:
+                # Finish the line straddling the boundary; it belongs to the previous range
+                file.seek(start - 1)
+                file.readline()
+            
+            offset = [start]
+            
+            def lines():
+                while file.tell() < end:
+                    offset[0] = file.tell()
+                    line = file.readline()
+                    if not line:
+                        return
+                    yield line.decode('utf-8')
+            
+            yield from CSVHandler._convert_rows(csv.reader(lines()), columns, filepath,
+                                                lambda: CSVHandler._line_at(filepath, offset[0]))
+    
+    @staticmethod
+    def _line_at(filepath: str, offset: int) -> int:
+        """1-based line number of the line starting at a byte offset"""
+        with open(filepath, 'rb') as file:
+            return file.read(offset).count(b'\n') + 1
+    
+    @staticmethod
+    def _convert_rows(reader, columns: List[Tuple[Optional[int], Callable, Any]], filepath: str,
+                      line_of: Callable[[], int] = None) -> Iterator[tuple]:
+        """Convert raw csv rows into typed tuples; a row too short for a required column raises ValueError"""
+        line_of = line_of or (lambda: reader.line_num)
+        positions = [pos for pos, _, _ in columns]
+        required = max((pos + 1 for pos, _, default in columns
+                        if pos is not None and default is REQUIRED), default=0)
+        if len(columns) > 1 and None not in positions and all(convert is str for _, convert, _ in columns):
+            # Text-only columns: slice straight out of the row
+            getter = itemgetter(*positions)
+            width = max(positions) + 1
+            for row in reader:
+                if len(row) >= width:
+                    yield getter(row)
+                elif row:
+                    CSVHandler._check_width(row, columns, required, filepath, line_of)
+                    yield tuple(row[pos] if pos < len(row) else default for pos, _, default in columns)
+            return
+        
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < required:
+                CSVHandler._check_width(row, columns, required, filepath, line_of)
+            yield tuple(
+                default if pos is None or pos >= len(row) else convert(row[pos])
+                for pos, convert, default in columns
+            )
+    
+    @staticmethod
+    def _check_width(row: List[str], columns: List[Tuple[Optional[int], Callable, Any]], required: int,
+                     filepath: str, line_of: Callable[[], int]):
+        """Raise ValueError naming the first required column a short row is missing"""
+        if len(row) >= required:
+            return
+        pos = min(pos for pos, _, default in columns
+                  if pos is not None and default is REQUIRED and pos >= len(row))
+        header = CSVHandler.read_header(filepath)
+        raise ValueError(f"{filepath}, line {line_of()}: missing column '{header[pos]}' "
+                         f"(row has {len(row)} of {len(header)} fields)")
\ No newline at end of file
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import fields
+from typing import Any, Callable, Dict, Optional
+from utils.logger import Logger
+
+class InputCache:
+    """Content-hashed cache of parsed input files
+    
+    Each source file maps to an entry named by the SHA-256 of its bytes, the
+    entry kind and VERSION. A matching (size, mtime) skips hashing entirely;
+    otherwise the file is re-hashed and a changed digest makes the old entry
+    stale, so edited inputs are always re-parsed.
+    """
+    
+    VERSION = 1  # bump when the parsed models change shape
+    INDEX = 'index.json'
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.logger = Logger("InputCache")
+        self._index: Optional[Dict[str, Dict]] = None
+    
+    @property
+    def index(self) -> Dict[str, Dict]:
+        """'<source path>|<kind>' -> {size, mtime_ns, sha256} of the last parse"""
+        if self._index is None:
+            try:
+                with open(os.path.join(self.cache_dir, self.INDEX), 'r', encoding='utf-8') as file:
+                    self._index = json.load(file)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+    
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, self.INDEX)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(self.index, file, indent=1)
+        os.replace(path + '.tmp', path)
+    
+    @staticmethod
+    def file_digest(filepath: str) -> str:
+        """SHA-256 of a file's contents"""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _key(filepath: str, kind: str) -> str:
+        """Index key: one source file may be cached as several kinds"""
+        return f"{os.path.abspath(filepath)}|{kind}"
+    
+    def _digest(self, filepath: str, stat: os.stat_result, kind: str) -> str:
+        """Digest of a source file, skipping the hash when size and mtime are unchanged"""
+        known = self.index.get(self._key(filepath, kind))
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        return self.file_digest(filepath)
+    
+    def entry_path(self, digest: str, kind: str) -> str:
+        """Cache file for a source digest and entry kind"""
+        return os.path.join(self.cache_dir, f"{kind}-v{self.VERSION}-{digest[:32]}.bin")
+    
+    def load(self, filepath: str, kind: str, parse: Callable[[], Any],
+             dump: Callable[[Any, str], None] = None,
+             restore: Callable[[str], Any] = None) -> Any:
+        """Return the parsed contents of filepath, from the cache when the file is unchanged
+        
+        parse() builds the value from the source; dump(value, path) and
+        restore(path) default to pickle.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"File not found: {filepath}")
+        dump = dump or self._pickle_dump
+        restore = restore or self._pickle_load
+        
+        stat = os.stat(filepath)
+        digest = self._digest(filepath, stat, kind)
+        entry = self.entry_path(digest, kind)
+        
+        if os.path.exists(entry):
+            try:
+                value = restore(entry)
+                self._remember(filepath, stat, digest, kind)
+                self.logger.info(f"Loaded {os.path.basename(filepath)} from cache")
+                return value
+            except Exception as e:
+                self.logger.warning(f"Discarding unreadable cache entry {entry}: {e}")
+        
+        value = parse()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        dump(value, entry + '.tmp')
+        os.replace(entry + '.tmp', entry)
+        self._remember(filepath, stat, digest, kind)
+        return value
+    
+    def _remember(self, filepath: str, stat: os.stat_result, digest: str, kind: str):
+        """Record the source's stat and digest, dropping the entry of its previous contents"""
+        key = self._key(filepath, kind)
+        known = self.index.get(key)
+        record = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        if known == record:
+            return
+        if known and known['sha256'] != digest:
+            stale = self.entry_path(known['sha256'], kind)
+            if os.path.exists(stale):
+                os.remove(stale)
+        self.index[key] = record
+        self._save_index()
+    
+    def clear(self):
+        """Remove every cache entry"""
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.bin') or name == self.INDEX:
+                    os.remove(os.path.join(self.cache_dir, name))
+        self._index = {}
+    
+    @staticmethod
+    def model_codec(model: type) -> Dict[str, Callable]:
+        """dump/restore pair storing a list of dataclass instances column-wise"""
+        names = [f.name for f in fields(model)]
+        
+        def dump(values: list, path: str):
+            InputCache._pickle_dump((names, [[getattr(v, name) for v in values] for name in names]), path)
+        
+        def restore(path: str) -> list:
+            stored, columns = InputCache._pickle_load(path)
+            if stored != names:
+                raise ValueError(f"{model.__name__} fields changed")
+            return list(map(model, *columns))
+        
+        return {'dump': dump, 'restore': restore}
+    
+    @staticmethod
+    def _pickle_dump(value: Any, path: str):
+        with open(path, 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @staticmethod
+    def _pickle_load(path: str) -> Any:
+        with open(path, 'rb') as file:
+            return pickle.load(file)
\ No newline at end of file
@@ -0,0 +1,89 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+class Profiler:
+    """Per-phase wall time, optional peak memory, plus hot-path event counters
+    
+    tracemalloc slows every allocation, so memory tracing is opt-in and
+    timings taken with it on are inflated.
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._open: List[str] = []  # phases currently running, outermost first
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a pipeline phase; re-entering a phase accumulates into it
+        
+        A phase started inside another is recorded with that parent and left
+        out of the total.
+        """
+        parent = self._open[-1] if self._open else None
+        self._open.append(name)
+        # Created up front so phases list in the order they start
+        record = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        # Only the outermost phase owns tracemalloc (no reset_peak before 3.9)
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._open.remove(name)
+            if parent is not None:
+                record['parent'] = parent
+            record['seconds'] += elapsed
+            record['calls'] += 1
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                record['peak_mb'] = max(record.get('peak_mb', 0.0), peak / (1024 * 1024))
+    
+    def count(self, name: str, amount: int = 1):
+        """Add to an event counter (hot loops update self.counters directly)"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def to_dict(self) -> Dict:
+        """Phases and counters as plain data"""
+        return {
+            'phases': {name: {key: round(value, 4) if isinstance(value, float) else value
+                              for key, value in record.items()}
+                       for name, record in self.phases.items()},
+            'counters': dict(sorted(self.counters.items()))
+        }
+    
+    def to_json(self) -> str:
+        """Profile as a JSON document"""
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def summary_table(self) -> str:
+        """Profile as a plain-text summary table"""
+        lines: List[str] = [f"{'phase':<12} {'seconds':>10} {'peak MB':>10}"]
+        for name, record in self.phases.items():
+            peak = f"{record['peak_mb']:.1f}" if 'peak_mb' in record else '-'
+            label = f"  {name}" if 'parent' in record else name
+            lines.append(f"{label:<12} {record['seconds']:>10.3f} {peak:>10}")
+        total = sum(r['seconds'] for r in self.phases.values() if 'parent' not in r)
+        lines.append(f"{'total':<12} {total:>10.3f}")
+        if self.counters:
+            lines.append('')
+            lines.append(f"{'counter':<28} {'count':>10}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<28} {value:>10}")
+        return '\n'.join(lines)
+    
+    def report(self, output_format: str = 'table') -> str:
+        """Render the profile as 'json' or 'table'"""
+        if output_format == 'json':
+            return self.to_json()
+        if output_format == 'table':
+            return self.summary_table()
+        raise ValueError(f"Unknown profile format: {output_format}")
\ No newline at end of file